@@ -0,0 +1,133 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import timedelta
+
+PollStats = namedtuple("PollStats", ["name", "attempts", "waited", "elapsed", "success"])
+
+# the most recent polling calls statistics, for instrumentation
+poll_stats = deque(maxlen=1000)
+
+_deadlines = threading.local()
+
+
+class Deadline:
+    """
+    Deadline based on monotonic clock. Deadline created while another one is active
+    (used as context manager) in the same thread is capped by it, so nested operations
+    inherit the remaining time instead of stacking independent timeouts.
+    """
+    def __init__(self, timeout: timedelta = None):
+        enclosing = Deadline.current()
+        self.end = time.monotonic() + timeout.total_seconds() if timeout is not None else None
+        if enclosing is not None and enclosing.end is not None:
+            self.end = enclosing.end if self.end is None else min(self.end, enclosing.end)
+
+    @staticmethod
+    def current():
+        stack = getattr(_deadlines, "stack", None)
+        return stack[-1] if stack else None
+
+    def remaining(self):
+        """Returns remaining time in seconds (None for infinite deadline)."""
+        if self.end is None:
+            return None
+        return max(self.end - time.monotonic(), 0)
+
+    def remaining_timedelta(self, default: timedelta = None):
+        remaining = self.remaining()
+        return default if remaining is None else timedelta(seconds=remaining)
+
+    def expired(self):
+        return self.end is not None and time.monotonic() >= self.end
+
+    def sleep(self, seconds: float):
+        """Sleeps given time, but not past the deadline."""
+        remaining = self.remaining()
+        time.sleep(seconds if remaining is None else min(seconds, remaining))
+
+    def __enter__(self):
+        if not hasattr(_deadlines, "stack"):
+            _deadlines.stack = []
+        _deadlines.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _deadlines.stack.remove(self)
+
+
+class Backoff:
+    """Exponential backoff with random jitter (fraction of delay)."""
+    def __init__(self,
+                 initial: timedelta = timedelta(milliseconds=100),
+                 maximum: timedelta = timedelta(seconds=5),
+                 multiplier: float = 2.0,
+                 jitter: float = 0.2):
+        self.initial = initial.total_seconds()
+        self.maximum = maximum.total_seconds()
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    @classmethod
+    def fixed(cls, interval: timedelta):
+        return cls(interval, interval, 1.0, 0.0)
+
+    def delays(self):
+        delay = self.initial
+        while True:
+            yield delay * (1 + random.uniform(-self.jitter, self.jitter))
+            delay = min(delay * self.multiplier, self.maximum)
+
+
+DEFAULT_BACKOFF = Backoff()
+
+
+def poll(predicate,
+         timeout: timedelta = None,
+         retries: int = None,
+         backoff: Backoff = DEFAULT_BACKOFF,
+         name: str = None):
+    """
+    Calls predicate until it returns truthy value, the deadline expires or number of retries
+    (calls after the first one) is reached. Sleeps between calls grow according to backoff
+    and never exceed the deadline. Returns the last predicate result.
+    """
+    name = name or getattr(predicate, "__qualname__", repr(predicate))
+    start = time.monotonic()
+    attempts = 0
+    waited = 0.0
+    result = None
+    with Deadline(timeout) as deadline:
+        delays = backoff.delays()
+        while True:
+            result = predicate()
+            attempts += 1
+            if result or deadline.expired() \
+                    or (retries is not None and attempts > retries):
+                break
+            delay = next(delays)
+            remaining = deadline.remaining()
+            if remaining is not None:
+                delay = min(delay, remaining)
+            time.sleep(delay)
+            waited += delay
+    poll_stats.append(PollStats(name, attempts, waited, time.monotonic() - start, bool(result)))
+    return result
+
+
+def get_poll_stats(name: str = None):
+    """Returns aggregated stats: name -> (calls, attempts, waited seconds, elapsed seconds)."""
+    aggregated = {}
+    for stats in poll_stats:
+        if name is not None and stats.name != name:
+            continue
+        calls, attempts, waited, elapsed = aggregated.get(stats.name, (0, 0, 0.0, 0.0))
+        aggregated[stats.name] = (calls + 1, attempts + stats.attempts,
+                                  waited + stats.waited, elapsed + stats.elapsed)
+    return aggregated
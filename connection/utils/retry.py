@@ -1,12 +1,14 @@
 #
 # Copyright(c) 2021 Intel Corporation
 # Copyright(c) 2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from functools import partial
 
+from connection.utils.polling import DEFAULT_BACKOFF, Backoff, poll
 from core.test_run import TestRun
 
 
@@ -16,17 +18,21 @@ class Retry:
     The func parameter is meant to be a method. If this method needs args/kwargs, they should be
     encapsulated with the method, i.e. using a partial function (an example of this is contained
     within run_command_until_success())
+    Calls are spaced with exponential backoff and timeouts are capped by enclosing deadline
+    (see connection.utils.polling).
     """
     @classmethod
     def run_command_until_success(
-            cls, command: str, retries: int = None, timeout: timedelta = None
+            cls, command: str, retries: int = None, timeout: timedelta = None,
+            backoff: Backoff = DEFAULT_BACKOFF
     ):
         # encapsulate method and args/kwargs as a partial function
         func = partial(TestRun.executor.run_expect_success, command)
-        return cls.run_while_exception(func, retries=retries, timeout=timeout)
+        return cls.run_while_exception(func, retries=retries, timeout=timeout, backoff=backoff)
 
     @classmethod
-    def run_while_exception(cls, func, retries: int = None, timeout: timedelta = None):
+    def run_while_exception(cls, func, retries: int = None, timeout: timedelta = None,
+                            backoff: Backoff = DEFAULT_BACKOFF):
         result = None
 
         def wrapped_func():
@@ -37,22 +43,13 @@ class Retry:
             except Exception:
                 return False
 
-        cls.run_while_false(wrapped_func, retries=retries, timeout=timeout)
+        cls.run_while_false(wrapped_func, retries=retries, timeout=timeout, backoff=backoff,
+                            name=getattr(getattr(func, "func", func), "__qualname__", None))
         return result
 
     @classmethod
-    def run_while_false(cls, func, retries: int = None, timeout: timedelta = None):
+    def run_while_false(cls, func, retries: int = None, timeout: timedelta = None,
+                        backoff: Backoff = DEFAULT_BACKOFF, name: str = None):
         if retries is None and timeout is None:
             raise AttributeError("At least one stop condition is required for Retry calls!")
-        start = datetime.now()
-        retry_calls = 0
-        result = func()
-
-        while not result:
-            result = func()
-            retry_calls += 1
-            if result \
-                or (timeout is not None and datetime.now() - start > timeout) \
-                    or (retries is not None and retry_calls == retries):
-                break
-        return result
+        return poll(func, timeout=timeout, retries=retries, backoff=backoff, name=name)
@@ -0,0 +1,103 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import math
+
+
+class DiskAssignmentError(Exception):
+    pass
+
+
+def solve_disk_requirements(required_types: dict, min_sizes: dict, disks: list):
+    """
+    Assigns DUT disks to required disks ('require_disk' markers).
+    required_types: disk name -> DiskTypeSetBase, min_sizes: disk name -> minimal Size,
+    disks: objects with 'disk_type' and 'size' attributes (size may be None if unknown,
+    such disk does not satisfy minimal size requirement).
+    Branch and bound search over all assignments - one is found whenever it exists,
+    the one with the smallest total size of assigned disks (smallest sufficient disks)
+    is returned as dict: disk name -> disk. DiskAssignmentError explains why there is
+    no assignment.
+    """
+    for name, disk_type in required_types.items():
+        for dependency in disk_type.depends_on():
+            if dependency not in required_types:
+                raise DiskAssignmentError(
+                    f"Disk '{name}' type depends on disk '{dependency}' which is not required")
+
+    sized = {name: [index for index, disk in enumerate(disks)
+                    if _is_big_enough(disk, min_sizes.get(name))]
+             for name in required_types}
+    # lower bound of size needed by each required disk, used for pruning
+    lower_bounds = {name: min((_size_of(disks[index]) for index in indexes), default=math.inf)
+                    for name, indexes in sized.items()}
+    best = {"cost": (math.inf, math.inf), "assignment": None}
+
+    def search(assignment: dict, cost: tuple):
+        unassigned = [name for name in required_types if name not in assignment]
+        if not unassigned:
+            if cost < best["cost"]:
+                best["cost"], best["assignment"] = cost, dict(assignment)
+            return
+        if cost[0] + sum(lower_bounds[name] for name in unassigned) > best["cost"][0]:
+            return
+        assigned_disks = {name: disks[index] for name, index in assignment.items()}
+        used = set(assignment.values())
+        options = {}
+        for name in unassigned:
+            if all(dependency in assignment
+                   for dependency in required_types[name].depends_on()):
+                types = required_types[name].types_with(assigned_disks)
+                options[name] = [index for index in sized[name]
+                                 if index not in used and disks[index].disk_type in types]
+        if not options:
+            return
+        # the most constrained required disk goes first
+        name = min(options, key=lambda n: len(options[n]))
+        for index in sorted(options[name], key=lambda i: (_size_of(disks[i]), i)):
+            assignment[name] = index
+            search(assignment, (cost[0] + _size_of(disks[index]), cost[1] + index))
+            del assignment[name]
+
+    search({}, (0, 0))
+    if best["assignment"] is None:
+        raise DiskAssignmentError(_explain(required_types, min_sizes, disks, sized))
+    return {name: disks[index] for name, index in best["assignment"].items()}
+
+
+def _size_of(disk):
+    size = getattr(disk, "size", None)
+    if size is None:
+        return 0
+    return size if isinstance(size, int) else int(size.get_value())
+
+
+def _is_big_enough(disk, min_size):
+    if min_size is None:
+        return True
+    if getattr(disk, "size", None) is None:
+        return False
+    return _size_of(disk) >= (min_size if isinstance(min_size, int)
+                               else int(min_size.get_value()))
+
+
+def _explain(required_types, min_sizes, disks, sized):
+    reasons = []
+    for name, disk_type in required_types.items():
+        if disk_type.depends_on():
+            continue
+        types = disk_type.types_with({})
+        matching = [index for index in sized[name] if disks[index].disk_type in types]
+        if not matching:
+            min_size = min_sizes.get(name)
+            reasons.append(
+                f"no disk of type {'/'.join(sorted(t.name for t in types))}"
+                f"{f' with size >= {min_size}' if min_size is not None else ''} for '{name}'"
+            )
+    if not reasons:
+        reasons.append(f"{len(disks)} disk(s) cannot satisfy all of "
+                       f"{', '.join(required_types)} at once (types, sizes and type ordering "
+                       f"constraints combined)")
+    return "; ".join(reasons)
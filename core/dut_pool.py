@@ -0,0 +1,300 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+DUT pool scheduler - runs collected tests in parallel on a pool of DUTs.
+
+Tests are collected once (in a pytest subprocess with this module loaded as plugin, which
+dumps test requirements), then every DUT gets a worker thread which takes the next pending
+test it is able to run (according to 'require_disk' and 'require_plugin' markers and DUT
+config inventory) and runs it in a separate pytest process, so TestRun state is isolated.
+Outputs are stored per DUT and merged into a single pool log and JSON summary.
+
+Usage:
+    python -m core.dut_pool --dut-config dut1.yml --dut-config dut2.yml \\
+        --log-dir pool_logs -- tests/ --log-path=logs/{dut}
+
+'{dut}' in pytest arguments is replaced with DUT name (config file name by default).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from core.disk_solver import DiskAssignmentError, solve_disk_requirements
+from storage_devices.disk import DiskType, DiskTypeLowerThan, DiskTypeSet
+from type_def.size import Size, Unit, parse_unit
+
+PLUGIN_NAME = "core.dut_pool"
+
+InventoryDisk = namedtuple("InventoryDisk", ["disk_type", "size"])
+
+SIZE_REGEX = re.compile(r"^\s*(?P<value>\d+(\.\d+)?)\s*(?P<unit>[A-Za-z]*)\s*$")
+
+# test outcomes in worker pytest process: nodeid -> outcome
+_outcomes = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--dut-pool-requirements", default=None,
+                     help="dump requirements of collected tests to given file (DUT pool)")
+    parser.addoption("--dut-pool-outcomes", default=None,
+                     help="dump outcomes of executed tests to given file (DUT pool)")
+
+
+def pytest_collection_modifyitems(config, items):
+    path = config.getoption("--dut-pool-requirements")
+    if not path:
+        return
+    with open(path, "w") as requirements_file:
+        json.dump([get_test_requirements(item) for item in items], requirements_file)
+
+
+def pytest_runtest_logreport(report):
+    # failure in any phase wins, 'passed' is reported only for test call
+    if report.failed or report.skipped or report.when == "call":
+        _outcomes.setdefault(report.nodeid, report.outcome)
+        if report.failed:
+            _outcomes[report.nodeid] = "failed"
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("--dut-pool-outcomes")
+    if path:
+        with open(path, "w") as outcomes_file:
+            json.dump(_outcomes, outcomes_file)
+
+
+def get_test_requirements(item):
+    disks = []
+    for mark in item.iter_markers(name="require_disk"):
+        min_size = mark.kwargs.get("min_size")
+        disks.append({
+            "name": mark.args[0],
+            "type": json.loads(mark.args[1].json()),
+            "min_size": int(min_size.get_value()) if min_size is not None else None,
+        })
+    multidut = next(item.iter_markers(name="multidut"), None)
+    return {
+        "nodeid": item.nodeid,
+        "disks": disks,
+        "plugins": [mark.args[0] for mark in item.iter_markers(name="require_plugin")],
+        "duts": multidut.args[0] if multidut else 1,
+    }
+
+
+class DutInventory:
+    """
+    Disks and plugins available on DUT, based on its config.
+    Disk size is taken from optional 'size' key of disk config - number of bytes or string
+    like '1TiB' / '512 GB'. Disks with unknown size do not satisfy 'min_size' requirements.
+    """
+    def __init__(self, name: str, config_path: str, config: dict):
+        self.name = name
+        self.config_path = config_path
+        self.disks = [
+            InventoryDisk(DiskType[disk["type"]], self.__parse_size(disk.get("size")))
+            for disk in config.get("disks", [])
+        ]
+        self.plugins = set(config.get("plugins", {})) | set(config.get("req_plugins", {})) \
+            | set(config.get("opt_plugins", {}))
+
+    @classmethod
+    def load(cls, config_path: str):
+        with open(config_path) as config_file:
+            if config_path.endswith((".yml", ".yaml")):
+                import yaml
+                config = yaml.safe_load(config_file)
+            else:
+                config = json.load(config_file)
+        name = os.path.splitext(os.path.basename(config_path))[0]
+        return cls(name, config_path, config)
+
+    def has_plugin(self, name: str):
+        return name in self.plugins \
+            or importlib.util.find_spec(f"internal_plugins.{name}") is not None
+
+    def can_run(self, requirements: dict):
+        """Returns None if test can be run on DUT, otherwise reason why it cannot."""
+        if requirements["duts"] > 1:
+            return "multidut tests are not supported by DUT pool"
+        missing = [name for name in requirements["plugins"] if not self.has_plugin(name)]
+        if missing:
+            return f"missing plugins: {', '.join(missing)}"
+        required_types = {disk["name"]: self.__disk_type(disk["type"])
+                          for disk in requirements["disks"]}
+        min_sizes = {disk["name"]: disk["min_size"] for disk in requirements["disks"]
+                     if disk["min_size"] is not None}
+        try:
+            solve_disk_requirements(required_types, min_sizes, self.disks)
+        except DiskAssignmentError as e:
+            return f"required disks not available: {e}"
+        return None
+
+    @staticmethod
+    def __parse_size(size):
+        if size is None:
+            return None
+        if isinstance(size, int):
+            return Size(size, Unit.Byte)
+        match = SIZE_REGEX.match(str(size))
+        if not match:
+            raise ValueError(f"Unable to parse disk size: {size}")
+        return Size(float(match["value"]), parse_unit(match["unit"] or "B"))
+
+    @staticmethod
+    def __disk_type(disk_type: dict):
+        if disk_type["type"] == "set":
+            return DiskTypeSet({DiskType[name] for name in disk_type["values"]})
+        return DiskTypeLowerThan(disk_type["args"][0])
+
+
+class DutPool:
+    def __init__(self, config_paths: list, pytest_args: list, log_dir: str,
+                 dut_config_option: str = "--dut-config"):
+        self.duts = [DutInventory.load(path) for path in config_paths]
+        if len({dut.name for dut in self.duts}) != len(self.duts):
+            raise ValueError("DUT config file names have to be unique")
+        self.pytest_args = list(pytest_args)
+        self.log_dir = log_dir
+        self.dut_config_option = dut_config_option
+        self.results = []
+        self.__lock = threading.Lock()
+        self.__log_lock = threading.Lock()
+        self.__pending = []
+        # all pytest processes have to generate the same parametrization
+        if not any(arg.startswith("--random-seed") for arg in self.pytest_args):
+            self.pytest_args.append(f"--random-seed={random.randrange(sys.maxsize)}")
+
+    def collect(self):
+        with tempfile.NamedTemporaryFile(suffix=".json") as requirements_file:
+            output = subprocess.run(
+                [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", PLUGIN_NAME,
+                 f"--dut-pool-requirements={requirements_file.name}",
+                 *self.__args_for(self.duts[0])],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=self.__env()
+            )
+            if output.returncode != 0:
+                raise Exception(f"Test collection failed:\n{output.stdout}")
+            return json.load(requirements_file)
+
+    def run(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        tests = self.collect()
+        for test in tests:
+            reasons = {dut.name: dut.can_run(test) for dut in self.duts}
+            test["duts_able"] = [name for name, reason in reasons.items() if reason is None]
+            if not test["duts_able"]:
+                self.__record(test, None, "unschedulable", 0, None,
+                              "; ".join(f"{name}: {reason}" for name, reason in reasons.items()))
+        # tests which can be run on the fewest DUTs go first
+        self.__pending = sorted((test for test in tests if test["duts_able"]),
+                                key=lambda test: len(test["duts_able"]))
+        self.__log(f"Scheduling {len(self.__pending)} tests on {len(self.duts)} DUTs")
+
+        workers = [threading.Thread(target=self.__worker, args=(dut,), name=dut.name)
+                   for dut in self.duts]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        with open(os.path.join(self.log_dir, "summary.json"), "w") as summary_file:
+            json.dump(self.results, summary_file, indent=2)
+        return all(result["outcome"] in ("passed", "skipped") for result in self.results)
+
+    def __worker(self, dut: DutInventory):
+        dut_log_dir = os.path.join(self.log_dir, dut.name)
+        os.makedirs(dut_log_dir, exist_ok=True)
+        test_index = 0
+        while True:
+            with self.__lock:
+                test = next((t for t in self.__pending if dut.name in t["duts_able"]), None)
+                if test is None:
+                    return
+                self.__pending.remove(test)
+            name = re.sub(r"[^\w.-]+", "_", test["nodeid"])[-150:]
+            log_path = os.path.join(dut_log_dir, f"{test_index:04}_{name}")
+            test_index += 1
+            start = time.monotonic()
+            with open(f"{log_path}.log", "w") as log_file:
+                subprocess.run(
+                    [sys.executable, "-m", "pytest", test["nodeid"], "-p", PLUGIN_NAME,
+                     f"--dut-pool-outcomes={log_path}.json", *self.__args_for(dut)],
+                    stdout=log_file, stderr=subprocess.STDOUT, env=self.__env()
+                )
+            outcome = self.__outcome(f"{log_path}.json", test["nodeid"])
+            self.__record(test, dut.name, outcome, time.monotonic() - start, f"{log_path}.log")
+
+    @staticmethod
+    def __outcome(outcomes_path, nodeid):
+        try:
+            with open(outcomes_path) as outcomes_file:
+                return json.load(outcomes_file).get(nodeid, "error")
+        except (OSError, ValueError):
+            return "error"
+
+    @staticmethod
+    def __env():
+        # framework has to be importable before conftest files are loaded (-p option)
+        framework_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [framework_path,
+                                                          env.get("PYTHONPATH")]))
+        return env
+
+    def __args_for(self, dut: DutInventory):
+        return [arg.replace("{dut}", dut.name) for arg in self.pytest_args] + \
+            [self.dut_config_option, dut.config_path]
+
+    def __record(self, test, dut_name, outcome, duration, log_path, reason=None):
+        with self.__lock:
+            self.results.append({
+                "nodeid": test["nodeid"],
+                "dut": dut_name,
+                "outcome": outcome,
+                "duration": round(duration, 3),
+                "log": log_path,
+                "reason": reason,
+            })
+        self.__log(f"{outcome.upper():<13} {test['nodeid']} [{dut_name or '-'}, "
+                   f"{duration:.1f}s]" + (f" {reason}" if reason else ""))
+
+    def __log(self, message):
+        line = f"{datetime.now().isoformat(timespec='seconds')} {message}"
+        with self.__log_lock:
+            print(line, flush=True)
+            with open(os.path.join(self.log_dir, "pool.log"), "a") as pool_log:
+                pool_log.write(line + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run tests in parallel on a pool of DUTs")
+    parser.add_argument("--dut-config", action="append", required=True,
+                        help="DUT config file (json/yaml), can be given multiple times")
+    parser.add_argument("--dut-config-option", default="--dut-config",
+                        help="pytest option used to pass DUT config to test run")
+    parser.add_argument("--log-dir", default="dut_pool_logs")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER,
+                        help="pytest arguments (after '--')")
+    args = parser.parse_args()
+
+    pytest_args = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+    pool = DutPool(args.dut_config, pytest_args, args.log_dir, args.dut_config_option)
+    sys.exit(0 if pool.run() else 1)
+
+
+if __name__ == "__main__":
+    main()
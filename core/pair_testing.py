@@ -1,6 +1,7 @@
 #
 # Copyright(c) 2020-2021 Intel Corporation
 # Copyright(c) 2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
@@ -28,10 +29,21 @@
 
 
 from itertools import product, combinations
+import hashlib
+import inspect
+import json
 import random
+import re
 
 from core.test_run import TestRun
 
+CACHE_KEY_PREFIX = "test_framework/parametrization"
+# used for test cases generation when no --random-seed is given, so that the generated
+# test cases (and their cache entry) are the same across runs and xdist workers
+DEFAULT_PARAMETRIZATION_SEED = 0
+# default object repr contains memory address, which differs between runs
+UNSTABLE_REPR_REGEX = re.compile(r" at 0x[0-9a-fA-F]+>")
+
 
 def testcase_id(param_set):
     if len(param_set.values) == 1:
@@ -40,37 +52,296 @@ def testcase_id(param_set):
     return "-".join([str(value) for value in param_set.values])
 
 
-def generate_pair_testing_testcases(*argvals):
+class Constraint:
+    """
+    Predicate over values of some of parametrizex arguments (identified by indexes).
+    Combinations for which it returns False are never generated.
+    """
+    def __init__(self, params: tuple, predicate, description: str = None):
+        self.params = params
+        self.predicate = predicate
+        # stable description used in test cases cache key
+        self.description = description or predicate.__qualname__
+
+    @classmethod
+    def from_predicate(cls, argnames, predicate):
+        """Predicate arguments are matched with parametrizex argnames by name."""
+        names = list(inspect.signature(predicate).parameters)
+        try:
+            description = inspect.getsource(predicate).strip()
+        except (OSError, TypeError):
+            description = None
+        return cls(cls.__param_indexes(argnames, names), predicate, description)
+
+    @classmethod
+    def forbidden(cls, argnames, **values):
+        """Forbids single combination of given argument values."""
+        names = list(values)
+        return cls(cls.__param_indexes(argnames, names),
+                   lambda *args: list(args) != [values[name] for name in names],
+                   f"forbidden({', '.join(f'{name}={values[name]!r}' for name in names)})")
+
+    @staticmethod
+    def __param_indexes(argnames, names):
+        unknown = [name for name in names if name not in argnames]
+        if unknown:
+            raise ValueError(f"Constraint uses arguments not parametrized with parametrizex: "
+                             f"{', '.join(unknown)}")
+        return tuple(argnames.index(name) for name in names)
+
+    def is_satisfied(self, test_case):
+        return self.predicate(*(test_case[param] for param in self.params))
+
+
+def constraints_from_marks(argnames, marks):
+    constraints = []
+    for mark in marks:
+        if mark.name == "parametrizex_constraint":
+            constraints.extend(Constraint.from_predicate(argnames, predicate)
+                               for predicate in mark.args)
+        elif mark.name == "parametrizex_forbidden":
+            constraints.append(Constraint.forbidden(argnames, **mark.kwargs))
+    return constraints
+
+
+def get_cached_testcases(config, argnames, argvals, constraints, generate, **key_params):
+    """
+    Returns test cases generated by 'generate' function, cached in pytest cache across runs.
+    Key is a hash of stable serialization of arguments, constraints and other generation
+    parameters (type, strength, seed). Test cases are stored as value indexes.
+    Caching is skipped when some of the values has no stable serialization.
+    """
+    cache = getattr(config, "cache", None)
+    key = _cache_key(argnames, argvals, constraints, key_params)
+    if cache is None or key is None:
+        return generate()
+
+    key = f"{CACHE_KEY_PREFIX}/{key}"
+    cached = cache.get(key, None)
+    if cached is not None and all(
+        len(indexes) == len(argvals)
+        and all(isinstance(i, int) and 0 <= i < len(values) for values, i in zip(argvals, indexes))
+        for indexes in cached
+    ):
+        return [[values[i] for values, i in zip(argvals, indexes)] for indexes in cached]
+
+    test_cases = generate()
+    cache.set(key, [[_index_of(values, value) for values, value in zip(argvals, test_case)]
+                    for test_case in test_cases])
+    return test_cases
+
+
+def _cache_key(argnames, argvals, constraints, key_params):
+    serialized = json.dumps({
+        "argnames": list(argnames),
+        "argvals": [[repr(value) for value in values] for values in argvals],
+        "constraints": [[list(constraint.params), constraint.description]
+                        for constraint in constraints],
+        **{name: repr(value) for name, value in key_params.items()},
+    }, sort_keys=True)
+    if UNSTABLE_REPR_REGEX.search(serialized):
+        return None
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _index_of(values, value):
+    # generated test cases hold the very same objects as argument values lists
+    for index, candidate in enumerate(values):
+        if candidate is value:
+            return index
+    return values.index(value)
+
+
+def generate_full_testcases(argvals, constraints=()):
+    """Generate all valid combinations of argument values."""
+    return [list(test_case) for test_case in product(*argvals)
+            if all(constraint.is_satisfied(test_case) for constraint in constraints)]
+
+
+def generate_pair_testing_testcases(*argvals, strength: int = 2, constraints=(), seed=None):
     """
     Generate test_cases from provided argument values lists in such way that each possible
-    (argX, argY) pair will be used.
+    valid (argX, argY) pair (or t-tuple for strength t) will be used.
     """
-    # if only one argument is used, yield from it
-    if len(argvals) == 1:
-        for val in argvals[0]:
-            yield (val,)
-
-    # append argument index to argument values list to avoid confusion when there are two arguments
-    # with the same type
-    for i, arg in enumerate(argvals):
-        for j, val in enumerate(arg):
-            arg[j] = (i, val)
-
-    # generate all possible test cases
-    all_test_cases = list(product(*argvals))
-    random.seed(TestRun.random_seed)
-    random.shuffle(all_test_cases)
-
-    used_pairs = set()
-    for tc in all_test_cases:
-        current_pairs = set(combinations(tc, 2))
-        # if cardinality of (current_pairs & used_pairs) is lesser than cardinality of current_pairs
-        # it means not all argument pairs in this tc have been used. return current tc
-        # and update used_pairs set
-        if len(current_pairs & used_pairs) != len(current_pairs):
-            used_pairs.update(current_pairs)
-            # unpack testcase by deleting argument index
-            yield list(list(zip(*tc))[1])
+    if seed is None:
+        seed = TestRun.random_seed
+    return generate_covering_testcases(argvals, strength, seed, constraints)
+
+
+def generate_covering_testcases(argvals, strength: int = 2, seed=None, constraints=()):
+    """
+    Generate t-wise covering test cases with In-Parameter-Order (IPOG) strategy - parameters
+    are added one by one, each time extending existing test cases (horizontal growth) and
+    adding new ones for tuples still not covered (vertical growth). Full cartesian product
+    is never enumerated. Result is deterministic for given seed.
+    Partial test cases are checked against constraints as soon as all arguments of
+    a constraint are set, so invalid tuples are neither required nor generated.
+    """
+    if strength < 1:
+        raise ValueError("Covering strength has to be positive")
+    sizes = [len(values) for values in argvals]
+    if not sizes or 0 in sizes:
+        return []
+
+    rng = random.Random(seed)
+    # parameters with the most values go first - this gives smaller suites
+    order = sorted(range(len(sizes)), key=lambda param: -sizes[param])
+    ordered_sizes = [sizes[param] for param in order]
+    strength = min(strength, len(sizes))
+    position_of = {param: position for position, param in enumerate(order)}
+    ordered_constraints = [
+        ([position_of[param] for param in constraint.params], constraint)
+        for constraint in constraints
+    ]
+
+    def valid(test_case):
+        for positions, constraint in ordered_constraints:
+            if all(position < len(test_case) and test_case[position] is not None
+                   for position in positions):
+                if not constraint.predicate(*(argvals[order[position]][test_case[position]]
+                                              for position in positions)):
+                    return False
+        return True
+
+    # test cases operate on value indexes, None stands for "don't care" value
+    test_cases = [list(values) for values in product(*map(range, ordered_sizes[:strength]))]
+    test_cases = [test_case for test_case in test_cases if valid(test_case)]
+    rng.shuffle(test_cases)
+    for param in range(strength, len(ordered_sizes)):
+        uncovered = _uncovered_tuples(param, strength, ordered_sizes, valid)
+        for test_case in test_cases:
+            _grow_horizontally(test_case, param, ordered_sizes, uncovered, valid, rng)
+        _grow_vertically(test_cases, param, uncovered, valid)
+
+    completed, dropped = [], []
+    for test_case in test_cases:
+        if _complete(test_case, ordered_sizes, valid, rng):
+            completed.append(test_case)
+        else:
+            dropped.append(test_case)
+    # test case which cannot be completed with valid values is dropped, but tuples it carried
+    # and no other test case covers get test cases of their own (vertical regrowth)
+    for test_case in dropped:
+        for tuple_values in _carried_tuples(test_case, strength):
+            if any(all(case[p] == v for p, v in tuple_values) for case in completed):
+                continue
+            new_case = [None] * len(ordered_sizes)
+            for p, v in tuple_values:
+                new_case[p] = v
+            if valid(new_case) and _complete(new_case, ordered_sizes, valid, rng):
+                completed.append(new_case)
+
+    result = []
+    for test_case in completed:
+        test_case_values = [None] * len(sizes)
+        for position, param in enumerate(order):
+            test_case_values[param] = argvals[param][test_case[position]]
+        result.append(test_case_values)
+    return result
+
+
+def _uncovered_tuples(param, strength, sizes, valid):
+    """Returns dict: combination of earlier params -> set of their uncovered value tuples
+    (value of 'param' last)."""
+    uncovered = {}
+    for params in combinations(range(param), strength - 1):
+        positions = params + (param,)
+        uncovered[params] = set()
+        for values in product(*(range(sizes[p]) for p in positions)):
+            test_case = [None] * (param + 1)
+            for p, v in zip(positions, values):
+                test_case[p] = v
+            if valid(test_case):
+                uncovered[params].add(values)
+    return uncovered
+
+
+def _covered_tuples(test_case, value, uncovered):
+    covered = []
+    for params, tuples in uncovered.items():
+        values = tuple(test_case[p] for p in params)
+        if None not in values and values + (value,) in tuples:
+            covered.append((params, values + (value,)))
+    return covered
+
+
+def _grow_horizontally(test_case, param, sizes, uncovered, valid, rng):
+    candidates = list(range(sizes[param]))
+    rng.shuffle(candidates)
+    best_value, best_covered = None, []
+    for value in candidates:
+        if not valid(test_case + [value]):
+            continue
+        covered = _covered_tuples(test_case, value, uncovered)
+        if best_value is None or len(covered) > len(best_covered):
+            best_value, best_covered = value, covered
+    test_case.append(best_value)
+    for params, values in best_covered:
+        uncovered[params].discard(values)
+
+    # "don't care" values (left by vertical growth) are fixed now, to cover more tuples
+    for position in range(param):
+        if test_case[position] is not None:
+            continue
+        best_value, best_covered = None, []
+        for value in rng.sample(range(sizes[position]), sizes[position]):
+            test_case[position] = value
+            if not valid(test_case):
+                continue
+            covered = [(params, values) for params, values
+                       in _covered_tuples(test_case, test_case[param], uncovered)
+                       if position in params]
+            if len(covered) > len(best_covered):
+                best_value, best_covered = value, covered
+        test_case[position] = best_value
+        for params, values in best_covered:
+            uncovered[params].discard(values)
+
+
+def _grow_vertically(test_cases, param, uncovered, valid):
+    # test cases added in this phase have "don't care" values and may take more tuples
+    new_test_cases = []
+    for params, tuples in uncovered.items():
+        for values in sorted(tuples):
+            positions = params + (param,)
+            test_case = next((
+                test_case for test_case in new_test_cases
+                if all(test_case[p] in (None, v) for p, v in zip(positions, values))
+                and valid(_with_values(test_case, positions, values))
+            ), None)
+            if test_case is None:
+                test_case = [None] * (param + 1)
+                new_test_cases.append(test_case)
+            test_case[:] = _with_values(test_case, positions, values)
+        tuples.clear()
+    test_cases.extend(new_test_cases)
+
+
+def _with_values(test_case, positions, values):
+    test_case = list(test_case)
+    for p, v in zip(positions, values):
+        test_case[p] = v
+    return test_case
+
+
+def _carried_tuples(test_case, strength):
+    """Returns t-tuples ((position, value) pairs) of values set in partial test case."""
+    positions = [p for p, v in enumerate(test_case) if v is not None]
+    return [[(p, test_case[p]) for p in tuple_positions]
+            for tuple_positions in combinations(positions, min(strength, len(positions)))]
+
+
+def _complete(test_case, sizes, valid, rng):
+    """Fills "don't care" values randomly, backtracking on constraint violation."""
+    if None not in test_case:
+        return valid(test_case)
+    position = test_case.index(None)
+    for value in rng.sample(range(sizes[position]), sizes[position]):
+        test_case[position] = value
+        if valid(test_case) and _complete(test_case, sizes, valid, rng):
+            return True
+    test_case[position] = None
+    return False
 
 
 def register_testcases(metafunc, argnames, argvals):
@@ -1,22 +1,53 @@
 #
 # Copyright(c) 2020-2021 Intel Corporation
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import atexit
 import pytest
 import sys
 import importlib
+import importlib.util
 import signal
+import time
 from core.test_run import TestRun
 
 
 class PluginManager:
+    """
+    Required plugins (config 'req_plugins' and 'require_plugin' markers) are instantiated
+    at creation, so all of them take part in hooks. Optional plugins are imported and
+    instantiated lazily - on first get_plugin() call. 'eager' in plugin config overrides
+    this default. Hooks are called only for instantiated plugins, a plugin instantiated
+    after a hook was already called catches up with it.
+    Plugin modules are imported once per session. Import, initialization and hook
+    durations are logged and gathered in 'timings'.
+
+    Plugin class may declare its 'scope' - "test" (default), "module" or "session".
+    Instances of module/session scoped plugins are reused by following tests (with the same
+    params and config), their optional is_healthy() is checked before each reuse and
+    unhealthy instance is replaced. Optional session_start()/session_end() plugin methods
+    are called when instance lifetime (in its scope) starts and ends.
+    """
+    # plugin name -> imported module, shared by all tests in session
+    _modules = {}
+    # (scope, module, name, params, config) -> plugin instance reused between tests
+    _instances = {}
+    _exit_handler_registered = False
+
     def __init__(self, item, config):
         if 'plugins_dir' in config:
             sys.path.append(config['plugins_dir'])
         self.plugins = {}
+        self.timings = {}
+        self.__unavailable = set()
+        self.__hooks_called = []
 
         self.plugins_config = config.get('plugins', {})
+        self.module = getattr(getattr(item, "module", None), "__name__", None)
+        # module scoped plugins of other test modules are not needed anymore
+        self.__end_instances(lambda key: key[0] == "module" and key[1] != self.module)
 
         self.req_plugins = config.get('req_plugins', {})
         self.opt_plugins = config.get('opt_plugins', {})
@@ -24,70 +55,164 @@ class PluginManager:
         self.req_plugins.update(dict(map(lambda mark: (mark.args[0], mark.kwargs),
                                 item.iter_markers(name="require_plugin"))))
 
-        req_plugin_mod = {}
-        opt_plugin_mod = {}
-
+        # availability of required plugins is checked before importing any of them
         for name in self.req_plugins:
-            try:
-                req_plugin_mod[name] = self.__import_plugin(name)
-            except ModuleNotFoundError:
+            if not self.__is_available(name):
                 pytest.skip("Unable to find requested plugin!")
 
-        for name in self.opt_plugins:
+        for name in [*self.req_plugins, *self.opt_plugins]:
+            if self.plugins_config.get(name, {}).get("eager", name in self.req_plugins):
+                try:
+                    self.get_plugin(name)
+                except KeyError:
+                    continue
+
+    def __is_available(self, name):
+        if name in self._modules:
+            return True
+        provided_by = self.plugins_config.get(name, {}).get("provided_by")
+        candidates = [provided_by] if provided_by else [f"internal_plugins.{name}",
+                                                        f"external_plugins.{name}"]
+        for module_name in candidates:
             try:
-                opt_plugin_mod[name] = self.__import_plugin(name)
-            except ModuleNotFoundError as e:
-                TestRun.LOGGER.debug(
-                    f"Failed to import '{name}' - optional plugin. " f"Reason: {e}"
-                )
+                if importlib.util.find_spec(module_name) is not None:
+                    return True
+            except ModuleNotFoundError:
                 continue
+        return False
+
+    def __import_plugin(self, name):
+        if name in self._modules:
+            return self._modules[name]
 
-        for name, mod in req_plugin_mod.items():
+        provided_by = self.plugins_config.get(name, {}).get("provided_by")
+        if provided_by:
+            module = importlib.import_module(provided_by)
+        else:
             try:
-                self.plugins[name] = mod.plugin_class(
-                    self.req_plugins[name],
-                    self.plugins_config.get(name, {}).get("config", {}))
-            except Exception:
-                pytest.skip(f"Unable to initialize plugin '{name}'")
+                module = importlib.import_module(f"internal_plugins.{name}")
+            except ModuleNotFoundError:
+                module = importlib.import_module(f"external_plugins.{name}")
+
+        PluginManager._modules[name] = module
+        return module
+
+    def __load_plugin(self, name):
+        required = name in self.req_plugins
+        params = self.req_plugins[name] if required else self.opt_plugins[name]
+        try:
+            module = self.__timed(name, "import", self.__import_plugin, name)
+        except ModuleNotFoundError as e:
+            if required:
+                pytest.skip("Unable to find requested plugin!")
+            TestRun.LOGGER.debug(
+                f"Failed to import '{name}' - optional plugin. " f"Reason: {e}"
+            )
+            raise KeyError("Requested plugin does not exist")
+
+        plugin_config = self.plugins_config.get(name, {}).get("config", {})
+        scope = getattr(module.plugin_class, "scope", "test")
+        key = (scope, self.module if scope == "module" else None, name,
+               repr(params), repr(plugin_config))
+        plugin = self._instances.get(key)
+        if plugin is not None and not self.__is_healthy(name, plugin):
+            self.__end_instances(lambda instance_key: instance_key == key)
+            plugin = None
 
-        for name, mod in opt_plugin_mod.items():
+        if plugin is None:
             try:
-                self.plugins[name] = mod.plugin_class(
-                    self.opt_plugins[name],
-                    self.plugins_config.get(name, {}).get("config", {}))
+                plugin = self.__timed(name, "init", module.plugin_class, params, plugin_config)
+                if hasattr(plugin, "session_start"):
+                    self.__timed(name, "session_start", plugin.session_start)
             except Exception as e:
+                if required:
+                    pytest.skip(f"Unable to initialize plugin '{name}'")
                 TestRun.LOGGER.debug(
                     f"Failed to initialize '{name}' - optional plugin. " f"Reason: {e}"
                 )
-                continue
-
-    def __import_plugin(self, name):
-        provided_by = self.plugins_config.get(name, {}).get("provided_by")
-        if provided_by:
-            return importlib.import_module(provided_by)
-
+                raise KeyError("Requested plugin does not exist")
+            if scope != "test":
+                self.__register_instance(key, plugin)
+        else:
+            TestRun.LOGGER.debug(f"Plugin '{name}' reused ({scope} scope)")
+
+        self.plugins[name] = plugin
+        for hook in self.__hooks_called:
+            if hook != "teardown":
+                self.__timed(name, hook, getattr(plugin, hook))
+
+    def __is_healthy(self, name, plugin):
+        if not hasattr(plugin, "is_healthy"):
+            return True
         try:
-            return importlib.import_module(f"internal_plugins.{name}")
-        except ModuleNotFoundError:
-            pass
-
-        return importlib.import_module(f"external_plugins.{name}")
+            healthy = self.__timed(name, "is_healthy", plugin.is_healthy)
+        except Exception as e:
+            TestRun.LOGGER.debug(f"Plugin '{name}' health check failed. Reason: {e}")
+            return False
+        if not healthy:
+            TestRun.LOGGER.debug(f"Plugin '{name}' is not healthy, recreating it")
+        return healthy
+
+    @classmethod
+    def __register_instance(cls, key, plugin):
+        cls._instances[key] = plugin
+        if not PluginManager._exit_handler_registered:
+            # fallback for test runs not calling end_session()
+            atexit.register(cls.end_session)
+            PluginManager._exit_handler_registered = True
+
+    @classmethod
+    def __end_instances(cls, condition):
+        for key in [key for key in cls._instances if condition(key)]:
+            plugin = cls._instances.pop(key)
+            if hasattr(plugin, "session_end"):
+                try:
+                    plugin.session_end()
+                except Exception as e:
+                    print(f"Failed to end '{key[2]}' plugin session. Reason: {e}")
+
+    @classmethod
+    def end_session(cls):
+        """Ends lifetime of all reused (module/session scoped) plugin instances."""
+        cls.__end_instances(lambda key: True)
+
+    def __timed(self, name, phase, function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            duration = time.perf_counter() - start
+            self.timings.setdefault(name, {})[phase] = \
+                self.timings.get(name, {}).get(phase, 0) + duration
+            TestRun.LOGGER.debug(f"Plugin '{name}' {phase}: {duration:.3f}s")
+
+    def __call_hook(self, hook):
+        self.__hooks_called.append(hook)
+        for name, plugin in list(self.plugins.items()):
+            self.__timed(name, hook, getattr(plugin, hook))
 
     def hook_pre_setup(self):
-        for plugin in self.plugins.values():
-            plugin.pre_setup()
+        self.__call_hook("pre_setup")
 
     def hook_post_setup(self):
-        for plugin in self.plugins.values():
-            plugin.post_setup()
+        self.__call_hook("post_setup")
 
     def hook_teardown(self):
-        for plugin in self.plugins.values():
-            plugin.teardown()
+        self.__call_hook("teardown")
+        for name, plugin in self.plugins.items():
+            if plugin not in self._instances.values() and hasattr(plugin, "session_end"):
+                self.__timed(name, "session_end", plugin.session_end)
 
     def get_plugin(self, name):
         if name not in self.plugins:
-            raise KeyError("Requested plugin does not exist")
+            if name in self.__unavailable or \
+                    (name not in self.req_plugins and name not in self.opt_plugins):
+                raise KeyError("Requested plugin does not exist")
+            try:
+                self.__load_plugin(name)
+            except KeyError:
+                self.__unavailable.add(name)
+                raise
         return self.plugins[name]
 
     def teardown_on_signal(self, sig_id, plugin_name):
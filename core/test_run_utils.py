@@ -16,7 +16,15 @@ from IPy import IP
 import core.test_run
 from connection.local_executor import LocalExecutor
 from connection.ssh_executor import SshExecutor
-from core.pair_testing import generate_pair_testing_testcases, register_testcases
+from core.disk_solver import DiskAssignmentError, solve_disk_requirements
+from core.pair_testing import (
+    DEFAULT_PARAMETRIZATION_SEED,
+    constraints_from_marks,
+    generate_full_testcases,
+    generate_pair_testing_testcases,
+    get_cached_testcases,
+    register_testcases,
+)
 from core.plugins import PluginManager
 from log.base_log import BaseLogResult
 from storage_devices.disk import Disk
@@ -54,6 +62,16 @@ def __configure(cls, config):
         "markers",
         "parametrizex(argname, argvalues): sparse parametrized testing"
     )
+    config.addinivalue_line(
+        "markers",
+        "parametrizex_constraint(predicate): generate only parametrizex combinations for which"
+        " predicate (taking parametrizex arguments by name) returns True"
+    )
+    config.addinivalue_line(
+        "markers",
+        "parametrizex_forbidden(**argvalues): never generate parametrizex combination"
+        " with these argument values"
+    )
     config.addinivalue_line(
         "markers",
         "CI: marks test for continuous integration pipeline"
@@ -102,36 +120,13 @@ def __attach_log(cls, log_path, target_name=None):
 TestRun.attach_log = __attach_log
 
 
-@classmethod
-def __setup_disk(cls, disk_name, disk_type):
-    min_size = cls.req_disk_min_sizes.get(disk_name)
-    cls.disks[disk_name] = next(filter(
-        lambda disk: disk.disk_type in disk_type.types()
-        and disk not in cls.disks.values()
-        and (min_size is None or disk.size >= min_size),
-        cls.dut.disks
-    ), None)
-    if not cls.disks[disk_name]:
-        pytest.skip("Unable to find requested disk!")
-
-
-TestRun.__setup_disk = __setup_disk
-
-
 @classmethod
 def __setup_disks(cls):
     cls.disks = {}
-    items = list(cls.req_disks.items())
-    while items:
-        resolved, unresolved = [], []
-        for disk_name, disk_type in items:
-            (resolved, unresolved)[not disk_type.resolved()].append((disk_name, disk_type))
-        resolved.sort(
-            key=lambda disk: (lambda disk_name, disk_type: disk_type)(*disk)
-        )
-        for disk_name, disk_type in resolved:
-            cls.__setup_disk(disk_name, disk_type)
-        items = unresolved
+    try:
+        cls.disks = solve_disk_requirements(cls.req_disks, cls.req_disk_min_sizes, cls.dut.disks)
+    except DiskAssignmentError as e:
+        pytest.skip(f"Unable to find requested disks: {e}")
     cls.dut.req_disks = cls.disks
 
 
@@ -176,7 +171,7 @@ def __setup(cls):
         if not cls.executor.is_remote():
             pytest.skip()
 
-    Disk.plug_all_disks()
+    Disk.plug_all_disks([disk["path"] for disk in cls.config.get("disks", [])])
     if cls.config.get('allow_disk_autoselect', False):
         cls.config["disks"] = disk_finder.find_disks()
 
@@ -252,11 +247,30 @@ def __generate_tests(cls, metafunc):
         argnames.append(mark.args[0])
         argvals.append(list(mark.args[1]))
 
-    if metafunc.config.getoption("--parametrization-type") == "full":
-        for name, values in zip(argnames, argvals):
-            metafunc.parametrize(name, values)
-    elif metafunc.config.getoption("--parametrization-type") == "pair":
-        test_cases = generate_pair_testing_testcases(*argvals)
+    constraints = constraints_from_marks(argnames, marks)
+    parametrization_type = metafunc.config.getoption("--parametrization-type")
+    strength = metafunc.config.getoption("--parametrization-strength")
+
+    if parametrization_type == "full":
+        if not constraints:
+            for name, values in zip(argnames, argvals):
+                metafunc.parametrize(name, values)
+        else:
+            test_cases = get_cached_testcases(
+                metafunc.config, argnames, argvals, constraints,
+                lambda: generate_full_testcases(argvals, constraints),
+                type=parametrization_type,
+            )
+            register_testcases(metafunc, argnames, test_cases)
+    elif parametrization_type == "pair":
+        seed = metafunc.config.getoption("--random-seed") or DEFAULT_PARAMETRIZATION_SEED
+        test_cases = get_cached_testcases(
+            metafunc.config, argnames, argvals, constraints,
+            lambda: generate_pair_testing_testcases(
+                *argvals, strength=strength, constraints=constraints, seed=seed
+            ),
+            type=parametrization_type, strength=strength, seed=seed,
+        )
 
         register_testcases(metafunc, argnames, test_cases)
     else:
@@ -304,6 +318,8 @@ TestRun.post_setup = __post_setup
 @classmethod
 def __addoption(cls, parser):
     parser.addoption("--parametrization-type", choices=["pair", "full"], default="pair")
+    parser.addoption("--parametrization-strength", type=int, default=2,
+                     help="t-wise coverage strength used by 'pair' parametrization type")
     parser.addoption("--random-seed", type=int, default=None)
 
 
@@ -319,3 +335,11 @@ def __teardown(cls):
 
 
 TestRun.teardown = __teardown
+
+
+@classmethod
+def __end_session(cls):
+    PluginManager.end_session()
+
+
+TestRun.end_session = __end_session
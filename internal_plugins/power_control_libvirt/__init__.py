@@ -13,6 +13,9 @@ from core.test_run import TestRun
 
 
 class PowerControlPlugin:
+    # libvirt connection is opened once and reused by all tests
+    scope = "session"
+
     def __init__(self, params, config):
         print("Power Control LibVirt Plugin initialization")
         try:
@@ -25,11 +28,20 @@ class PowerControlPlugin:
                 "Missing fields in config! ('url','vm_name' are required fields)"
             )
 
-    def pre_setup(self):
-        print("Power Control LibVirt Plugin pre setup")
+    def session_start(self):
+        print("Power Control LibVirt Plugin session start")
         self.conn = libvirt.open(self.url)
         self.domain = self.conn.lookupByName(self.vm_name)
 
+    def is_healthy(self):
+        return self.conn.isAlive() == 1
+
+    def session_end(self):
+        self.conn.close()
+
+    def pre_setup(self):
+        print("Power Control LibVirt Plugin pre setup")
+
     def post_setup(self):
         pass
 
@@ -0,0 +1,127 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Microbenchmark of Size operations (and SizeArray bulk operations).
+
+Usage (from framework root directory):
+    python -m scripts.size_benchmark
+    git show <commit>:type_def/size.py > /tmp/size_baseline.py
+    python -m scripts.size_benchmark --baseline /tmp/size_baseline.py
+"""
+
+import argparse
+import importlib.util
+import random
+import timeit
+
+import type_def.size
+
+SIZES_COUNT = 10000
+
+BENCHMARKS = {
+    "construct (bytes)": "Size(4096)",
+    "construct (unit)": "Size(4, Unit.KibiByte)",
+    "construct (float)": "Size(1.5, Unit.MebiByte)",
+    "add": "a + b",
+    "sub": "b - a",
+    "compare": "a < b",
+    "equal": "a == b",
+    "mul": "a * 3",
+    "truediv (number)": "b / 4",
+    "truediv (size)": "b / a",
+    "floordiv (size)": "b // a",
+    "get_value": "a.get_value(Unit.KibiByte)",
+    "str": "str(a)",
+    "parse (ls column)": "Size(int('1234567'), Unit.Byte)",
+}
+
+BULK_BENCHMARKS = {
+    "sum of sizes": "sum(sizes, Size.zero())",
+    "max of sizes": "max(sizes)",
+}
+
+
+def run_benchmarks(module, number: int, repeat: int):
+    """Returns dict: benchmark name -> best time of single operation in nanoseconds."""
+    random.seed(0)
+    namespace = {
+        "Size": module.Size,
+        "Unit": module.Unit,
+        "a": module.Size(4, module.Unit.KibiByte),
+        "b": module.Size(1, module.Unit.MebiByte),
+        "sizes": [module.Size(random.randrange(1 << 40)) for _ in range(SIZES_COUNT)],
+    }
+    results = {}
+    for name, statement in BENCHMARKS.items():
+        results[name] = __best(statement, namespace, number, repeat) / number
+    for name, statement in BULK_BENCHMARKS.items():
+        results[name] = __best(statement, namespace, max(number // SIZES_COUNT, 1), repeat) \
+            / max(number // SIZES_COUNT, 1)
+    return results
+
+
+def run_array_benchmarks(number: int, repeat: int):
+    from type_def.size_array import SizeArray
+
+    random.seed(0)
+    values = [random.randrange(1 << 40) for _ in range(SIZES_COUNT)]
+    namespace = {
+        "Size": type_def.size.Size,
+        "SizeArray": SizeArray,
+        "values": values,
+        "array": SizeArray(values),
+    }
+    statements = {
+        "SizeArray build": "SizeArray(values)",
+        "SizeArray sum": "array.sum()",
+        "SizeArray percentile": "array.percentile(99)",
+    }
+    number = max(number // SIZES_COUNT, 1)
+    return {name: __best(statement, namespace, number, repeat) / number
+            for name, statement in statements.items()}
+
+
+def __best(statement, namespace, number, repeat):
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=repeat)) * 1e9
+
+
+def __load_baseline(path):
+    spec = importlib.util.spec_from_file_location("size_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Size microbenchmark")
+    parser.add_argument("--baseline", help="other type_def/size.py implementation to compare")
+    parser.add_argument("--number", type=int, default=100000,
+                        help="operations per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    current = run_benchmarks(type_def.size, args.number, args.repeat)
+    baseline = run_benchmarks(__load_baseline(args.baseline), args.number, args.repeat) \
+        if args.baseline else {}
+
+    print(f"{'benchmark':<24}{'current [ns]':>16}" +
+          (f"{'baseline [ns]':>16}{'speedup':>10}" if baseline else ""))
+    for name, time_ns in current.items():
+        line = f"{name:<24}{time_ns:>16.1f}"
+        if name in baseline:
+            line += f"{baseline[name]:>16.1f}{baseline[name] / time_ns:>9.2f}x"
+        print(line)
+
+    try:
+        array_results = run_array_benchmarks(args.number, args.repeat)
+    except ImportError:
+        return
+    for name, time_ns in array_results.items():
+        print(f"{name:<24}{time_ns:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import posixpath
 
 from core.test_run import TestRun
 from test_tools import disk_tools
+from test_tools.block_hash import DEFAULT_BLOCK_SIZE, hash_blocks
 from test_tools.disk_tools import get_sysfs_path, validate_dev_path, get_size
 from test_tools.fs_tools import (get_device_filesystem_type, Filesystem, wipefs,
                                  readlink, write_file, mkfs, ls, parse_ls_output)
@@ -24,6 +25,19 @@ class Device:
         self.filesystem = get_device_filesystem_type(self.get_device_id())
         self.mount_point = None
 
+    @classmethod
+    def from_known_state(cls, path, size: Size, filesystem: Filesystem = None):
+        """
+        Creates device object without querying DUT - for devices freshly created by
+        the framework, whose path, size and filesystem are already known.
+        """
+        device = cls.__new__(cls)
+        device.path = path
+        device.size = size
+        device.filesystem = filesystem
+        device.mount_point = None
+        return device
+
     def create_filesystem(self, fs_type: Filesystem, force=True, blocksize=None):
         mkfs(self, fs_type, force, blocksize)
         self.filesystem = fs_type
@@ -69,6 +83,9 @@ class Device:
     def get_io_stats(self):
         return IoStats.get_io_stats(self.get_device_id())
 
+    def get_block_digests(self, block_size: Size = DEFAULT_BLOCK_SIZE, jobs: int = None):
+        return hash_blocks(self.path, block_size, jobs)
+
     def get_sysfs_property(self, property_name):
         path = posixpath.join(get_sysfs_path(self.get_device_id()),
                               "queue", property_name)
@@ -1,23 +1,27 @@
 #
 # Copyright(c) 2019-2022 Intel Corporation
 # Copyright(c) 2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
 import json
 import re
+import shlex
 
 from datetime import timedelta
 from enum import IntEnum
 
 from core.test_run import TestRun
 from connection.utils.output import Output
+from connection.utils.polling import Deadline
 from storage_devices.device import Device
 from test_tools import disk_tools, nvme_cli
-from test_tools.common.wait import wait
+from test_tools.common.wait import wait, wait_on_dut
 from test_tools.disk_finder import get_block_devices_list, resolve_to_by_id_link
 from test_tools.disk_tools import PartitionTable
 from test_tools.fs_tools import readlink, is_mounted, ls_item, parse_ls_output
+from test_tools.udev import UdevMonitor
 from type_def.size import Unit
 
 
@@ -40,8 +44,16 @@ class DiskTypeSetBase:
         raise NotImplementedError()
 
     def types(self):
+        return self.types_with(TestRun.disks)
+
+    def types_with(self, disks: dict):
+        """Returns types for given (possibly partial) assignment: disk name -> disk."""
         raise NotImplementedError()
 
+    def depends_on(self):
+        """Returns names of required disks this set depends on."""
+        return []
+
     def json(self):
         return json.dumps(
             {
@@ -76,7 +88,7 @@ class DiskTypeSet(DiskTypeSetBase):
     def resolved(self):
         return True
 
-    def types(self):
+    def types_with(self, disks: dict):
         return self.__types
 
 
@@ -87,12 +99,15 @@ class DiskTypeLowerThan(DiskTypeSetBase):
     def resolved(self):
         return self.__disk_name in TestRun.disks
 
-    def types(self):
-        if not self.resolved():
+    def types_with(self, disks: dict):
+        if self.__disk_name not in disks:
             raise LookupError("Disk type not resolved!")
-        disk_type = TestRun.disks[self.__disk_name].disk_type
+        disk_type = disks[self.__disk_name].disk_type
         return set(filter(lambda d: d < disk_type, [*DiskType]))
 
+    def depends_on(self):
+        return [self.__disk_name]
+
     def json(self):
         return json.dumps(
             {
@@ -168,17 +183,40 @@ class Disk(Device):
             return parse_ls_output(output)[0] is not None
         raise Exception("Couldn't check if device is detected by the system")
 
-    def wait_for_plug_status(self, should_be_visible):
-        if not wait(
-            lambda: should_be_visible == self.is_detected(),
-            timedelta(minutes=1),
-            timedelta(seconds=1),
-        ):
+    def wait_for_plug_status(self, should_be_visible, monitor: UdevMonitor = None):
+        """
+        Waits for disk to (dis)appear. With udev monitor started before the (un)plug, returns
+        as soon as udev reports the add/remove event instead of polling disk detection.
+        Without monitor, or if no event comes shortly (e.g. udev events are not delivered),
+        disk presence is polled on DUT and confirmed with disk detection.
+        """
+        with Deadline(timedelta(minutes=1)):
+            if monitor is not None and monitor.wait_for_event(
+                action="add" if should_be_visible else "remove",
+                device=self.path,
+                timeout=timedelta(seconds=10),
+            ) is not None:
+                return
+            wait_on_dut(self.__presence_cmd(should_be_visible), timeout=timedelta(minutes=1))
+            detected = wait(
+                lambda: should_be_visible == self.is_detected(),
+                timedelta(minutes=1),
+                timedelta(seconds=1),
+            )
+        if not detected:
             raise Exception(
                 f"Timeout occurred while trying to "
                 f"{'plug' if should_be_visible else 'unplug'} disk."
             )
 
+    def __presence_cmd(self, should_be_present):
+        if self.serial_number and not self.serial_number.startswith("/"):
+            cmd = ("udevadm info --export-db | grep -E '^E: [A-Z_]*SERIAL[A-Z_]*=' | "
+                   f"cut -d= -f2- | grep -qxF {shlex.quote(self.serial_number)}")
+        else:
+            cmd = f"[ -e {self.path} ]"
+        return cmd if should_be_present else f"! {cmd}"
+
     @classmethod
     def plug_all(cls):
         raise NotImplementedError
@@ -186,14 +224,15 @@ class Disk(Device):
     def plug(self):
         raise NotImplementedError
 
-    def unplug(self):
-        if not self.is_detected():
-            return
-        self.__unplug()
-        self.device_id = None
-        self.wait_for_plug_status(False)
+    def unplug(self) -> Output:
+        """Unplugs disk and waits until udev reports its removal."""
+        with UdevMonitor() as monitor:
+            output = self._unplug()
+            if output.exit_code == 0:
+                self.wait_for_plug_status(False, monitor)
+        return output
 
-    def __unplug(self):
+    def _unplug(self) -> Output:
         raise NotImplementedError
 
     def __str__(self):
@@ -212,9 +251,23 @@ class Disk(Device):
         return resolved_disk_type(disk_path, disk_type, serial_number, block_size)
 
     @classmethod
-    def plug_all_disks(cls):
-        for disk_type in cls.types_registry:
-            disk_type.plug_all()
+    def plug_all_disks(cls, expected_paths: list = ()):
+        """
+        Plugs all disks. Waits until udev reports addition of expected disks which were
+        not present before.
+        """
+        missing = []
+        if expected_paths:
+            missing = TestRun.executor.run(
+                f"for path in {' '.join(map(shlex.quote, expected_paths))}; "
+                'do [ -e "$path" ] || echo "$path"; done'
+            ).stdout.split()
+        with UdevMonitor() as monitor:
+            for disk_type in cls.types_registry:
+                disk_type.plug_all()
+            if missing and monitor.wait_for_events(
+                    [monitor.criteria("add", path) for path in missing]) is None:
+                TestRun.LOGGER.warning(f"Disks not plugged: {', '.join(missing)}")
 
     @staticmethod
     def get_all_serial_numbers():
@@ -267,7 +320,7 @@ class NvmeDisk(Disk):
         output = TestRun.executor.run_expect_success(command)
         return output
 
-    def unplug(self) -> Output:
+    def _unplug(self) -> Output:
         command = (
             f"echo 1 > /sys/block/{self.device_id}/device/remove || echo 1 > /sys/block/"
             f"{self.device_id}/device/device/remove"
@@ -330,7 +383,7 @@ class SataDisk(Disk):
         output = TestRun.executor.run_expect_success(cmd)
         return output
 
-    def unplug(self) -> Output:
+    def _unplug(self) -> Output:
         cmd = f"echo 1 > {self.get_unplug_path(device_id=self.device_id)}"
         output = TestRun.executor.run(cmd)
         return output
@@ -388,7 +441,7 @@ class VirtioDisk(Disk):
         output = TestRun.executor.run_expect_success(cmd)
         return output
 
-    def unplug(self) -> Output:
+    def _unplug(self) -> Output:
         cmd = f"echo 1 > {self.get_unplug_path(device_id=self.device_id)}"
         output = TestRun.executor.run(cmd)
         return output
@@ -1,12 +1,19 @@
 #
 # Copyright(c) 2019-2022 Intel Corporation
 # Copyright(c) 2023-2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import os
+import random
+import tempfile
+import uuid
+from datetime import timedelta
+
 from core.test_run import TestRun
 from storage_devices.device import Device
-from test_tools.device_mapper import DmTable, DeviceMapper
+from test_tools.device_mapper import DmTable, DeviceMapper, DmTarget
 from test_tools.disk_finder import resolve_to_by_id_link
 
 
@@ -85,3 +92,170 @@ class ErrorDevice(Device):
         self.mapper.resume()
 
         self.active = True
+
+
+class ErrorTimeline:
+    """
+    Sequence of dm tables to be activated on error device at given times (relative to
+    the scheduler start). Tables added as the same object are staged on DUT only once.
+    """
+    def __init__(self):
+        self.steps = []
+
+    def add(self, at: timedelta, table: DmTable):
+        self.steps.append((at, table))
+        if len(self.steps) > 1 and at < self.steps[-2][0]:
+            self.steps.sort(key=lambda step: step[0])
+        return self
+
+    def tables(self):
+        unique = {}
+        for _, table in self.steps:
+            unique.setdefault(id(table), table)
+        return list(unique.values())
+
+    def duration(self):
+        return self.steps[-1][0] if self.steps else timedelta(0)
+
+    @staticmethod
+    def complete_table(device: Device, table: DmTable):
+        """Copy of table with all gaps mapped linearly to the base device."""
+        completed = DmTable()
+        for entry in table.table:
+            completed.add_entry(entry)
+        return completed.fill_gaps(device)
+
+    @classmethod
+    def flaky_sectors(cls, device: Device, sectors: [int], on_time: timedelta,
+                      off_time: timedelta, duration: timedelta):
+        """Sectors alternately returning errors for 'on_time' and working for 'off_time'."""
+        error_table = DmTable()
+        for sector in sorted(set(sectors)):
+            error_table.add_entry(DmTable.TableEntry(sector, 1, DmTarget.ERROR))
+        error_table = cls.complete_table(device, error_table)
+        passthrough_table = DmTable.passthrough_table(device)
+
+        timeline = cls()
+        at = timedelta(0)
+        while at < duration:
+            timeline.add(at, error_table)
+            timeline.add(min(at + on_time, duration), passthrough_table)
+            at += on_time + off_time
+        return timeline
+
+    @classmethod
+    def error_bursts(cls, device: Device, error_table: DmTable, burst_rate: float,
+                     burst_duration: timedelta, duration: timedelta, seed: int = None):
+        """
+        Error bursts starting at random times (Poisson process with 'burst_rate' bursts per
+        second on average), each activating given error table for 'burst_duration'.
+        """
+        error_table = cls.complete_table(device, error_table)
+        passthrough_table = DmTable.passthrough_table(device)
+        rng = random.Random(seed)
+
+        timeline = cls()
+        at = timedelta(seconds=rng.expovariate(burst_rate))
+        while at < duration:
+            timeline.add(at, error_table)
+            at += burst_duration
+            timeline.add(min(at, duration), passthrough_table)
+            at += timedelta(seconds=rng.expovariate(burst_rate))
+        return timeline
+
+
+class ErrorScheduler:
+    """
+    Plays back ErrorTimeline on error device with a DUT-side agent. All tables are staged on
+    DUT up front, the next table is preloaded as inactive one ('dmsetup reload'), so at every
+    step the agent only swaps tables ('dmsetup resume') at the absolute deadline.
+    Every swap time is recorded, see get_jitter().
+    """
+    def __init__(self, error_device: ErrorDevice, timeline: ErrorTimeline):
+        self.error_device = error_device
+        self.timeline = timeline
+        self.directory = f"/tmp/error_scheduler_{uuid.uuid4().hex}"
+        self.pid = None
+
+    def stage(self):
+        tables = self.timeline.tables()
+        table_indices = {id(table): index for index, table in enumerate(tables)}
+        TestRun.LOGGER.info(f"Staging {len(tables)} dm tables and "
+                            f"{len(self.timeline.steps)} steps for error device "
+                            f"'{self.error_device.name}'")
+
+        with tempfile.TemporaryDirectory() as local_directory:
+            for index, table in enumerate(tables):
+                table.validate()
+                with open(os.path.join(local_directory, f"table_{index}"), "w") as table_file:
+                    table_file.write(str(table))
+            with open(os.path.join(local_directory, "agent.sh"), "w") as agent_file:
+                agent_file.write(self.__agent_script(
+                    [(at, table_indices[id(table)]) for at, table in self.timeline.steps]
+                ))
+            TestRun.executor.run_expect_success(f"mkdir -p {self.directory}")
+            TestRun.executor.rsync_to(f"{local_directory}/", self.directory)
+
+    def start(self):
+        if self.pid is not None:
+            raise RuntimeError("Error scheduler is already running")
+        self.stage()
+        TestRun.LOGGER.info(f"Starting error scheduler for error device "
+                            f"'{self.error_device.name}'")
+        self.pid = TestRun.executor.run_in_background(
+            f"bash {self.directory}/agent.sh",
+            stderr_redirect_path=f"{self.directory}/agent.err",
+        )
+        return self.pid
+
+    def wait(self, timeout: timedelta = None):
+        if timeout is None:
+            timeout = self.timeline.duration() + timedelta(minutes=1)
+        TestRun.executor.wait_cmd_finish(self.pid, timeout)
+        self.pid = None
+
+    def stop(self, restore_table: bool = True):
+        """Stops playback and optionally restores permanent table of error device."""
+        if self.pid is not None:
+            TestRun.executor.run(f"kill {self.pid}")
+            TestRun.executor.wait_cmd_finish(self.pid, timedelta(seconds=30))
+            self.pid = None
+        if restore_table:
+            self.error_device.change_table(self.error_device.table, False)
+
+    def cleanup(self):
+        TestRun.executor.run(f"rm -rf {self.directory}")
+
+    def get_jitter(self):
+        """Returns list of (step index, delay of table swap against its deadline)."""
+        output = TestRun.executor.run_expect_success(f"cat {self.directory}/agent.log").stdout
+        lines = output.splitlines()
+        start = float(lines[0])
+        jitter = []
+        for line in lines[1:]:
+            index, swap_time = line.split()
+            deadline = self.timeline.steps[int(index)][0].total_seconds()
+            jitter.append((int(index), timedelta(seconds=float(swap_time) - start - deadline)))
+        return jitter
+
+    def __agent_script(self, steps):
+        name = self.error_device.mapper.name
+        lines = [
+            "#!/bin/bash",
+            f"cd {self.directory}",
+            "start=$(date +%s.%N)",
+            "echo $start > agent.log",
+            "wait_until() {",
+            "    sleep $(awk -v start=$start -v at=$1 -v now=$(date +%s.%N) "
+            "'BEGIN { d = start + at - now; print (d > 0 ? d : 0) }')",
+            "}",
+        ]
+        if steps:
+            lines.append(f"dmsetup reload {name} table_{steps[0][1]}")
+        for step, (at, table_index) in enumerate(steps):
+            lines.append(f"wait_until {at.total_seconds()}")
+            lines.append(f"dmsetup resume {name}")
+            lines.append(f'echo "{step} $(date +%s.%N)" >> agent.log')
+            if step + 1 < len(steps):
+                lines.append(f"dmsetup reload {name} table_{steps[step + 1][1]}")
+        return "\n".join(lines) + "\n"
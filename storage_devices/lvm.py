@@ -5,23 +5,18 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import json
 import threading
 from typing import Union
 
 from core.test_run import TestRun
 from storage_devices.device import Device
 from storage_devices.disk import Disk
-from test_tools.fs_tools import readlink
 from test_tools.disk_finder import resolve_to_by_id_link, get_system_disks
+from test_tools.lvm_config import LvmConfigEditor, lvm_config_path  # noqa: F401
 from test_utils.filesystem.symlink import Symlink
 from type_def.size import Size
 
-lvm_config_path = "/etc/lvm/lvm.conf"
-filter_prototype_regex = r"^\sfilter\s=\s\["
-types_prototype_regex = r"^\stypes\s=\s\["
-global_filter_prototype_regex = r"^\sglobal_filter\s=\s\["
-tab = "\\\\t"
-
 
 class LvmConfiguration:
     def __init__(
@@ -38,84 +33,57 @@ class LvmConfiguration:
 
     @staticmethod
     def __read_definition_from_lvm_config(
-            prototype_regex: str
+            setting_path: str
     ):
-        cmd = f"grep '{prototype_regex}' {lvm_config_path}"
-        output = TestRun.executor.run(cmd).stdout
-
-        return output
+        return LvmConfigEditor.fetch().get_definition(setting_path)
 
-    @classmethod
+    @staticmethod
     def __add_block_dev_to_lvm_config(
-            cls,
+            editor: LvmConfigEditor,
             block_device_type: str,
             number_of_partitions: int = 16
     ):
-        types_definition = cls.read_types_definition_from_lvm_config()
-
-        if types_definition:
-            if block_device_type in types_definition:
-                TestRun.LOGGER.info(f"Device type '{block_device_type}' already present in config")
-                return
-
-            TestRun.LOGGER.info("Add block device type to existing list")
-            new_type_prefix = f"types = [\"{block_device_type}\", {number_of_partitions}, "
+        types = editor.get("devices/types", [])
 
-            config_update_cmd = f"sed -i 's/{types_prototype_regex}/\t{new_type_prefix}/g'" \
-                                f" {lvm_config_path}"
-        else:
-            TestRun.LOGGER.info("Create new types variable")
-            new_types = f"types = [\"{block_device_type}\", {number_of_partitions}]"
-            characteristic_line = "# Configuration option devices\\/sysfs_scan."
-            config_update_cmd = f"sed -i /'{characteristic_line}'/i\\ '{tab}{new_types}' " \
-                                f"{lvm_config_path}"
+        if block_device_type in types[::2]:
+            TestRun.LOGGER.info(f"Device type '{block_device_type}' already present in config")
+            return False
 
         TestRun.LOGGER.info(f"Adding {block_device_type} ({number_of_partitions} partitions) "
-                            f"to supported types in {lvm_config_path}")
-        TestRun.executor.run(config_update_cmd)
+                            f"to supported types in {editor.path}")
+        editor.set("devices/types", [block_device_type, number_of_partitions] + types)
+        return True
 
-    @classmethod
-    def __add_filter_to_lvm_config(
-            cls,
-            filter: str
+    @staticmethod
+    def __add_filters_to_lvm_config(
+            editor: LvmConfigEditor,
+            filters: []
     ):
-        if filter is None:
-            TestRun.LOGGER.error("Lvm filter for lvm config not provided.")
-
-        filters_definition = cls.read_filter_definition_from_lvm_config()
-
-        if filters_definition:
-            if filter in filters_definition:
+        for filter in filters:
+            if filter is None:
+                TestRun.LOGGER.error("Lvm filter for lvm config not provided.")
+        filters = [filter for filter in filters if filter is not None]
+
+        # the last filter goes first, as when filters were prepended one by one
+        new_filters = editor.prepend_to_list("devices/filter", filters[::-1])
+        for filter in filters:
+            if filter in new_filters:
+                TestRun.LOGGER.info(f"Adding filter '{filter}' to {editor.path}")
+            else:
                 TestRun.LOGGER.info(f"Filter definition '{filter}' already present in config")
-                return
-
-            new_filter_formatted = filter.replace("/", "\\/")
-            new_filter_prefix = f"filter = [ \"{new_filter_formatted}\", "
-
-            TestRun.LOGGER.info("Adding filter to existing list")
-            config_update_cmd = f"sed -i 's/{filter_prototype_regex}/\t{new_filter_prefix}/g'" \
-                                f" {lvm_config_path}"
-        else:
-            TestRun.LOGGER.info("Create new filter variable")
-            new_filter = f"filter = [\"{filter}\"]"
-            characteristic_line = "# Configuration option devices\\/global_filter."
-            config_update_cmd = f"sed -i /'{characteristic_line}'/i\\ '{tab}{new_filter}' " \
-                                f"{lvm_config_path}"
-
-        TestRun.LOGGER.info(f"Adding filter '{filter}' to {lvm_config_path}")
-        TestRun.executor.run(config_update_cmd)
+        return bool(new_filters)
 
     @classmethod
     def read_types_definition_from_lvm_config(cls):
-        return cls.__read_definition_from_lvm_config(types_prototype_regex)
+        return cls.__read_definition_from_lvm_config("devices/types")
 
     @classmethod
     def read_filter_definition_from_lvm_config(cls):
-        return cls.__read_definition_from_lvm_config(filter_prototype_regex)
+        return cls.__read_definition_from_lvm_config("devices/filter")
 
     @classmethod
     def read_global_filter_definition_from_lvm_config(cls):
-        return cls.__read_definition_from_lvm_config(global_filter_prototype_regex)
+        return cls.__read_definition_from_lvm_config("devices/global_filter")
 
     @classmethod
     def add_block_device_to_lvm_config(
@@ -125,7 +93,9 @@ class LvmConfiguration:
         if device_type is None:
             TestRun.LOGGER.error("No device provided.")
 
-        cls.__add_block_dev_to_lvm_config(device_type)
+        editor = LvmConfigEditor.fetch()
+        if cls.__add_block_dev_to_lvm_config(editor, device_type):
+            editor.upload()
 
     @classmethod
     def add_filters_to_lvm_config(
@@ -135,8 +105,9 @@ class LvmConfiguration:
         if filters is None:
             raise ValueError("Lvm filters for lvm config not provided.")
 
-        for f in filters:
-            cls.__add_filter_to_lvm_config(f)
+        editor = LvmConfigEditor.fetch()
+        if cls.__add_filters_to_lvm_config(editor, filters):
+            editor.upload()
 
     @classmethod
     def configure_filters(
@@ -145,31 +116,106 @@ class LvmConfiguration:
     ):
         if lvm_filters:
             TestRun.LOGGER.info("Preparing configuration for LVMs - filters.")
-            LvmConfiguration.add_filters_to_lvm_config(lvm_filters)
-
-            os_disk_filters = [
-                f"a|/dev/{disk}|" for disk in get_system_disks()
-            ] if Lvm.get_os_vg() else None
+            filters = list(lvm_filters)
 
-            if os_disk_filters:
+            # OS disks accept filters are added last, so they precede user filters
+            # (first matching filter wins) and OS VG stays visible
+            if Lvm.get_os_vg():
                 TestRun.LOGGER.info("Add OS disks to LVM filters.")
-                LvmConfiguration.add_filters_to_lvm_config(os_disk_filters)
+                filters += [f"a|/dev/{disk}|" for disk in get_system_disks()]
+
+            cls.add_filters_to_lvm_config(filters)
 
     @staticmethod
     def remove_global_filter_from_config():
-        cmd = f"sed -i '/{global_filter_prototype_regex}/d' {lvm_config_path}"
-        TestRun.executor.run(cmd)
+        LvmConfigEditor.fetch().remove("devices/global_filter").upload()
 
     @staticmethod
     def remove_filters_from_config():
-        cmd = f"sed -i '/{filter_prototype_regex}/d' {lvm_config_path}"
-        TestRun.executor.run(cmd)
+        LvmConfigEditor.fetch().remove("devices/filter").upload()
 
     @staticmethod
     def set_use_devices_file(use_devices_file=True):
-        cmd = (fr"sed -i 's/^\s*#*\s*\(use_devicesfile\).*/\t\1 = "
-               fr"{1 if use_devices_file else 0}/' {lvm_config_path}")
-        TestRun.executor.run(cmd)
+        LvmConfigEditor.fetch().set("devices/use_devicesfile",
+                                    1 if use_devices_file else 0).upload()
+
+    @staticmethod
+    def rollback():
+        """Restores lvm.conf from before the last modification."""
+        LvmConfigEditor.rollback()
+
+
+class LvmReport:
+    """
+    Snapshot of LVM state (PVs, VGs, LVs and LV segments) taken with a single
+    'lvm fullreport' call, indexed locally for LVM helpers.
+    """
+    vg_fields = "vg_name,vg_uuid,vg_size,vg_free,pv_count,lv_count"
+    pv_fields = "pv_name,pv_uuid,vg_name,pv_size,pv_free"
+    lv_fields = "lv_name,vg_name,lv_uuid,lv_path,lv_dm_path,lv_attr,lv_active,lv_size," \
+                "lv_kernel_major,lv_kernel_minor"
+    seg_fields = "lv_name,vg_name,segtype,seg_start,seg_size,devices"
+
+    def __init__(self, report: dict):
+        self.vgs = {}
+        self.pvs = {}
+        self.lvs = {}
+        self.segments = {}
+        for entry in report.get("report", []):
+            for vg in entry.get("vg", []):
+                self.vgs[vg["vg_name"]] = vg
+            for pv in entry.get("pv", []):
+                self.pvs[pv["pv_name"]] = pv
+            for lv in entry.get("lv", []):
+                self.lvs[f"{lv['vg_name']}/{lv['lv_name']}"] = lv
+            for segment in entry.get("seg", []):
+                self.segments.setdefault(
+                    f"{segment['vg_name']}/{segment['lv_name']}", []
+                ).append(segment)
+
+    @classmethod
+    def snapshot(cls, ignore_devices_file: bool = False):
+        """
+        Takes LVM state snapshot. By default LVM uses the same device set as other lvm
+        commands (devices file when 'use_devicesfile' is enabled in LvmConfiguration),
+        'ignore_devices_file' reports all devices regardless of devices file.
+        """
+        cmd = "lvm fullreport --reportformat json --units b --nosuffix " \
+              f"--configreport vg -o {cls.vg_fields} " \
+              f"--configreport pv -o {cls.pv_fields} " \
+              f"--configreport lv -o {cls.lv_fields} " \
+              f"--configreport seg -o {cls.seg_fields}"
+        if ignore_devices_file:
+            cmd += " --devicesfile ''"
+        output = TestRun.executor.run_expect_success(cmd)
+        return cls(json.loads(output.stdout))
+
+    def volume_groups(self):
+        """Returns dict: VG name -> list of PV names ('' for PVs not in any VG)."""
+        volume_groups = {}
+        for pv_name, pv in self.pvs.items():
+            volume_groups.setdefault(pv["vg_name"], []).append(pv_name)
+        return volume_groups
+
+    def logical_volumes(self, vg_name: str = None):
+        return [lv for lv in self.lvs.values() if vg_name is None or lv["vg_name"] == vg_name]
+
+    def logical_volume(self, lv_path: str):
+        return next((lv for lv in self.lvs.values() if lv["lv_path"] == lv_path), None)
+
+    def vgs_on_disks(self, disks: [str], on_disks: bool = True):
+        """Names of non-empty VGs with (or, if 'on_disks' is False, without) PVs on given disks."""
+        vg_names = set()
+        for pv_name, pv in self.pvs.items():
+            if not pv["vg_name"]:
+                continue
+            if any(pv_name.startswith(f"/dev/{disk}") for disk in disks) == on_disks:
+                vg_names.add(pv["vg_name"])
+        return vg_names
+
+    @staticmethod
+    def is_active(lv: dict):
+        return lv["lv_active"] == "active"
 
 
 class VolumeGroup:
@@ -192,25 +238,9 @@ class VolumeGroup:
             return f"{prefix}{cls.__unique_vg_id}"
 
     @staticmethod
-    def get_all_volume_groups():
-        output_lines = TestRun.executor.run("pvscan").stdout.splitlines()
-
-        volume_groups = {}
-        for line in output_lines:
-            if "PV" not in line:
-                continue
-
-            line_elements = line.split()
-            pv = line_elements[line_elements.index("PV") + 1]
-            vg = ""
-            if "VG" in line:
-                vg = line_elements[line_elements.index("VG") + 1]
-
-            if vg not in volume_groups:
-                volume_groups[vg] = []
-            volume_groups[vg].append(pv)
-
-        return volume_groups
+    def get_all_volume_groups(report: LvmReport = None):
+        report = report or LvmReport.snapshot()
+        return report.volume_groups()
 
     @staticmethod
     def create_vg(vg_name: str, device_paths: str):
@@ -262,11 +292,9 @@ class VolumeGroup:
         return TestRun.executor.run(cmd)
 
     @staticmethod
-    def get_logical_volumes_path(vg_name: str):
-        cmd = f"lvdisplay | grep /dev/{vg_name}/ | awk '{{print $3}}'"
-        paths = TestRun.executor.run(cmd).stdout.splitlines()
-
-        return paths
+    def get_logical_volumes_path(vg_name: str, report: LvmReport = None):
+        report = report or LvmReport.snapshot()
+        return [lv["lv_path"] for lv in report.logical_volumes(vg_name)]
 
 
 class Lvm(Disk):
@@ -321,49 +349,22 @@ class Lvm(Disk):
             pv_devs: ([Device], Device)
     ):
         if lv_amount > 1:
-            global_filter_def = LvmConfiguration.read_global_filter_definition_from_lvm_config()
+            editor = LvmConfigEditor.fetch()
             if not isinstance(pv_devs, list):
                 pv_devs = [pv_devs]
 
-            if global_filter_def:
-                TestRun.LOGGER.info("Configure 'global filter' variable")
-                links = []
-                for pv_dev in pv_devs:
-                    link = pv_dev.get_device_link("/dev/disk/by-id")
-                    links.append(str(link))
-
-                for link in links:
-                    if link in global_filter_def:
-                        TestRun.LOGGER.info(f"Global filter definition already contains '{link}'")
-                        continue
-
-                    new_link_formatted = link.replace("/", "\\/")
-                    new_global_filter_prefix = f"global_filter = [ \"r|{new_link_formatted}|\", "
-
-                    TestRun.LOGGER.info(f"Adding global filter '{link}' to existing list")
-                    config_update_cmd = f"sed -i 's/{global_filter_prototype_regex}/\t" \
-                                        f"{new_global_filter_prefix}/g' {lvm_config_path}"
-                    TestRun.executor.run(config_update_cmd)
-            else:
-                for pv_dev in pv_devs:
-                    link = pv_dev.get_device_link("/dev/disk/by-id")
-                    global_filter = f"\"r|{link}|\""
-                    global_filter += ", "
-                global_filter = global_filter[:-2]
-
-                TestRun.LOGGER.info("Create new 'global filter' variable")
-
-                new_global = f"global_filter = [{global_filter}]"
-                characteristic_line = "# Configuration option devices\\/types."
-                config_update_cmd = f"sed -i /'{characteristic_line}'/i\\ " \
-                                    f"'{tab}{new_global}' {lvm_config_path}"
-
-                TestRun.LOGGER.info(f"Adding global filter '{global_filter}' to {lvm_config_path}")
-                TestRun.executor.run(config_update_cmd)
+            links = [str(pv_dev.get_device_link("/dev/disk/by-id")) for pv_dev in pv_devs]
+            new_filters = editor.prepend_to_list("devices/global_filter",
+                                                 [f"r|{link}|" for link in links])
+            for link in links:
+                if f"r|{link}|" in new_filters:
+                    TestRun.LOGGER.info(f"Adding global filter '{link}' to {editor.path}")
+                else:
+                    TestRun.LOGGER.info(f"Global filter definition already contains '{link}'")
 
             TestRun.LOGGER.info("Remove 'filter' in order to 'global_filter' to be used")
-            if LvmConfiguration.read_filter_definition_from_lvm_config():
-                LvmConfiguration.remove_filters_from_config()
+            editor.remove("devices/filter")
+            editor.upload()
 
     @classmethod
     def create_specific_lvm_configuration(
@@ -435,23 +436,24 @@ class Lvm(Disk):
 
     @classmethod
     def discover_logical_volumes(cls):
-        vol_groups = VolumeGroup.get_all_volume_groups()
+        report = LvmReport.snapshot()
+        inactive = [lv["lv_path"] for lv in report.logical_volumes()
+                    if not LvmReport.is_active(lv)]
+        if inactive:
+            TestRun.executor.run_expect_success(f"lvchange -ay {' '.join(inactive)}")
+            report = LvmReport.snapshot()
+
         volumes = []
-        for vg in vol_groups:
-            lv_discovered = VolumeGroup.get_logical_volumes_path(vg)
-            if lv_discovered:
-                for lv_path in lv_discovered:
-                    cls.make_sure_lv_is_active(lv_path)
-                    lv_name = lv_path.split('/')[-1]
-                    volumes.append(
-                        cls(
-                            readlink(lv_path),
-                            VolumeGroup(vg),
-                            lv_name
-                        )
-                    )
-            else:
-                TestRun.LOGGER.info("No LVMs present in the system.")
+        for lv in report.logical_volumes():
+            volumes.append(
+                cls(
+                    f"/dev/dm-{lv['lv_kernel_minor']}",
+                    VolumeGroup(lv["vg_name"]),
+                    lv["lv_name"]
+                )
+            )
+        if not volumes:
+            TestRun.LOGGER.info("No LVMs present in the system.")
 
         return volumes
 
@@ -474,52 +476,39 @@ class Lvm(Disk):
         return TestRun.executor.run(cmd)
 
     @staticmethod
-    def get_os_vg():
-        disks = get_system_disks()
-        cmd = (f"pvdisplay -c | grep -e /dev/{' -e /dev/'.join(disks)} | "
-               "awk -F':' '$2 != \"\" {print $2}'")  # display non-empty groups
-        os_vg_names = TestRun.executor.run(cmd).stdout
-        if os_vg_names:
-            return set(os_vg_names.split("\n"))  # remove duplicates
-        return []
+    def get_os_vg(report: LvmReport = None):
+        report = report or LvmReport.snapshot()
+        return report.vgs_on_disks(get_system_disks()) or []
 
     @staticmethod
-    def get_non_os_vg():
-        disks = get_system_disks()
-        cmd = (f"pvdisplay -c | grep -Ev \'/dev/{'|/dev'.join(disks)}' | "
-               "awk -F':' '$2 != \"\" {print $2}\'")  # display non-empty groups
-        non_os_vg_names = TestRun.executor.run(cmd).stdout
-        if non_os_vg_names:
-            return set(non_os_vg_names.split("\n"))  # remove duplicates
-        return []
+    def get_non_os_vg(report: LvmReport = None):
+        report = report or LvmReport.snapshot()
+        return report.vgs_on_disks(get_system_disks(), on_disks=False) or []
 
     @classmethod
     def remove_all(cls):
-        non_os_vg_names = Lvm.get_non_os_vg()
-        cmd = "lvdisplay -c | awk -F':' '{{print $1,$2}}'"  # prints lv_path vg_name
-        lvs = [tuple(lv.strip().split(' ')) for lv in TestRun.executor.run(cmd).stdout.splitlines()]
-        [cls.remove(lv[0]) for lv in lvs if lv[1] in non_os_vg_names]
+        report = LvmReport.snapshot()
+        os_disks = get_system_disks()
+        non_os_vg_names = report.vgs_on_disks(os_disks, on_disks=False)
+        [cls.remove(lv["lv_path"]) for lv in report.logical_volumes()
+         if lv["vg_name"] in non_os_vg_names]
 
         for vg_name in non_os_vg_names:
             TestRun.executor.run(f"vgchange -an {vg_name}")
             VolumeGroup.remove(vg_name)
 
-        cmd = "pvdisplay | grep 'PV Name' | awk '{{print $3}}'"
-        os_disks = get_system_disks()
-        # invert grep to make sure os_disks won`t be wiped during lvms cleanup
-        cmd += "".join([f" | grep -v {os_disk}" for os_disk in os_disks])
-        pv_names = TestRun.executor.run(cmd).stdout.splitlines()
+        # make sure os_disks won`t be wiped during lvms cleanup
+        pv_names = [pv_name for pv_name in report.pvs
+                    if not any(os_disk in pv_name for os_disk in os_disks)]
         for pv_name in pv_names:
             cls.remove_pv(pv_name)
 
         TestRun.LOGGER.info("Successfully removed all LVMs.")
 
     @staticmethod
-    def make_sure_lv_is_active(lv_path: str):
-        cmd = "lvscan"
-        output_lines = TestRun.executor.run_expect_success(cmd).stdout.splitlines()
-
-        for line in output_lines:
-            if "inactive " in line and lv_path in line:
-                cmd = f"lvchange -ay {lv_path}"
-                TestRun.executor.run_expect_success(cmd)
+    def make_sure_lv_is_active(lv_path: str, report: LvmReport = None):
+        report = report or LvmReport.snapshot()
+        lv = report.logical_volume(lv_path)
+        if lv is not None and not LvmReport.is_active(lv):
+            cmd = f"lvchange -ay {lv_path}"
+            TestRun.executor.run_expect_success(cmd)
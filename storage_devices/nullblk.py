@@ -6,17 +6,39 @@
 
 from core.test_run import TestRun
 from storage_devices.device import Device
+from test_tools.udev import Udev
 from test_tools.fs_tools import ls, parse_ls_output
 from test_tools.os_tools import (
     unload_kernel_module,
     is_kernel_module_loaded,
     reload_kernel_module,
 )
+from type_def.size import Size, Unit
+
+CONFIGFS_PATH = "/sys/kernel/config/nullb"
+
+# Creates null_blk devices through configfs in a single remote call. The first free
+# 'nullbN' directory name is used for every device, newer kernels name the disk after
+# the directory, older ones after the index assigned by the driver - the actual name
+# is printed together with the directory name.
+CONFIGFS_CREATE_SCRIPT = """\
+{{ [ -d /sys/module/null_blk ] || modprobe null_blk nr_devices=0; }} && \\
+{{ mountpoint -q /sys/kernel/config || mount -t configfs none /sys/kernel/config; }} || exit 1; \\
+n=0; for i in $(seq {count}); do \\
+while [ -e /sys/block/nullb$n ] || [ -e {configfs}/nullb$n ]; do n=$((n+1)); done; \\
+d={configfs}/nullb$n; mkdir $d && {attributes} echo 1 > $d/power || exit 1; \\
+if [ -e /sys/block/nullb$n ]; then echo nullb$n nullb$n; \\
+else echo nullb$n nullb$(cat $d/index); fi; \\
+done"""
 
 
 class NullBlk(Device):
     _module = "null_blk"
 
+    def __init__(self, path, configfs_name: str = None):
+        super().__init__(path)
+        self.configfs_name = configfs_name
+
     @classmethod
     def create(
         cls, completion_nsec: int = 10000, size_gb: int = 250, nr_devices: int = 1, bs: int = 512
@@ -32,11 +54,78 @@ class NullBlk(Device):
         reload_kernel_module(cls._module, params)
         return cls.list()
 
+    @classmethod
+    def create_devices(
+        cls,
+        count: int,
+        size: Size,
+        block_size: int = 512,
+        completion_nsec: int = 10000,
+        memory_backed: bool = False,
+        **attributes,
+    ):
+        """
+        Adds null_blk devices at runtime through configfs without reloading the module
+        (already existing null_blk devices are left untouched). All devices are set up
+        with a single remote command. Additional configfs device attributes
+        (e.g. 'irqmode', 'queue_mode', 'zoned') can be passed as keyword arguments.
+        """
+        if count < 1:
+            raise ValueError("Wrong number of null_blk devices requested")
+
+        size_mib = int(size.get_value(Unit.MebiByte))
+        attributes = {
+            "size": size_mib,
+            "blocksize": block_size,
+            "completion_nsec": completion_nsec,
+            "memory_backed": int(memory_backed),
+            **attributes,
+        }
+        TestRun.LOGGER.info(f"Creating {count} null_blk device(s) through configfs...")
+        output = TestRun.executor.run_expect_success(
+            CONFIGFS_CREATE_SCRIPT.format(
+                count=count,
+                configfs=CONFIGFS_PATH,
+                attributes=" ".join(f"echo {value} > $d/{name} &&"
+                                    for name, value in attributes.items()),
+            )
+        )
+        Udev.settle()
+
+        devices = []
+        for line in output.stdout.splitlines():
+            configfs_name, disk_name = line.split()
+            device = cls.from_known_state(f"/dev/{disk_name}", Size(size_mib, Unit.MebiByte))
+            device.configfs_name = configfs_name
+            devices.append(device)
+        return devices
+
+    @classmethod
+    def remove_devices(cls, devices: list):
+        """Removes devices created with create_devices() in a single remote command."""
+        names = [device.configfs_name for device in devices if device.configfs_name]
+        if not names:
+            return
+        TestRun.LOGGER.info(f"Removing null_blk device(s): {', '.join(names)}")
+        TestRun.executor.run_expect_success(
+            f"for name in {' '.join(names)}; do d={CONFIGFS_PATH}/$name; "
+            f"echo 0 > $d/power && rmdir $d || exit 1; done"
+        )
+        for device in devices:
+            device.configfs_name = None
+
+    def remove(self):
+        self.remove_devices([self])
+
     @classmethod
     def remove_all(cls):
         if not is_kernel_module_loaded(cls._module):
             return
         TestRun.LOGGER.info("Removing null_blk ")
+        # configfs devices hold module reference, they have to be removed first
+        TestRun.executor.run(
+            f"for d in {CONFIGFS_PATH}/*/; do [ -d $d ] && echo 0 > $d/power; rmdir $d; done"
+        )
         unload_kernel_module(module_name=cls._module)
 
     @classmethod
@@ -1,5 +1,6 @@
 #
 # Copyright(c) 2020-2021 Intel Corporation
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
@@ -9,7 +10,6 @@ from enum import IntEnum, Enum
 from core.test_run import TestRun
 from storage_devices.device import Device
 from storage_devices.disk import Disk
-from test_tools.fs_tools import readlink
 from test_tools.mdadm import Mdadm
 from test_tools.disk_finder import resolve_to_by_id_link
 from type_def.size import Size, Unit
@@ -144,6 +144,7 @@ class Raid(Disk):
         md_dir_path = "/dev/md/"
         array_devices = devices
         volume_devices = devices[:raid_conf.number_of_devices]
+        container_conf = None
 
         if raid_conf.metadata != MetadataVariant.Legacy:
             container_conf = RaidConfiguration(
@@ -159,7 +160,11 @@ class Raid(Disk):
         Mdadm.create(raid_conf, get_devices_paths_string(volume_devices))
 
         raid_link = md_dir_path + raid_conf.name
-        raid = [r for r in Mdadm.examine_result() if readlink(r["path"]) == readlink(raid_link)][0]
+        raid = Mdadm.detail_result(raid_link)[raid_link]
+        raid["path"] = "/dev/disk/by-id/md-uuid-" + raid["uuid"]
+        if container_conf is not None:
+            container_link = md_dir_path + container_conf.name
+            raid["container"] = Mdadm.detail_result(container_link)[container_link]
 
         return cls(
             raid["path"],
@@ -1,5 +1,6 @@
 #
 # Copyright(c) 2021 Intel Corporation
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
@@ -7,12 +8,12 @@ import posixpath
 
 from core.test_run import TestRun
 from storage_devices.device import Device
-from test_tools.disk_tools import get_size
-from test_tools.fs_tools import ls, parse_ls_output
-from test_utils.filesystem.symlink import Symlink
 from test_tools.os_tools import reload_kernel_module, unload_kernel_module, is_kernel_module_loaded
+from test_tools.udev import UdevMonitor
 from type_def.size import Size, Unit
 
+LINKS_DIR = "/dev/disk/by-id"
+
 
 class RamDisk(Device):
     _module = "brd"
@@ -27,54 +28,58 @@ class RamDisk(Device):
             "rd_size": int(disk_size.get_value(Unit.KiB)),
             "rd_nr": disk_count
         }
-        reload_kernel_module(cls._module, params)
+        with UdevMonitor() as monitor:
+            reload_kernel_module(cls._module, params)
+            events = monitor.wait_for_events(
+                [monitor.criteria("add", f"/dev/ram{index}") for index in range(disk_count)]
+            )
+        if events is None:
+            raise TimeoutError(f"Timeout while waiting for RAM disks after loading "
+                               f"'{cls._module}' module")
 
-        if not cls._is_configured(disk_size, disk_count):
+        ram_disks = cls._create_links()
+        if len(ram_disks) < disk_count or any(
+            size.align_down(Unit.MiB.value) != disk_size.align_down(Unit.MiB.value)
+            for _, size in ram_disks
+        ):
             raise EnvironmentError(f"Wrong RAM disk configuration after loading '{cls._module}' "
                                    "module")
 
-        return cls.list()
+        # module was just loaded, so sizes are known and there is no filesystem on disks
+        return [cls.from_known_state(link_path, size) for link_path, size in ram_disks]
 
     @classmethod
     def remove_all(cls):
         if not is_kernel_module_loaded(cls._module):
             return
 
-        for ram_disk in cls._list_devices():
-            TestRun.executor.run(f"umount {ram_disk.full_path}")
-            link_path = posixpath.join("/dev/disk/by-id", ram_disk.name)
-            try:
-                link = Symlink.get_symlink(link_path=link_path, target=ram_disk.full_path)
-                link.remove(force=True)
-            except FileNotFoundError:
-                pass
+        TestRun.executor.run(
+            f"for dev in /dev/ram*; do [ -b $dev ] || continue; umount $dev; "
+            f"link={LINKS_DIR}/${{dev#/dev/}}; "
+            f"[ \"$(readlink $link)\" = $dev ] && rm -f $link; done"
+        )
         TestRun.LOGGER.info("Removing RAM disks...")
         unload_kernel_module(cls._module)
 
     @classmethod
     def list(cls):
-        ram_disks = []
-        for ram_disk in cls._list_devices():
-            link_path = posixpath.join("/dev/disk/by-id", ram_disk.name)
-            link = Symlink.get_symlink(
-                link_path=link_path, target=ram_disk.full_path, create=True
-            )
-            ram_disks.append(cls(link.full_path))
-
-        return ram_disks
+        return [cls(link_path) for link_path, _ in cls._create_links()]
 
-    @classmethod
-    def _is_configured(cls, disk_size: Size, disk_count: int):
-        ram_disks = cls._list_devices()
-        return (
-            len(ram_disks) >= disk_count
-            and Size(get_size(ram_disks[0].name), Unit.Byte).align_down(Unit.MiB.value)
-            == disk_size.align_down(Unit.MiB.value)
+    @staticmethod
+    def _create_links():
+        """
+        Creates by-id links for all RAM disks with a single command.
+        Returns list of (link path, disk size) tuples.
+        """
+        output = TestRun.executor.run_expect_success(
+            f"for dev in /dev/ram*; do [ -b $dev ] || continue; name=${{dev#/dev/}}; "
+            f"ln -sfn $dev {LINKS_DIR}/$name && echo $name $(cat /sys/block/$name/size) "
+            f"|| exit 1; done"
         )
+        ram_disks = []
+        for line in output.stdout.splitlines():
+            name, sectors = line.split()
+            ram_disks.append((posixpath.join(LINKS_DIR, name),
+                              Size(int(sectors), Unit.Blocks512)))
+        return ram_disks
 
-    @staticmethod
-    def _list_devices():
-        ls_ram_disks = ls("/dev/ram*")
-        if "No such file or directory" in ls_ram_disks:
-            return []
-        return parse_ls_output(ls_ram_disks)
@@ -0,0 +1,335 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from core.test_run import TestRun
+from storage_devices.device import Device
+from storage_devices.error_device import ErrorDevice
+from storage_devices.lvm import Lvm, VolumeGroup
+from storage_devices.raid import Raid, RaidConfiguration, get_devices_paths_string
+from test_tools.device_mapper import DmTable
+from test_tools.disk_tools import PartitionTable
+from test_tools.mdadm import Mdadm
+from test_tools.udev import Udev
+from type_def.size import Size
+
+
+class StackNode:
+    """Single element of storage stack. 'result' is available after the stack is built."""
+    def __init__(self, stack, name: str, dependencies: list):
+        self.stack = stack
+        self.name = name
+        self.dependencies = dependencies
+        self.result = None
+
+    def parents(self):
+        nodes = []
+        for dependency in self.dependencies:
+            if isinstance(dependency, StackItem):
+                dependency = dependency.node
+            if isinstance(dependency, StackNode):
+                nodes.append(dependency)
+        return nodes
+
+    def create(self):
+        raise NotImplementedError()
+
+    def remove(self):
+        raise NotImplementedError()
+
+    def devices(self):
+        """Block devices provided by this node (used for topology verification)."""
+        return [self.result] if isinstance(self.result, Device) else []
+
+    def __str__(self):
+        return self.name
+
+
+class StackItem:
+    """Reference to a single element of a node producing a list (e.g. one of partitions)."""
+    def __init__(self, node: StackNode, index: int):
+        self.node = node
+        self.index = index
+
+    def resolve(self):
+        return self.node.result[self.index]
+
+
+def resolve(dependency):
+    if isinstance(dependency, StackItem):
+        return dependency.resolve()
+    if isinstance(dependency, StackNode):
+        return dependency.result
+    return dependency
+
+
+class PartitionsNode(StackNode):
+    def __init__(self, stack, disk: Device, sizes: [Size], partition_table: PartitionTable):
+        super().__init__(stack, f"partitions({disk.path})", [disk])
+        self.sizes = sizes
+        self.partition_table = partition_table
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [StackItem(self, i) for i in range(len(self.sizes))[index]]
+        return StackItem(self, index)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def create(self):
+        disk = resolve(self.dependencies[0])
+        disk.create_partitions(self.sizes, self.partition_table)
+        return disk.partitions[-len(self.sizes):]
+
+    def remove(self):
+        resolve(self.dependencies[0]).remove_partitions()
+
+    def devices(self):
+        return list(self.result)
+
+
+class RaidNode(StackNode):
+    def __init__(self, stack, configuration: RaidConfiguration, devices: list):
+        super().__init__(stack, f"raid({configuration.level.name})", devices)
+        self.configuration = configuration
+
+    def create(self):
+        return Raid.create(self.configuration, [resolve(d) for d in self.dependencies])
+
+    def remove(self):
+        self.result.stop()
+        Mdadm.zero_superblock(get_devices_paths_string(self.result.array_devices))
+
+
+class VolumeGroupNode(StackNode):
+    def __init__(self, stack, devices: list):
+        super().__init__(stack, "volume_group", devices)
+
+    def create(self):
+        volume_group = VolumeGroup.create(self.__devices_paths())
+        self.name = f"volume_group({volume_group.name})"
+        return volume_group
+
+    def remove(self):
+        TestRun.executor.run(f"vgchange -an {self.result.name}")
+        TestRun.executor.run_expect_success(f"vgremove --force {self.result.name}")
+        TestRun.executor.run_expect_success(f"pvremove {self.__devices_paths()}")
+
+    def __devices_paths(self):
+        return Lvm.get_devices_path([resolve(d) for d in self.dependencies])
+
+
+class LogicalVolumeNode(StackNode):
+    def __init__(self, stack, volume_group: VolumeGroupNode,
+                 volume_size_or_percent: Union[Size, int], name: str = None):
+        super().__init__(stack, "logical_volume", [volume_group])
+        self.volume_size_or_percent = volume_size_or_percent
+        self.volume_name = name
+        self.index = len([node for node in stack.nodes if isinstance(node, LogicalVolumeNode)
+                          and node.dependencies[0] is volume_group]) + 1
+
+    def create(self):
+        volume_group = resolve(self.dependencies[0])
+        if isinstance(self.volume_size_or_percent, Size):
+            size_cmd = f"--size {self.volume_size_or_percent.get_value()}B"
+        else:
+            size_cmd = f"--extents {self.volume_size_or_percent}%VG"
+        name = self.volume_name or f"{volume_group.name}_lv{self.index}"
+        self.name = f"logical_volume({volume_group.name}/{name})"
+        TestRun.executor.run_expect_success(
+            f"lvcreate {size_cmd} --name {name} {volume_group.name} --yes"
+        )
+        path_dm = TestRun.executor.run_expect_success(
+            f"readlink --canonicalize-existing /dev/{volume_group.name}/{name}"
+        ).stdout
+        return Lvm(path_dm, volume_group, name)
+
+    def remove(self):
+        Lvm.remove(f"/dev/{self.result.volume_group.name}/{self.result.volume_name}")
+
+
+class DeviceMapperNode(StackNode):
+    def __init__(self, stack, name: str, base_device, table: DmTable = None):
+        super().__init__(stack, f"device_mapper({name})", [base_device])
+        self.mapper_name = name
+        self.table = table
+
+    def create(self):
+        return ErrorDevice(self.mapper_name, resolve(self.dependencies[0]), self.table)
+
+    def remove(self):
+        self.result.stop()
+
+
+class StorageStack:
+    """
+    Declarative storage stack builder (disks -> partitions -> md RAID -> PV/VG/LV -> dm).
+    Nodes are planned into levels by their dependencies. Nodes of the same level are
+    independent and are created concurrently, the resulting topology is verified with
+    a single lsblk query and teardown runs level by level in reverse order.
+
+    Example:
+        stack = StorageStack()
+        parts = stack.partitions(disk, [Size(1, Unit.GibiByte)] * 4)
+        raid = stack.raid(RaidConfiguration(level=Level.Raid1, metadata=...), parts[0:2])
+        vg = stack.volume_group([raid, parts[2]])
+        lv = stack.logical_volume(vg, 50)
+        stack.build()
+        ...
+        stack.teardown()
+    """
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self.nodes = []
+        self.built_levels = []
+
+    def partitions(self, disk: Device, sizes: [Size],
+                   partition_table: PartitionTable = PartitionTable.gpt):
+        return self.__add(PartitionsNode(self, disk, sizes, partition_table))
+
+    def raid(self, configuration: RaidConfiguration, devices: list):
+        if isinstance(devices, PartitionsNode):
+            devices = [devices[i] for i in range(len(devices))]
+        return self.__add(RaidNode(self, configuration, list(devices)))
+
+    def volume_group(self, devices: list):
+        if isinstance(devices, PartitionsNode):
+            devices = [devices[i] for i in range(len(devices))]
+        return self.__add(VolumeGroupNode(self, list(devices)))
+
+    def logical_volume(self, volume_group: VolumeGroupNode,
+                       volume_size_or_percent: Union[Size, int], name: str = None):
+        return self.__add(LogicalVolumeNode(self, volume_group, volume_size_or_percent, name))
+
+    def device_mapper(self, name: str, base_device, table: DmTable = None):
+        return self.__add(DeviceMapperNode(self, name, base_device, table))
+
+    def plan(self):
+        """Groups nodes into levels - every node depends only on nodes from previous levels."""
+        levels = []
+        placed = {}
+        for node in self.nodes:
+            level = max([placed[parent] + 1 for parent in node.parents()], default=0)
+            placed[node] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(node)
+        return levels
+
+    def build(self):
+        levels = self.plan()
+        TestRun.LOGGER.info(
+            f"Building storage stack: {len(self.nodes)} nodes in {len(levels)} levels")
+        try:
+            for level in levels:
+                TestRun.LOGGER.info(f"Creating: {', '.join(str(node) for node in level)}")
+                results = self.__run_concurrently(lambda node: node.create(), level)
+                for node, result in zip(level, results):
+                    node.result = result
+                self.built_levels.append(level)
+        except Exception:
+            TestRun.LOGGER.error("Storage stack creation failed, tearing down created part.")
+            self.teardown()
+            raise
+
+        self.verify()
+        return [node.result for node in self.nodes]
+
+    def verify(self):
+        """
+        Checks with a single lsblk query that every node device is stacked on its parents.
+        Kernel names of all node devices are resolved with a single remote call as well.
+        """
+        topology = self.topology()
+        devices = {node: node.devices() for node in self.nodes}
+        kernel_names = self.__kernel_names([device for node_devices in devices.values()
+                                            for device in node_devices])
+        parent_names = {node: {kernel_names[self.__system_path(device)]
+                               for device in devices[node]}
+                        for node in self.nodes}
+        for node in self.nodes:
+            parents = node.parents()
+            if not parents:
+                continue
+            for device in devices[node]:
+                kernel_name = kernel_names[self.__system_path(device)]
+                if kernel_name not in topology:
+                    raise Exception(f"Device {device.path} ({node}) not found in system")
+                ancestors = self.__ancestors(topology, kernel_name)
+                for parent in parents:
+                    if parent_names[parent] and not parent_names[parent] & ancestors:
+                        raise Exception(f"Device {device.path} ({node}) is not stacked on "
+                                        f"{parent}")
+
+    def teardown(self):
+        """Removes created nodes in reverse dependency order, levels are torn down concurrently."""
+        for level in reversed(self.built_levels):
+            nodes = [node for node in level if node.result is not None]
+            TestRun.LOGGER.info(f"Removing: {', '.join(str(node) for node in nodes)}")
+            self.__run_concurrently(lambda node: node.remove(), nodes)
+            for node in nodes:
+                node.result = None
+        self.built_levels = []
+        Udev.settle()
+
+    @staticmethod
+    def topology():
+        """Returns dict: kernel device name -> set of parent kernel device names."""
+        output = TestRun.executor.run_expect_success("lsblk --json --output NAME")
+        parents = {}
+
+        def walk(devices, parent):
+            for device in devices:
+                parents.setdefault(device["name"], set())
+                if parent is not None:
+                    parents[device["name"]].add(parent)
+                walk(device.get("children", []), device["name"])
+
+        walk(json.loads(output.stdout)["blockdevices"], None)
+        return parents
+
+    def __add(self, node: StackNode):
+        self.nodes.append(node)
+        return node
+
+    def __run_concurrently(self, function, nodes):
+        if len(nodes) == 1:
+            return [function(nodes[0])]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(function, nodes))
+
+    @staticmethod
+    def __system_path(device: Device):
+        if isinstance(device, ErrorDevice):
+            return device.mapper.get_path()
+        return device.path
+
+    @classmethod
+    def __kernel_names(cls, devices: list):
+        """Returns dict: device path -> kernel device name."""
+        paths = list(dict.fromkeys(cls.__system_path(device) for device in devices))
+        if not paths:
+            return {}
+        output = TestRun.executor.run_expect_success(
+            f"for path in {' '.join(shlex.quote(path) for path in paths)}; do "
+            f"basename \"$(readlink -f \"$path\")\"; done"
+        )
+        return dict(zip(paths, output.stdout.splitlines()))
+
+    @staticmethod
+    def __ancestors(topology, name):
+        ancestors = set()
+        pending = list(topology.get(name, []))
+        while pending:
+            parent = pending.pop()
+            if parent not in ancestors:
+                ancestors.add(parent)
+                pending.extend(topology.get(parent, []))
+        return ancestors
@@ -0,0 +1,189 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import hashlib
+import math
+import os
+import shlex
+import tempfile
+import uuid
+from datetime import timedelta
+
+from connection.utils.output import CmdException
+from core.test_run import TestRun
+from test_tools.dd import Dd
+from type_def.size import Size, Unit
+
+DEFAULT_BLOCK_SIZE = Size(4, Unit.MebiByte)
+# every worker gets a few ranges, so that uneven read speed of device regions is balanced
+RANGES_PER_JOB = 4
+# more ranges are uploaded as a file - whole command has to fit in a single exec argument
+INLINE_RANGES_MAX = 1000
+
+# Hashes block ranges ('start count' pairs read from stdin) in parallel. Every range is
+# read with a single O_DIRECT dd and split into blocks hashed separately, block index
+# is carried in the split suffix. Output lines: 'b<block index> <md5> -'.
+HASH_SCRIPT = """\
+hash_range() {{ set -o pipefail; {dd} skip=$1 count=$2 | \\
+split -b {block_size} -a 16 -d --numeric-suffixes=$1 --filter='echo $FILE $(md5sum)' - b; }}
+export -f hash_range
+xargs -P {jobs} -n 2 bash -c 'hash_range "$@"' hash_range"""
+
+# Generates ranges covering whole file/device, prints its size first.
+FULL_RANGES_SCRIPT = """\
+size=$(blockdev --getsize64 {path} 2>/dev/null || stat -L -c %s {path}) || exit 1
+echo size $size
+blocks=$(( (size + {block_size} - 1) / {block_size} ))
+jobs={jobs}
+chunk=$(( (blocks + jobs * {ranges_per_job} - 1) / (jobs * {ranges_per_job}) ))
+for ((i = 0; i < blocks; i += chunk)); do echo $i $chunk; done"""
+
+
+class BlockDigestMap:
+    """
+    Per-block digests of file or device. Maps of the same block size can be compared
+    to find differing blocks and LBA ranges instead of a single equal/not-equal answer.
+    """
+    def __init__(self, path: str, block_size: Size, size: Size, digests: list):
+        self.path = path
+        self.block_size = block_size
+        self.size = size
+        self.digests = digests
+
+    def __len__(self):
+        return len(self.digests)
+
+    def __getitem__(self, block):
+        return self.digests[block]
+
+    def __eq__(self, other):
+        return self.size == other.size and not self.differing_blocks(other)
+
+    def digest(self):
+        """Single digest of the whole map (not equal to md5sum of the data itself)."""
+        return hashlib.md5("".join(self.digests).encode()).hexdigest()
+
+    def differing_blocks(self, other):
+        """Returns indexes of blocks which differ, blocks present in only one map included."""
+        if self.block_size != other.block_size:
+            raise ValueError(f"Cannot compare digest maps with different block sizes: "
+                             f"{self.block_size} and {other.block_size}")
+        common = min(len(self), len(other))
+        differing = [block for block in range(common)
+                     if self.digests[block] != other.digests[block]]
+        return differing + list(range(common, max(len(self), len(other))))
+
+    def differing_ranges(self, other, unit: Unit = Unit.Blocks512):
+        """
+        Returns list of (first, last) inclusive ranges in given unit (LBAs by default)
+        covering differing blocks. Adjacent blocks are merged into one range.
+        """
+        unit_size = Size(1, unit)
+        blocks_per_range = self.block_size / unit_size
+        last_unit = math.ceil(max(self.size, other.size) / unit_size) - 1
+        ranges = []
+        for block in self.differing_blocks(other):
+            first = int(block * blocks_per_range)
+            last = min(int((block + 1) * blocks_per_range) - 1, last_unit)
+            if ranges and ranges[-1][1] + 1 == first:
+                ranges[-1] = (ranges[-1][0], last)
+            else:
+                ranges.append((first, last))
+        return ranges
+
+    def to_dict(self):
+        return {
+            "path": self.path,
+            "block_size": int(self.block_size.get_value()),
+            "size": int(self.size.get_value()),
+            "digests": self.digests,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["path"], Size(data["block_size"]), Size(data["size"]), data["digests"])
+
+
+def hash_blocks(path: str,
+                block_size: Size = DEFAULT_BLOCK_SIZE,
+                jobs: int = None,
+                timeout: timedelta = timedelta(hours=12)):
+    """
+    Hashes file or device in fixed-size blocks on DUT. Block ranges are read in parallel
+    (one worker per CPU by default) with O_DIRECT, so page cache is neither used nor
+    polluted. Returns BlockDigestMap.
+    """
+    jobs_cmd = str(jobs) if jobs else "$(nproc)"
+    ranges_cmd = FULL_RANGES_SCRIPT.format(path=path, block_size=int(block_size.get_value()),
+                                           jobs=jobs_cmd, ranges_per_job=RANGES_PER_JOB)
+    output = _run_hash_script(path, block_size, jobs_cmd,
+                              f"{{ {ranges_cmd}; }} | {{ read _ size; echo size $size; ",
+                              timeout)
+    size, digests = _parse_hash_output(output.stdout)
+    block_count = math.ceil(size / int(block_size.get_value()))
+    if len(digests) != block_count:
+        raise CmdException(f"Hashed {len(digests)} out of {block_count} blocks of {path}.",
+                           output)
+    return BlockDigestMap(path, block_size, Size(size),
+                          [digests[block] for block in range(block_count)])
+
+
+def hash_block_ranges(path: str,
+                      block_size: Size,
+                      ranges: list,
+                      jobs: int = None,
+                      timeout: timedelta = timedelta(hours=12)):
+    """
+    Hashes only given (first block, block count) ranges of file or device.
+    Returns dict: block index -> digest.
+    """
+    if not ranges:
+        return {}
+    jobs_cmd = str(jobs) if jobs else "$(nproc)"
+    if len(ranges) <= INLINE_RANGES_MAX:
+        pairs = " ".join(f"{first} {count}" for first, count in ranges)
+        output = _run_hash_script(path, block_size, jobs_cmd,
+                                  f"printf '%s %s\\n' {pairs} | {{ ", timeout)
+    else:
+        ranges_path = _upload_ranges(ranges)
+        try:
+            output = _run_hash_script(path, block_size, jobs_cmd,
+                                      f"cat {ranges_path} | {{ ", timeout)
+        finally:
+            TestRun.executor.run(f"rm -f {ranges_path}")
+    _, digests = _parse_hash_output(output.stdout)
+    return digests
+
+
+def _upload_ranges(ranges: list):
+    path = f"/tmp/block_ranges_{uuid.uuid4().hex}"
+    with tempfile.NamedTemporaryFile("w", delete=False) as local_file:
+        local_file.writelines(f"{first} {count}\n" for first, count in ranges)
+    try:
+        TestRun.executor.rsync_to(local_file.name, path)
+    finally:
+        os.remove(local_file.name)
+    return path
+
+
+def _run_hash_script(path, block_size, jobs_cmd, ranges_prefix, timeout):
+    dd = Dd().input(path).block_size(block_size).iflag("direct").set_param("status", "none")
+    hash_cmd = HASH_SCRIPT.format(dd=dd, block_size=int(block_size.get_value()), jobs=jobs_cmd)
+    return TestRun.executor.run_expect_success(
+        f"bash -c {shlex.quote('set -o pipefail; ' + ranges_prefix + hash_cmd + '; }')}",
+        timeout
+    )
+
+
+def _parse_hash_output(stdout: str):
+    size = None
+    digests = {}
+    for line in stdout.splitlines():
+        name, value = line.split()[:2]
+        if name == "size":
+            size = int(value)
+        else:
+            digests[int(name[1:])] = value
+    return size, digests
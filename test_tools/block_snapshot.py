@@ -0,0 +1,218 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+import os
+import re
+import shlex
+import tempfile
+import uuid
+from datetime import timedelta
+
+from core.test_run import TestRun
+from test_tools.blktrace import BlkTrace
+from test_tools.block_hash import (
+    DEFAULT_BLOCK_SIZE,
+    BlockDigestMap,
+    hash_block_ranges,
+    hash_blocks,
+)
+from test_tools.fs_tools import remove
+from type_def.size import Size, Unit
+
+DROPPED_EVENTS_REGEX = re.compile(r"dropped [1-9]|dropped events")
+
+# Traces writes and discards of a device and prints indexes of blocks they touched once
+# blktrace is stopped. Only queue events are taken into account - each bio is counted once,
+# even if it is later split or merged.
+TRACKER_SCRIPT = """\
+{{ blktrace --dev={device} -a write -a discard -o - 2>{stderr_file} & \\
+echo $! > {pid_file}; wait; }} | \\
+blkparse -q -i - -f '%a %S %n\\n' 2>/dev/null | \\
+awk -v sectors={block_sectors} \\
+'$1 == "Q" && NF == 3 {{ last = $2 + ($3 > 0 ? $3 : 1) - 1; \\
+for (b = int($2 / sectors); b <= int(last / sectors); b++) dirty[b] = 1 }} \\
+END {{ for (b in dirty) print b }}' > {output_file}"""
+
+
+class WriteTracker:
+    """DUT-side tracking of blocks modified by writes/discards (based on blktrace)."""
+    def __init__(self, device_path: str, block_size: Size):
+        self.device_path = device_path
+        self.block_size = block_size
+        self.files_prefix = f"/tmp/write_tracker_{uuid.uuid4().hex}"
+        self.pid = None
+        # tracing was confirmed to be active, otherwise tracked blocks are not trusted
+        self.active = False
+
+    def start(self):
+        BlkTrace._mount_debugfs()
+        script = TRACKER_SCRIPT.format(
+            device=self.device_path,
+            block_sectors=int(self.block_size.get_value(Unit.Blocks512)),
+            stderr_file=f"{self.files_prefix}.err",
+            pid_file=f"{self.files_prefix}.pid",
+            output_file=f"{self.files_prefix}.out",
+        )
+        self.pid = TestRun.executor.run_in_background(f"bash -c {shlex.quote(script)}")
+        # pid file is written as soon as blktrace is started, writes are traced only once
+        # trace is set up for the device in kernel
+        wait_cmd = (f"until [ -s {self.files_prefix}.pid ] && grep -qx 1 "
+                    f"/sys/class/block/$(basename $(realpath {self.device_path}))/trace/enable; "
+                    f"do sleep 0.1; done")
+        output = TestRun.executor.run(f"timeout 10 bash -c {shlex.quote(wait_cmd)}")
+        self.active = output.exit_code == 0
+        if not self.active:
+            TestRun.LOGGER.warning(f"Unable to confirm write tracking of {self.device_path} "
+                                   f"is active, next verification does full rehash.")
+
+    def is_running(self):
+        return self.pid is not None and TestRun.executor.check_if_process_exists(self.pid)
+
+    def stop(self):
+        """
+        Stops tracking and returns set of modified block indexes or None if tracking
+        was not confirmed active, was interrupted (e.g. by DUT reboot) or events were lost.
+        """
+        if self.pid is None:
+            return None
+        running = self.is_running()
+        if running:
+            TestRun.executor.run(f"kill -s SIGINT $(cat {self.files_prefix}.pid)")
+            TestRun.executor.wait_cmd_finish(self.pid, timedelta(minutes=5))
+        self.pid = None
+
+        output = TestRun.executor.run(
+            f"cat {self.files_prefix}.err >&2; cat {self.files_prefix}.out"
+        )
+        remove(f"{self.files_prefix}.*", force=True, ignore_errors=True)
+        if not self.active:
+            return None
+        if not running or output.exit_code != 0:
+            TestRun.LOGGER.warning(f"Write tracking of {self.device_path} was interrupted.")
+            return None
+        if DROPPED_EVENTS_REGEX.search(output.stderr):
+            TestRun.LOGGER.warning(f"Write tracking of {self.device_path} lost events.")
+            return None
+        return {int(block) for block in output.stdout.split()}
+
+
+class BlockSnapshot:
+    """
+    Baseline per-block digests of device and write tracking since the baseline was taken.
+    'current' holds digests from the last verification - blocks not written since then
+    don't have to be read again.
+    """
+    def __init__(self, name: str, device_path: str, baseline: BlockDigestMap):
+        self.name = name
+        self.device_path = device_path
+        self.baseline = baseline
+        self.current = baseline
+        self.tracker = None
+
+
+class BlockSnapshotStore:
+    """
+    Stores block snapshots on controller. Re-verification rehashes only blocks written
+    since the previous verification (write tracking) and falls back to full rehash when
+    tracking is not available, e.g. after DUT reboot or power cycle.
+    Store directory doesn't depend on test run ('block_snapshots_dir' in DUT config,
+    per-DUT directory in system temporary directory by default), so snapshots taken
+    by one test run can be verified by another.
+
+    Example:
+        store = BlockSnapshotStore()
+        store.take(core_device, "before_flush")
+        ...
+        assert not store.verify("before_flush")
+    """
+    def __init__(self, directory: str = None):
+        self.directory = directory or TestRun.config.get(
+            "block_snapshots_dir",
+            os.path.join(tempfile.gettempdir(), "block_snapshots",
+                         str(TestRun.config.get("host", "local"))),
+        )
+        self.snapshots = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def take(self, device, name: str, block_size: Size = DEFAULT_BLOCK_SIZE,
+             track_writes: bool = True):
+        device_path = getattr(device, "path", device)
+        TestRun.LOGGER.info(f"Taking block snapshot '{name}' of {device_path}")
+        tracker = WriteTracker(device_path, block_size) if track_writes else None
+        # writes done while hashing are tracked, so they are rehashed on verification
+        if tracker:
+            tracker.start()
+        snapshot = BlockSnapshot(name, device_path, hash_blocks(device_path, block_size))
+        snapshot.tracker = tracker
+        self.snapshots[name] = snapshot
+        with open(self.__snapshot_path(name), "w") as snapshot_file:
+            json.dump(snapshot.baseline.to_dict(), snapshot_file)
+        return snapshot
+
+    def get(self, name: str):
+        """Returns snapshot, loading it from store directory if it was taken by other run."""
+        if name not in self.snapshots:
+            with open(self.__snapshot_path(name)) as snapshot_file:
+                baseline = BlockDigestMap.from_dict(json.load(snapshot_file))
+            self.snapshots[name] = BlockSnapshot(name, baseline.path, baseline)
+        return self.snapshots[name]
+
+    def rehash(self, name: str):
+        """Updates and returns current digests of snapshot device."""
+        snapshot = self.get(name)
+        block_size = snapshot.baseline.block_size
+        dirty_blocks = snapshot.tracker.stop() if snapshot.tracker else None
+        snapshot.tracker = WriteTracker(snapshot.device_path, block_size)
+        snapshot.tracker.start()
+
+        if dirty_blocks is None:
+            TestRun.LOGGER.info(f"Full rehash of {snapshot.device_path}")
+            snapshot.current = hash_blocks(snapshot.device_path, block_size)
+            return snapshot.current
+
+        ranges = self.__to_ranges(sorted(b for b in dirty_blocks if b < len(snapshot.current)))
+        TestRun.LOGGER.info(f"Rehashing {len(dirty_blocks)} of {len(snapshot.current)} blocks "
+                            f"of {snapshot.device_path}")
+        digests = list(snapshot.current.digests)
+        for block, digest in hash_block_ranges(snapshot.device_path, block_size,
+                                               ranges).items():
+            digests[block] = digest
+        snapshot.current = BlockDigestMap(snapshot.device_path, block_size,
+                                          snapshot.current.size, digests)
+        return snapshot.current
+
+    def verify(self, name: str, unit: Unit = Unit.Blocks512):
+        """Returns list of (first, last) ranges (LBAs by default) differing from snapshot."""
+        snapshot = self.get(name)
+        differences = snapshot.baseline.differing_ranges(self.rehash(name), unit)
+        if differences:
+            TestRun.LOGGER.warning(f"{snapshot.device_path} differs from snapshot '{name}' "
+                                   f"in {len(differences)} range(s)")
+        return differences
+
+    def remove(self, name: str):
+        snapshot = self.snapshots.pop(name, None)
+        if snapshot and snapshot.tracker:
+            snapshot.tracker.stop()
+        if os.path.exists(self.__snapshot_path(name)):
+            os.remove(self.__snapshot_path(name))
+
+    def remove_all(self):
+        for name in list(self.snapshots):
+            self.remove(name)
+
+    def __snapshot_path(self, name: str):
+        return os.path.join(self.directory, f"{name}.json")
+
+    @staticmethod
+    def __to_ranges(blocks: list):
+        ranges = []
+        for block in blocks:
+            if ranges and ranges[-1][0] + ranges[-1][1] == block:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + 1)
+            else:
+                ranges.append((block, 1))
+        return ranges
@@ -0,0 +1,37 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import weakref
+
+from core.test_run import TestRun
+
+# executor -> {tool name: detected capabilities}, entries go away with their executors
+_tool_capabilities = weakref.WeakKeyDictionary()
+
+
+def get_tool_capabilities(name: str, detect, executor=None):
+    """
+    Returns capabilities of a DUT tool (binary path, version, supported features, ...).
+    'detect' is called with the executor only once per executor and its result is cached
+    until invalidated. Detection returning None is not cached.
+    """
+    executor = executor if executor is not None else TestRun.executor
+    tools = _tool_capabilities.setdefault(executor, {})
+    if name not in tools:
+        capabilities = detect(executor)
+        if capabilities is None:
+            return None
+        tools[name] = capabilities
+    return tools[name]
+
+
+def invalidate_tool_capabilities(name: str = None, executor=None):
+    """Drops cached capabilities, e.g. after tool (re)installation."""
+    executor = executor if executor is not None else TestRun.executor
+    tools = _tool_capabilities.get(executor, {})
+    if name is None:
+        tools.clear()
+    else:
+        tools.pop(name, None)
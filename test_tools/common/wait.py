@@ -1,20 +1,86 @@
 #
 # Copyright(c) 2019-2022 Intel Corporation
 # Copyright(c) 2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
-import time
-from datetime import timedelta, datetime
+import shlex
+from collections import namedtuple
+from datetime import timedelta
 
+from connection.utils.output import CmdException
+from connection.utils.polling import (
+    DEFAULT_BACKOFF,
+    Backoff,
+    Deadline,
+    PollStats,
+    poll,
+    poll_stats,
+)
+from core.test_run import TestRun
 
-def wait(predicate, timeout: timedelta, interval: timedelta = None):
-    start_time = datetime.now()
-    result = False
-    while start_time + timeout > datetime.now():
-        result = predicate()
-        if result:
-            break
-        if interval is not None:
-            time.sleep(interval.total_seconds())
+WaitResult = namedtuple("WaitResult", ["success", "attempts", "elapsed"])
+
+# executor timeout of wait on DUT without timeout (executors need finite one)
+UNBOUNDED_WAIT_CMD_TIMEOUT = timedelta(days=30)
+
+# Polls condition on DUT until it succeeds or timeout (ms, negative for no timeout) passes.
+# Sleeps never go past the deadline. Prints 'attempts elapsed_ms slept_ms', exit code tells
+# if condition was met.
+WAIT_ON_DUT_SCRIPT = """\
+now() {{ echo $(( $(date +%s%N) / 1000000 )); }}
+start=$(now); attempts=0; slept=0; result=1
+while :; do
+attempts=$((attempts + 1))
+if {{ {condition}; }} >/dev/null 2>&1; then result=0; break; fi
+left={interval_ms}
+if [ {timeout_ms} -ge 0 ]; then left=$(( {timeout_ms} - ($(now) - start) )); fi
+[ $left -le 0 ] && break
+delay=$(( left < {interval_ms} ? left : {interval_ms} ))
+sleep $(printf '%d.%03d' $((delay / 1000)) $((delay % 1000)))
+slept=$((slept + delay))
+done
+echo $attempts $(( $(now) - start )) $slept
+exit $result"""
+
+
+def wait(predicate, timeout: timedelta, interval: timedelta = None, backoff: Backoff = None):
+    """
+    Waits for predicate to be true. Predicate is polled with given fixed interval or with
+    backoff (exponential by default), within timeout capped by enclosing deadline.
+    """
+    if backoff is None:
+        backoff = Backoff.fixed(interval) if interval is not None else DEFAULT_BACKOFF
+    return poll(predicate, timeout=timeout, backoff=backoff)
+
+
+def wait_on_dut(condition_cmd: str,
+                interval: timedelta = timedelta(seconds=1),
+                timeout: timedelta = timedelta(minutes=1)):
+    """
+    Waits for condition command to succeed (exit code 0). Polling loop runs on DUT in a single
+    remote invocation instead of one command execution per attempt.
+    Timeout None means waiting without limit (unless there is an enclosing deadline).
+    Returns WaitResult: whether condition was met, number of attempts and elapsed time.
+    """
+    with Deadline(timeout) as deadline:
+        remaining = deadline.remaining()
+    timeout_ms = int(remaining * 1000) if remaining is not None else -1
+    script = WAIT_ON_DUT_SCRIPT.format(condition=condition_cmd, timeout_ms=timeout_ms,
+                                       interval_ms=max(int(interval.total_seconds() * 1000), 1))
+    cmd_timeout = timedelta(milliseconds=timeout_ms) + timedelta(minutes=1) \
+        if timeout_ms >= 0 else UNBOUNDED_WAIT_CMD_TIMEOUT
+    output = TestRun.executor.run(f"bash -c {shlex.quote(script)}", cmd_timeout)
+    stats = output.stdout.split()[-3:]
+    if output.exit_code not in (0, 1) or len(stats) != 3 or not all(map(str.isdigit, stats)):
+        raise CmdException(f"Waiting for '{condition_cmd}' on DUT failed.", output)
+    attempts, elapsed_ms, slept_ms = map(int, stats)
+
+    result = WaitResult(output.exit_code == 0, attempts, timedelta(milliseconds=elapsed_ms))
+    poll_stats.append(PollStats(condition_cmd, attempts, slept_ms / 1000, elapsed_ms / 1000,
+                                result.success))
+    TestRun.LOGGER.debug(f"Waited {result.elapsed.total_seconds():.1f}s for '{condition_cmd}' "
+                         f"on DUT ({attempts} attempts, "
+                         f"condition {'met' if result.success else 'not met'})")
     return result
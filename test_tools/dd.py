@@ -9,6 +9,7 @@ import type_def.size as size
 from core.test_run import TestRun
 from connection.utils.output import CmdException
 from test_tools.common.linux_command import LinuxCommand
+from test_tools.common.tool_cache import get_tool_capabilities
 
 
 # TODO: Remove it when it's fixed in uutils.
@@ -21,23 +22,15 @@ from test_tools.common.linux_command import LinuxCommand
 # drivers.
 #
 # As a temporary solution, fall back to gnu-coreutils.
-_gnu_dd_binary = {}
-
-
-def _resolve_gnu_dd():
-    executor = TestRun.executor
-    cached = _gnu_dd_binary.get(id(executor))
-    if cached:
-        return cached
-
+def _detect_gnu_dd(executor):
     output = None
     for candidate in ("dd", "gnudd"):
         output = executor.run(f"{candidate} --version")
         version = f"{output.stdout}\n{output.stderr}".lower()
         if output.exit_code == 0 and "coreutils" in version and "uutils" not in version:
-            _gnu_dd_binary[id(executor)] = candidate
             return candidate
 
+    # raised from detection, so the output of the last probe is reported (nothing is cached)
     raise CmdException(
         "GNU dd not found. The system 'dd' is not GNU coreutils (likely a uutils "
         "reimplementation, which mis-aligns O_DIRECT buffers) and no 'gnudd' binary "
@@ -47,6 +40,10 @@ def _resolve_gnu_dd():
     )
 
 
+def _resolve_gnu_dd():
+    return get_tool_capabilities("dd", _detect_gnu_dd)
+
+
 class Dd(LinuxCommand):
     def __init__(self):
         LinuxCommand.__init__(self, TestRun.executor, _resolve_gnu_dd())
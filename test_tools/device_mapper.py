@@ -1,9 +1,14 @@
 #
 # Copyright(c) 2019-2021 Intel Corporation
 # Copyright(c) 2023-2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import bisect
+import os
+import tempfile
+from collections import Counter
 from enum import Enum
 
 from core.test_run import TestRun
@@ -54,8 +59,40 @@ class DmTable:
 
             return ret
 
+        @property
+        def end(self):
+            return self.offset + self.length
+
+        def can_merge(self, other):
+            """Checks if other entry directly following this one can be merged with it."""
+            if self.end != other.offset or self.target != other.target:
+                return False
+            if self.target in [DmTarget.ERROR, DmTarget.ZERO]:
+                return True
+            if self.target == DmTarget.LINEAR:
+                return self.params[0] == other.params[0] \
+                    and self.params[1] + self.length == other.params[1]
+            return False
+
     def __init__(self):
-        self.table = []
+        # entries never overlap, so sorted offsets are enough for O(log n) lookups
+        self.__offsets = []
+        self.__entries = []
+
+    @property
+    def table(self):
+        """Entries sorted by offset. Read-only - use add_entry() or assign a list of entries."""
+        return tuple(self.__entries)
+
+    @table.setter
+    def table(self, entries):
+        self.__offsets = []
+        self.__entries = []
+        for entry in entries:
+            self.add_entry(entry)
+
+    def __len__(self):
+        return len(self.__entries)
 
     @classmethod
     def uniform_error_table(
@@ -127,57 +164,91 @@ class DmTable:
         return self
 
     def add_entry(self, entry: TableEntry):
-        self.table.append(entry)
+        """
+        Inserts entry keeping the table sorted. Overlapping entries are rejected and entries
+        adjacent to ones of the same target (contiguous for linear) are merged.
+        Position is found in O(log n), but insertion into the sorted lists is O(n) (a memmove
+        of list pointers), so building a table out of order is O(n^2) - a few seconds for
+        100k entries. Entries added in ascending order are appended in amortized O(1).
+        """
+        index = bisect.bisect_right(self.__offsets, entry.offset)
+        previous = self.__entries[index - 1] if index > 0 else None
+        following = self.__entries[index] if index < len(self.__entries) else None
+
+        if previous is not None and previous.end > entry.offset:
+            raise ValueError(f"dm table entries overlap: {previous} -> {entry}")
+        if following is not None and entry.end > following.offset:
+            raise ValueError(f"dm table entries overlap: {entry} -> {following}")
+
+        if previous is not None and previous.can_merge(entry):
+            index -= 1
+            entry = DmTable.TableEntry(
+                previous.offset, previous.length + entry.length, previous.target,
+                *previous.params
+            )
+            del self.__offsets[index]
+            del self.__entries[index]
+        if following is not None and entry.can_merge(following):
+            entry = DmTable.TableEntry(
+                entry.offset, entry.length + following.length, entry.target, *entry.params
+            )
+            del self.__offsets[index]
+            del self.__entries[index]
+
+        self.__offsets.insert(index, entry.offset)
+        self.__entries.insert(index, entry)
         return self
 
+    def entry_at(self, lba: int):
+        """Returns entry mapping given LBA or None if LBA is not mapped."""
+        index = bisect.bisect_right(self.__offsets, lba) - 1
+        if index >= 0 and lba < self.__entries[index].end:
+            return self.__entries[index]
+        return None
+
+    def is_free(self, offset: int, length: int):
+        """Checks if range is not mapped by any entry."""
+        index = bisect.bisect_left(self.__offsets, offset + length)
+        return index == 0 or self.__entries[index - 1].end <= offset
+
     def get_gaps(self):
-        if not self.table:
+        if not self.__entries:
             return [(0, -1)]
 
         gaps = []
 
-        self.table.sort(key=lambda entry: entry.offset)
+        if self.__entries[0].offset != 0:
+            gaps.append((0, self.__entries[0].offset))
 
-        if self.table[0].offset != 0:
-            gaps.append((0, self.table[0].offset))
+        for e1, e2 in zip(self.__entries, self.__entries[1:]):
+            if e1.end != e2.offset:
+                gaps.append((e1.end, e2.offset - e1.end))
 
-        for e1, e2 in zip(self.table, self.table[1:]):
-            if e1.offset + e1.length != e2.offset:
-                gaps.append(
-                    (e1.offset + e1.length, e2.offset - (e1.offset + e1.length))
-                )
-
-        if len(self.table) > 1:
-            gaps.append((e2.offset + e2.length, -1))
-        else:
-            gaps.append((self.table[0].offset + self.table[0].length, -1))
+        gaps.append((self.__entries[-1].end, -1))
 
         return gaps
 
     def validate(self):
-        self.table.sort(key=lambda entry: entry.offset)
+        if not self.__entries:
+            raise ValueError("dm table is empty")
 
-        if self.table[0].offset != 0:
-            raise ValueError(f"dm table should start at LBA 0: {self.table[0]}")
+        if self.__entries[0].offset != 0:
+            raise ValueError(f"dm table should start at LBA 0: {self.__entries[0]}")
 
-        for e1, e2 in zip(self.table, self.table[1:]):
-            if e1.offset + e1.length != e2.offset:
-                raise ValueError(
-                    f"dm table should not have any holes or overlaps: {e1} -> {e2}"
-                )
+        for e1, e2 in zip(self.__entries, self.__entries[1:]):
+            if e1.end != e2.offset:
+                raise ValueError(f"dm table should not have any holes: {e1} -> {e2}")
 
     def get_size(self):
-        self.table.sort(key=lambda entry: entry.offset)
+        return Size(self.__entries[-1].end, Unit.Blocks512)
 
-        return Size(self.table[-1].offset + self.table[-1].length, Unit.Blocks512)
+    def summary(self):
+        targets = Counter(str(entry.target) for entry in self.__entries)
+        return f"{len(self.__entries)} entries " \
+            f"({', '.join(f'{target}: {count}' for target, count in targets.items())})"
 
     def __str__(self):
-        output = ""
-
-        for entry in self.table:
-            output += f"{entry}\n"
-
-        return output
+        return "".join(f"{entry}\n" for entry in self.__entries)
 
 
 class DeviceMapper(LinuxCommand):
@@ -195,9 +266,10 @@ class DeviceMapper(LinuxCommand):
         LinuxCommand.__init__(self, TestRun.executor, "dmsetup")
         self.name = name
 
-    @staticmethod
-    def wrap_table(table: DmTable):
-        return f"<< ENDHERE\n{str(table)}ENDHERE\n"
+    # tables with more entries are uploaded as a file instead of being passed inline
+    inline_table_max_entries = 1000
+    # tables with more entries are only summarised in log
+    logged_table_max_entries = 100
 
     def get_path(self):
         return f"/dev/mapper/{self.name}"
@@ -206,21 +278,11 @@ class DeviceMapper(LinuxCommand):
         return TestRun.executor.run_expect_success(f"{self.command_name} clear {self.name}")
 
     def create(self, table: DmTable):
-        try:
-            table.validate()
-        except ValueError:
-            for entry in table.table:
-                TestRun.LOGGER.error(f"{entry}")
-            raise
-
+        table.validate()
         TestRun.LOGGER.info(f"Creating device mapper device '{self.name}'")
+        self.__log_table(table)
 
-        for entry in table.table:
-            TestRun.LOGGER.debug(f"{entry}")
-
-        return TestRun.executor.run_expect_success(
-            f"{self.command_name} create {self.name} {self.wrap_table(table)}"
-        )
+        return self.__run_with_table(f"{self.command_name} create {self.name}", table)
 
     def remove(self):
         TestRun.LOGGER.info(f"Removing device mapper device '{self.name}'")
@@ -238,10 +300,36 @@ class DeviceMapper(LinuxCommand):
     def reload(self, table: DmTable):
         table.validate()
         TestRun.LOGGER.info(f"Reloading table for device mapper device '{self.name}'")
+        self.__log_table(table)
 
-        for entry in table.table:
-            TestRun.LOGGER.debug(f"{entry}")
+        return self.__run_with_table(f"{self.command_name} reload {self.name}", table)
 
-        return TestRun.executor.run_expect_success(
-            f"{self.command_name} reload {self.name} {self.wrap_table(table)}"
-        )
+    def upload_table(self, table: DmTable, path: str = None):
+        """Uploads table as a file over the bulk transfer path. Returns DUT path."""
+        path = path or f"/tmp/dm_table_{self.name}"
+        with tempfile.NamedTemporaryFile("w", delete=False) as local_file:
+            local_file.write(str(table))
+        try:
+            TestRun.executor.rsync_to(local_file.name, path)
+        finally:
+            os.remove(local_file.name)
+        return path
+
+    @staticmethod
+    def wrap_table(table: DmTable):
+        return f"<< ENDHERE\n{str(table)}ENDHERE\n"
+
+    def __run_with_table(self, command: str, table: DmTable):
+        if len(table) <= self.inline_table_max_entries:
+            return TestRun.executor.run_expect_success(f"{command} {self.wrap_table(table)}")
+        path = self.upload_table(table)
+        try:
+            return TestRun.executor.run_expect_success(f"{command} {path}")
+        finally:
+            TestRun.executor.run(f"rm -f {path}")
+
+    def __log_table(self, table: DmTable):
+        TestRun.LOGGER.debug(f"Table: {table.summary()}, size: {table.get_size()}")
+        if len(table) <= self.logged_table_max_entries:
+            for entry in table.table:
+                TestRun.LOGGER.debug(f"{entry}")
@@ -145,18 +145,13 @@ def resolve_to_by_id_link(path):
     link_dirs = ["/dev/disk/by-id", "/dev/disk/by-path"]
     dev_target = readlink(posixpath.join("/dev", path))
 
-    for link_dir in link_dirs:
-        try:
-            links = TestRun.executor.run_expect_success(f"ls {link_dir} -1").stdout.splitlines()
-        except CmdException:
-            continue  # directory may not exist if there are no links of this type
-        for link in links:
-            full_path = posixpath.join(link_dir, link)
-            # handle exception for broken links
-            try:
-                if readlink(full_path) == dev_target:
-                    return full_path
-            except CmdException:
-                continue
+    # resolve all links with a single command, broken links are skipped by 'readlink -e'
+    output = TestRun.executor.run(
+        f"for link in {' '.join(posixpath.join(link_dir, '*') for link_dir in link_dirs)}; "
+        f"do [ \"$(readlink -e \"$link\")\" = \"{dev_target}\" ] && echo \"$link\"; done"
+    )
+    links = output.stdout.splitlines()
+    if links:
+        return links[0]
 
     raise ValueError(f'By-id or by-path device link not found for device {path}')
@@ -7,16 +7,17 @@
 
 import posixpath
 import re
-import time
 
+from datetime import timedelta
 from enum import Enum
 from typing import List
 
 from core.test_run import TestRun
+from test_tools.common.wait import wait_on_dut
 from test_tools.dd import Dd
 from test_tools.fs_tools import readlink, parse_ls_output, ls, check_if_directory_exists, \
     create_directory, is_mounted
-from test_tools.udev import Udev
+from test_tools.udev import Udev, UdevMonitor
 from type_def.size import Size, Unit
 
 SECTOR_SIZE = 512
@@ -97,11 +98,22 @@ def create_partition(
           f'{part_type.name} ' \
           f'{begin.get_value(unit)}{unit.to_short_string()} ' \
           f'{end_cmd}'
-    output = TestRun.executor.run(cmd)
-
-    if output.exit_code != 0:
-        TestRun.executor.run_expect_success("partprobe")
+    with UdevMonitor() as monitor:
+        output = TestRun.executor.run(cmd)
 
+        if output.exit_code != 0:
+            TestRun.executor.run_expect_success("partprobe")
+
+        partition_path = get_partition_path(device.path, part_number)
+        event = monitor.wait_for_event(action="add", device=partition_path,
+                                       timeout=timedelta(seconds=20))
+        if event is None:
+            # kernel might not have re-read partition table
+            TestRun.executor.run_expect_success(f"hdparm -z {device.path}")
+            event = monitor.wait_for_event(action="add", device=partition_path,
+                                           timeout=timedelta(seconds=20))
+    if event is None:
+        raise TimeoutError(f"Timeout while waiting for partition {partition_path}")
     TestRun.executor.run_expect_success("udevadm settle")
     if not check_partition_after_create(
             size=part_size,
@@ -142,32 +154,148 @@ def available_disk_size(device):
 
 
 def create_partitions(device, sizes: [], partition_table_type=PartitionTable.gpt):
-    create_partition_table(device, partition_table_type)
-    partition_type = PartitionType.primary
-    partition_number_offset = 0
+    PartitionLayout(device, sizes, partition_table_type).apply()
+
+
+class PartitionLayout:
+    """
+    Partition layout computed locally and applied in a single sfdisk invocation, followed by
+    one udev settle, one batched verification and one header zeroing pass for all partitions.
+    For msdos tables with more than 4 partitions, partition 4 is an extended partition
+    holding the remaining ones as logical partitions.
+    """
     msdos_part_max_size = Size(2, Unit.TeraByte)
+    msdos_type_codes = {
+        PartitionType.primary: "83",
+        PartitionType.extended: "5",
+        PartitionType.logical: "83",
+    }
+
+    def __init__(self, device, sizes: [], partition_table_type=PartitionTable.gpt,
+                 aligned: bool = True):
+        self.device = device
+        self.partition_table_type = partition_table_type
+        self.aligned = aligned
+        self.gap = Size(1, Unit.MebiByte if not aligned else device.block_size)
+        # list of (number, type, begin, size) - size zero means 'up to the end of the disk'
+        self.entries = []
+        self.__compute(sizes)
+
+    def __compute(self, sizes):
+        begin = get_first_partition_offset(self.device, self.aligned)
+        partition_type = PartitionType.primary
+        number_offset = 0
+
+        for size in sizes:
+            number = len(self.partitions()) + 1 + number_offset
+            if self.partition_table_type == PartitionTable.msdos and len(sizes) > 4 \
+                    and number == 4:
+                if self.device.size - begin > self.msdos_part_max_size:
+                    extended_size = self.msdos_part_max_size
+                else:
+                    extended_size = Size.zero()
+                self.entries.append((4, PartitionType.extended, begin, extended_size))
+                partition_type = PartitionType.logical
+                number_offset = 1
+                number += 1
+
+            if partition_type == PartitionType.logical:
+                begin += self.gap
+            self.entries.append((number, partition_type, begin, size))
+            begin += size
+
+    def partitions(self):
+        return [entry for entry in self.entries if entry[1] != PartitionType.extended]
+
+    def sfdisk_script(self):
+        sector = self.device.block_size.value
+        lines = [f"label: {'dos' if self.partition_table_type == PartitionTable.msdos else 'gpt'}",
+                 "unit: sectors", ""]
+        for _, part_type, begin, size in self.entries:
+            # partitions are numbered in script order (logical ones starting from 5)
+            line = f"start={int(begin.get_value(Unit.Byte)) // sector}"
+            if size != Size.zero():
+                line += f", size={int(size.get_value(Unit.Byte)) // sector}"
+            if self.partition_table_type == PartitionTable.msdos:
+                line += f", type={self.msdos_type_codes[part_type]}"
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+
+    def apply(self):
+        device = self.device
+        TestRun.LOGGER.info(
+            f"Creating {self.partition_table_type.name} partition layout with "
+            f"{len(self.partitions())} partitions on device: {device.path}")
+        with UdevMonitor() as monitor:
+            output = TestRun.executor.run(
+                f"echo '{self.sfdisk_script()}' | sfdisk --wipe always {device.path}")
+            if output.exit_code != 0:
+                TestRun.executor.run_expect_success("partprobe")
+            criteria = [monitor.criteria("add", get_partition_path(device.path, entry[0]))
+                        for entry in self.partitions()]
+            events = monitor.wait_for_events(criteria, timeout=timedelta(seconds=20))
+            if events is None:
+                # kernel might not have re-read partition table
+                TestRun.executor.run_expect_success(f"hdparm -z {device.path}")
+                events = monitor.wait_for_events(criteria, timeout=timedelta(seconds=20))
+        if events is None:
+            raise TimeoutError(f"Timeout while waiting for partitions of {device.path}")
+        device.partition_table = self.partition_table_type
+        Udev.settle()
+
+        sizes = self.__read_partition_sizes()
+        if None in sizes.values():
+            TestRun.LOGGER.info(
+                "Partitions created, but not all found in system, trying 'hdparm -z'")
+            TestRun.executor.run_expect_success(f"hdparm -z {device.path}")
+            Udev.settle()
+            sizes = self.__read_partition_sizes()
+        missing = [number for number, size in sizes.items() if size is None]
+        if missing:
+            raise Exception(f"Could not create partitions: {missing}!")
 
-    for size in sizes:
-        if partition_table_type == PartitionTable.msdos and \
-                len(sizes) > 4 and len(device.partitions) == 3:
-            if available_disk_size(device) > msdos_part_max_size:
-                part_size = msdos_part_max_size
-            else:
-                part_size = Size.zero()
-            create_partition(device,
-                             part_size,
-                             4,
-                             PartitionType.extended)
-            partition_type = PartitionType.logical
-            partition_number_offset = 1
-
-        partition_number = len(device.partitions) + 1 + partition_number_offset
-        create_partition(device=device,
-                         part_size=size,
-                         part_number=partition_number,
-                         part_type=partition_type,
-                         unit=device.block_size,
-                         aligned=True)
+        from storage_devices.partition import Partition
+        new_partitions = []
+        for number, part_type, begin, size in self.partitions():
+            expected_size = size.get_value(Unit.Byte)
+            if size != Size.zero() and sizes[number] != expected_size:
+                TestRun.LOGGER.warning(
+                    f"Partition size {sizes[number]} does not match expected "
+                    f"{expected_size} size.")
+            if self.aligned and expected_size % Unit.Blocks4096.value != 0:
+                TestRun.LOGGER.warning(
+                    f"Partition {get_partition_path(device.path, number)} is not 4k aligned: "
+                    f"{size.get_value(Unit.KibiByte)}KiB")
+            end = begin + size - Size(1, device.block_size) if size != Size.zero() \
+                else device.size
+            new_partitions.append(Partition(device, part_type, number, begin, end))
+
+        if new_partitions:
+            TestRun.executor.run_expect_success(" && ".join(
+                str(Dd().input("/dev/zero")
+                        .output(partition.path)
+                        .count(1)
+                        .block_size(Size(1, Unit.Blocks4096))
+                        .oflag("direct"))
+                for partition in new_partitions
+            ))
+        device.partitions.extend(new_partitions)
+        TestRun.LOGGER.info(
+            f"Successfully created {len(new_partitions)} partitions on {device.path}")
+        return new_partitions
+
+    def __read_partition_sizes(self):
+        """Reads sizes (in bytes) of all partitions with a single command - None if missing."""
+        paths = [get_partition_path(self.device.path, entry[0]) for entry in self.partitions()]
+        output = TestRun.executor.run(
+            f"for path in {' '.join(paths)}; do "
+            f"cat /sys/class/block/$(basename $(readlink -f $path))/size 2>/dev/null "
+            f"|| echo missing; done"
+        ).stdout.split()
+        sizes = {}
+        for entry, value in zip(self.partitions(), output):
+            sizes[entry[0]] = int(value) * SECTOR_SIZE if value.isdigit() else None
+        return sizes
 
 
 def get_block_size(device):
@@ -212,12 +340,9 @@ def check_partition_after_create(size: Size, part_number: int, parent_dev_path:
         output_after_hdparm = TestRun.executor.run_expect_success(
             f"parted --script {parent_dev_path} print").stdout
         TestRun.LOGGER.info(output_after_hdparm)
-
-    counter = 0
-    while partition_path not in output and counter < 10:
-        time.sleep(2)
+        wait_on_dut(f"{cmd} | grep -qF {partition_path}", timedelta(seconds=2),
+                    timedelta(seconds=20))
         output = TestRun.executor.run(cmd).stdout
-        counter += 1
 
     if len(output.split('\n')) > 1 or partition_path not in output:
         return False
@@ -4,7 +4,10 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+from datetime import timedelta
+
 from core.test_run import TestRun
+from test_tools.common.wait import wait_on_dut
 
 
 class Drbdadm:
@@ -57,10 +60,20 @@ class Drbdadm:
 
     # wait sync
     @staticmethod
-    def wait_for_sync(resource_name: str = ""):
-        # ssh connection might timeout in case on long sync
-        cmd = f"drbdadm wait-sync {resource_name}"
-        return TestRun.executor.run_expect_success(cmd)
+    def wait_for_sync(resource_name: str = "", timeout: timedelta = None,
+                      interval: timedelta = timedelta(seconds=5)):
+        # sync status is polled on DUT (like 'drbdadm wait-sync', without limit by default);
+        # in sync means local and peer disks UpToDate and no connection state but Connected
+        cmd = (f"status=$(drbdadm status {resource_name}) && "
+               "echo \"$status\" | grep -qE '(^|[[:space:]])disk:UpToDate' && "
+               "echo \"$status\" | grep -q 'peer-disk:UpToDate' && "
+               "! echo \"$status\" | grep -oE '(peer-)?disk:[A-Za-z]+|connection:[A-Za-z]+' | "
+               "grep -qvE ':(UpToDate|Connected)$'")
+        result = wait_on_dut(cmd, interval, timeout)
+        if not result.success:
+            raise Exception(f"DRBD resource '{resource_name or 'all'}' not in sync after "
+                            f"{result.elapsed}")
+        return result
 
     @staticmethod
     def dump_config(resource_name: str):
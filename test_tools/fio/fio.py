@@ -6,17 +6,40 @@
 #
 
 import datetime
+import json
+import time
 import uuid
+from collections import namedtuple
 
 from packaging.version import Version
 
 from core.test_run import TestRun
 from connection.utils.output import CmdException
 from test_tools import wget
+from test_tools.common.tool_cache import get_tool_capabilities, invalidate_tool_capabilities
+from test_tools.fio.fio_log import parse_fio_logs
 from test_tools.fio.fio_param import FioParam, FioParamCmd, FioOutput, FioParamConfig
 from test_tools.fs_tools import uncompress_archive
 
 
+LOG_PARAMETERS = ["write_bw_log", "write_iops_log", "write_lat_log", "write_hist_log"]
+
+FioCapabilities = namedtuple("FioCapabilities", ["path", "version", "io_engines"])
+
+
+def _detect_fio(executor):
+    output = executor.run("command -v fio && fio --version && fio --enghelp")
+    if output.exit_code != 0:
+        return None
+    lines = [line.strip() for line in output.stdout.splitlines() if line.strip()]
+    return FioCapabilities(
+        path=lines[0],
+        version=Version(lines[1].removeprefix("fio-")),
+        # lines[2] is the "Available IO engines:" header
+        io_engines=lines[3:],
+    )
+
+
 class Fio:
     def __init__(self, executor_obj=None):
         self.min_fio_version = Version(TestRun.config.get("fio_version", "3.40"))
@@ -43,13 +66,17 @@ class Fio:
 
         return self.global_cmd_parameters
 
+    def get_capabilities(self):
+        """Fio binary path, version and supported I/O engines - detected once per executor."""
+        return get_tool_capabilities("fio", _detect_fio, self.executor)
+
     def is_installed(self):
-        try:
-            output = self.executor.run_expect_success("fio --version").stdout
-        except CmdException:
-            return False
-        current_version = Version(output.strip().removeprefix("fio-"))
-        return current_version >= self.min_fio_version
+        capabilities = self.get_capabilities()
+        return capabilities is not None and capabilities.version >= self.min_fio_version
+
+    def get_supported_io_engines(self):
+        capabilities = self.get_capabilities()
+        return capabilities.io_engines if capabilities is not None else []
 
     def install(self):
         fio_url = f"https://github.com/axboe/fio/archive/refs/tags/fio-{self.min_fio_version}.tar.gz"
@@ -59,6 +86,7 @@ class Fio:
             f"cd {fio_package.parent_dir}/fio-fio-{self.min_fio_version}"
             f" && ./configure && make -j && make install"
         )
+        invalidate_tool_capabilities("fio", self.executor)
 
     def calculate_timeout(self):
         if "time_based" not in self.global_cmd_parameters.command_flags:
@@ -87,15 +115,104 @@ class Fio:
         self.prepare_run()
         return self.executor.run_in_background(str(self))
 
+    def run_until_steady_state(self, detector, timeout: datetime.timedelta = None):
+        """
+        Runs fio in background with periodic status reports ('status-interval') and feeds
+        the aggregated bandwidth of every report to the detector. Fio is interrupted (SIGINT,
+        so that it still writes the final report) as soon as steady state is detected.
+        Returns detected window or None.
+        """
+        if timeout is None:
+            timeout = self.calculate_timeout()
+        interval = max(int(detector.interval.total_seconds()), 1)
+        self.base_cmd_parameters.set_param('status-interval', interval)
+
+        try:
+            pid = self.run_in_background()
+            deadline = datetime.datetime.now() + timeout
+            decoder = json.JSONDecoder()
+            offset = 0
+            previous = None
+            while self.executor.check_if_process_exists(pid):
+                if datetime.datetime.now() > deadline:
+                    self.executor.kill_process(pid)
+                    raise TimeoutError("Timeout occurred while waiting for fio steady state")
+                time.sleep(interval)
+                output = self.executor.run(f"tail -c +{offset + 1} {self.fio_file}").stdout
+                position = output.find("{")
+                while position != -1:
+                    try:
+                        report, end = decoder.raw_decode(output, position)
+                    except ValueError:
+                        break  # report not fully written yet
+                    offset += len(output[:end].encode())
+                    output, position = output[end:], output[end:].find("{")
+                    current = (report["timestamp_ms"], sum(
+                        job[direction]["io_bytes"]
+                        for job in report["jobs"] for direction in ["read", "write", "trim"]
+                    ))
+                    if previous is not None and current[0] > previous[0]:
+                        bandwidth = (current[1] - previous[1]) * 1000 / (current[0] - previous[0])
+                        detector.add_sample(bandwidth)
+                    previous = current
+                if detector.is_steady():
+                    TestRun.LOGGER.info(f"Steady state detected in window {detector.window}, "
+                                        f"stopping fio (PID: {pid})")
+                    self.executor.run(f"kill -s SIGINT {pid}")
+                    break
+
+            self.executor.wait_cmd_finish(pid, timeout)
+        finally:
+            self.base_cmd_parameters.remove_param('status-interval')
+        return detector.window
+
     def prepare_run(self):
         if not self.is_installed():
             self.install()
+        self.validate_io_engines()
 
         if len(self.jobs) > 0:
-            self.executor.run(f"{str(self)}-showcmd -")
-            TestRun.LOGGER.info(self.executor.run(f"cat {self.fio_file}").stdout)
+            TestRun.LOGGER.info(self.execution_cmd_parameters())
         TestRun.LOGGER.info(str(self))
 
+    def validate_io_engines(self):
+        supported_engines = self.get_supported_io_engines()
+        for parameters in [self.global_cmd_parameters, *self.jobs]:
+            for engine in parameters.get_parameter_value("ioengine") or []:
+                # external engines are loaded at runtime and not listed by --enghelp
+                if ":" in engine:
+                    continue
+                if engine not in supported_engines:
+                    raise ValueError(f"Fio I/O engine '{engine}' is not supported on DUT. "
+                                     f"Available engines: {', '.join(supported_engines)}")
+
+    def get_log_prefixes(self):
+        prefixes = set()
+        for parameters in [self.global_cmd_parameters, *self.jobs]:
+            for log_parameter in LOG_PARAMETERS:
+                value = parameters.get_parameter_value(log_parameter)
+                if value:
+                    prefixes.add(value[0])
+        return sorted(prefixes)
+
+    def fetch_logs(self, remove: bool = True):
+        """
+        Fetches all per-interval logs enabled by 'write_*_log' parameters with a single command.
+        Returns dict: log file path -> FioLog.
+        """
+        prefixes = self.get_log_prefixes()
+        if not prefixes:
+            return {}
+
+        log_files = " ".join(f"{prefix}_*.log" for prefix in prefixes)
+        command = f"tail -v -n +1 -- {log_files}"
+        if remove:
+            command += f" && rm -f -- {log_files}"
+        output = self.executor.run(command)
+        if output.exit_code != 0:
+            raise CmdException("Failed to fetch fio logs.", output)
+        return parse_fio_logs(output.stdout)
+
     def execution_cmd_parameters(self):
         if len(self.jobs) > 0:
             separator = "\n\n"
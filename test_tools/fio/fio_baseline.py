@@ -0,0 +1,311 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from collections import namedtuple
+from enum import Enum
+
+from core.test_run import TestRun
+from test_tools.fio.fio_result import FioResult
+
+# two-sided Student's t critical values for df = 1..30
+T_CRITICAL_VALUES = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750],
+}
+Z_CRITICAL_VALUES = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+# fio parameters which do not change the workload itself
+VOLATILE_PARAMETERS = ["output", "output-format", "eta", "filename", "directory",
+                       "status-interval", "write_bw_log", "write_iops_log", "write_lat_log",
+                       "write_hist_log"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    build TEXT,
+    test_id TEXT NOT NULL,
+    param_id TEXT NOT NULL,
+    dut TEXT NOT NULL,
+    device_type TEXT NOT NULL,
+    job_signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    job TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (test_id, param_id, dut, device_type, job_signature);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id);
+"""
+
+
+class Metric(Enum):
+    # (direction, fio JSON path, higher is better)
+    read_bandwidth = ("read", ("bw",), True)
+    read_iops = ("read", ("iops",), True)
+    read_latency_mean = ("read", ("lat_ns", "mean"), False)
+    write_bandwidth = ("write", ("bw",), True)
+    write_iops = ("write", ("iops",), True)
+    write_latency_mean = ("write", ("lat_ns", "mean"), False)
+    trim_bandwidth = ("trim", ("bw",), True)
+    trim_iops = ("trim", ("iops",), True)
+    trim_latency_mean = ("trim", ("lat_ns", "mean"), False)
+
+    @property
+    def higher_is_better(self):
+        return self.value[2]
+
+    def extract(self, result: FioResult):
+        direction = result.job.to_dict().get(self.value[0], {})
+        if not direction.get("io_bytes"):
+            return None
+        value = direction
+        for key in self.value[1]:
+            value = value[key]
+        return float(value)
+
+
+class Verdict(Enum):
+    no_baseline = "no baseline"
+    unchanged = "unchanged"
+    improvement = "improvement"
+    regression = "regression"
+
+
+BaselineKey = namedtuple(
+    "BaselineKey", ["test_id", "param_id", "dut", "device_type", "job_signature"]
+)
+
+Comparison = namedtuple(
+    "Comparison",
+    ["job", "metric", "value", "baseline_mean", "interval", "change", "samples", "verdict"]
+)
+
+
+def job_signature(fio_param):
+    """Stable hash of workload parameters (global section and all jobs) of given fio command."""
+    fio = fio_param.fio
+    sections = []
+    for section in [fio.global_cmd_parameters, *fio.jobs]:
+        sections.append({
+            "name": section.command_name,
+            "params": {key: value for key, value in sorted(section.command_param.items())
+                       if key not in VOLATILE_PARAMETERS},
+            "flags": sorted(section.command_flags),
+        })
+    serialized = json.dumps(sections, sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+def dut_fingerprint(executor=None):
+    """Hash of DUT kernel, CPU model, CPU count and memory size."""
+    executor = executor or TestRun.executor
+    output = executor.run_expect_success(
+        "uname -r; grep -m1 'model name' /proc/cpuinfo; nproc; grep MemTotal /proc/meminfo"
+    ).stdout
+    return hashlib.sha256(output.encode()).hexdigest()[:16]
+
+
+def baseline_key(fio_param, device_type, test_id=None, param_id=None, dut=None):
+    """Builds baseline key - test and parametrization ids are taken from current test item."""
+    item = getattr(TestRun, "item", None)
+    if test_id is None:
+        test_id = item.originalname if item is not None else "unknown"
+    if param_id is None:
+        callspec = getattr(item, "callspec", None)
+        param_id = callspec.id if callspec is not None else ""
+    return BaselineKey(
+        test_id=test_id,
+        param_id=param_id,
+        dut=dut or dut_fingerprint(),
+        device_type=getattr(device_type, "name", str(device_type)),
+        job_signature=job_signature(fio_param),
+    )
+
+
+def critical_value(confidence: float, samples: int):
+    if confidence not in T_CRITICAL_VALUES:
+        raise ValueError(f"Supported confidence levels: {list(T_CRITICAL_VALUES)}")
+    degrees_of_freedom = samples - 1
+    if degrees_of_freedom <= len(T_CRITICAL_VALUES[confidence]):
+        return T_CRITICAL_VALUES[confidence][degrees_of_freedom - 1]
+    return Z_CRITICAL_VALUES[confidence]
+
+
+class FioBaseline:
+    """
+    Local performance baseline database. Stores metrics of FioResults per run and flags
+    statistically significant regressions/improvements against previous runs with the same key.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def store(self, results: [FioResult], key: BaselineKey, build: str = None):
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (timestamp, build, test_id, param_id, dut, device_type, "
+                "job_signature) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), build, *key),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, job, metric, value) VALUES (?, ?, ?, ?)",
+                [(run_id, job, metric.name, value)
+                 for job, metric, value in self.__extract_metrics(results)],
+            )
+        return run_id
+
+    def history(self, key: BaselineKey, metric: Metric, job: str = None, limit: int = None):
+        """Returns list of (timestamp, build, job, value) tuples, oldest first."""
+        query = (
+            "SELECT runs.timestamp, runs.build, metrics.job, metrics.value FROM runs "
+            "JOIN metrics ON metrics.run_id = runs.id WHERE runs.test_id = ? "
+            "AND runs.param_id = ? AND runs.dut = ? AND runs.device_type = ? "
+            "AND runs.job_signature = ? AND metrics.metric = ?"
+        )
+        args = [*key, metric.name]
+        if job is not None:
+            query += " AND metrics.job = ?"
+            args.append(job)
+        query += " ORDER BY runs.timestamp DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        return list(reversed(self.connection.execute(query, args).fetchall()))
+
+    def compare(self, results: [FioResult], key: BaselineKey, confidence: float = 0.95,
+                last_runs: int = 10):
+        """
+        Compares results against the last runs stored under the same key. A metric is flagged
+        when its value falls outside of the prediction interval of the baseline samples.
+        """
+        comparisons = []
+        for job, metric, value in self.__extract_metrics(results):
+            baseline = [row[3] for row in self.history(key, metric, job, last_runs)]
+            comparisons.append(self.__compare_value(job, metric, value, baseline, confidence))
+        return comparisons
+
+    def compare_and_store(self, results: [FioResult], key: BaselineKey, build: str = None,
+                          confidence: float = 0.95, last_runs: int = 10):
+        comparisons = self.compare(results, key, confidence, last_runs)
+        self.store(results, key, build)
+        for comparison in comparisons:
+            message = (f"{comparison.job} {comparison.metric.name}: {comparison.value:.2f} "
+                       f"({comparison.verdict.value}")
+            if comparison.baseline_mean is not None:
+                message += (f", baseline {comparison.baseline_mean:.2f} "
+                            f"[{comparison.interval[0]:.2f}, {comparison.interval[1]:.2f}]")
+            message += ")"
+            if comparison.verdict == Verdict.regression:
+                TestRun.LOGGER.warning(message)
+            else:
+                TestRun.LOGGER.info(message)
+        return comparisons
+
+    def keys(self):
+        return [BaselineKey(*row) for row in self.connection.execute(
+            "SELECT DISTINCT test_id, param_id, dut, device_type, job_signature FROM runs "
+            "ORDER BY test_id, param_id"
+        ).fetchall()]
+
+    @staticmethod
+    def __extract_metrics(results: [FioResult]):
+        metrics = []
+        for result in results:
+            job = result.job.get("jobname", "")
+            for metric in Metric:
+                value = metric.extract(result)
+                if value is not None:
+                    metrics.append((job, metric, value))
+        return metrics
+
+    @staticmethod
+    def __compare_value(job, metric: Metric, value: float, baseline: [float],
+                        confidence: float):
+        if len(baseline) < 2:
+            return Comparison(job, metric, value, None, None, None, len(baseline),
+                              Verdict.no_baseline)
+
+        samples = len(baseline)
+        mean = sum(baseline) / samples
+        deviation = math.sqrt(sum((x - mean) ** 2 for x in baseline) / (samples - 1))
+        margin = critical_value(confidence, samples) * deviation * math.sqrt(1 + 1 / samples)
+        interval = (mean - margin, mean + margin)
+        change = (value - mean) / mean if mean else None
+
+        if interval[0] <= value <= interval[1]:
+            verdict = Verdict.unchanged
+        elif (value > interval[1]) == metric.higher_is_better:
+            verdict = Verdict.improvement
+        else:
+            verdict = Verdict.regression
+        return Comparison(job, metric, value, mean, interval, change, samples, verdict)
+
+
+def report(baseline: FioBaseline, test_filter: str = None, metric_filter: str = None,
+           last_runs: int = 20):
+    lines = []
+    for key in baseline.keys():
+        if test_filter and test_filter not in key.test_id:
+            continue
+        lines.append(f"{key.test_id}[{key.param_id}] dut={key.dut} device={key.device_type} "
+                     f"job={key.job_signature}")
+        for metric in Metric:
+            if metric_filter and metric_filter not in metric.name:
+                continue
+            history = baseline.history(key, metric, limit=last_runs)
+            jobs = sorted({row[2] for row in history})
+            for job in jobs:
+                values = [row[3] for row in history if row[2] == job]
+                builds = [row[1] or "-" for row in history if row[2] == job]
+                first, last = values[0], values[-1]
+                trend = f"{(last - first) / first * 100:+.1f}%" if first else "n/a"
+                lines.append(f"  {job} {metric.name}: runs={len(values)} last={last:.2f} "
+                             f"min={min(values):.2f} max={max(values):.2f} trend={trend}")
+                lines.append("    " + " ".join(
+                    f"{build}:{value:.2f}" for build, value in zip(builds, values)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fio performance baseline report")
+    parser.add_argument("--db", required=True, help="path to baseline database")
+    parser.add_argument("--test", help="show only tests containing given string")
+    parser.add_argument("--metric", help="show only metrics containing given string")
+    parser.add_argument("--last-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with FioBaseline(args.db) as baseline:
+        print(report(baseline, args.test, args.metric, args.last_runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import re
+from datetime import timedelta
+from enum import Enum, IntEnum
+
+import numpy as np
+
+# fio histogram layout (FIO_IO_U_PLAT_BITS, FIO_IO_U_PLAT_VAL)
+PLAT_BITS = 6
+PLAT_VAL = 1 << PLAT_BITS
+
+LOG_FILE_REGEX = re.compile(
+    r"^(?P<prefix>.+)_(?P<type>clat_hist|bw|iops|lat|clat|slat)(\.(?P<job>\d+))?\.log$"
+)
+TAIL_HEADER_REGEX = re.compile(r"^==> (?P<path>.+) <==$")
+
+
+class FioLogType(Enum):
+    bw = "bw"
+    iops = "iops"
+    lat = "lat"
+    clat = "clat"
+    slat = "slat"
+    clat_hist = "clat_hist"
+
+
+class FioDataDirection(IntEnum):
+    read = 0
+    write = 1
+    trim = 2
+
+
+class FioLog:
+    """
+    Per-interval fio log (bandwidth, IOPS or latency) stored as NumPy arrays.
+    Time is expressed in milliseconds since fio start, latency values in nanoseconds,
+    bandwidth in KiB/s.
+    """
+    def __init__(self, path: str, log_type: FioLogType, job_number: int, data: np.ndarray):
+        self.path = path
+        self.log_type = log_type
+        self.job_number = job_number
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def time(self):
+        return self.data[:, 0]
+
+    @property
+    def value(self):
+        return self.data[:, 1]
+
+    @property
+    def direction(self):
+        return self.data[:, 2].astype(np.int64)
+
+    @property
+    def block_size(self):
+        return self.data[:, 3].astype(np.int64)
+
+    @property
+    def offset(self):
+        # fio 3.x rows: time, value, direction, block size, [offset,] priority
+        if self.data.shape[1] < 6:
+            raise ValueError(f"Log {self.path} does not contain offsets (see 'log_offset')")
+        return self.data[:, 4].astype(np.int64)
+
+    def filter(self, direction: FioDataDirection):
+        return self.__class__(self.path, self.log_type, self.job_number,
+                              self.data[self.direction == direction])
+
+    def window_indices(self, window: timedelta):
+        """Returns window start times (ms) and window index of every sample."""
+        window_ms = window.total_seconds() * 1000
+        if window_ms <= 0:
+            raise ValueError("Window must be positive.")
+        indices = (self.time // window_ms).astype(np.int64)
+        window_count = int(indices.max()) + 1 if len(indices) else 0
+        return np.arange(window_count) * window_ms, indices
+
+    def mean(self, window: timedelta = None):
+        if window is None:
+            return float(np.mean(self.value)) if len(self) else float("nan")
+        starts, indices = self.window_indices(window)
+        sums = np.bincount(indices, weights=self.value, minlength=len(starts))
+        counts = np.bincount(indices, minlength=len(starts))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return starts, sums / counts
+
+    def percentile(self, percentile: float, window: timedelta = None):
+        """
+        Returns percentile of logged values. If window is given, returns array of window start
+        times and array of percentiles computed separately for every window (NaN for windows
+        without samples).
+        """
+        if window is None:
+            return float(np.percentile(self.value, percentile)) if len(self) else float("nan")
+        starts, indices = self.window_indices(window)
+        order = np.argsort(indices, kind="stable")
+        boundaries = np.searchsorted(indices[order], np.arange(len(starts) + 1))
+        sorted_values = self.value[order]
+        result = np.full(len(starts), np.nan)
+        for i in range(len(starts)):
+            chunk = sorted_values[boundaries[i]:boundaries[i + 1]]
+            if len(chunk):
+                result[i] = np.percentile(chunk, percentile)
+        return starts, result
+
+    @staticmethod
+    def parse_data(content: str):
+        lines = [line for line in content.splitlines() if line.strip()]
+        if not lines:
+            return np.empty((0, 5))
+        data = np.array([line.split(",") for line in lines], dtype=np.float64)
+        return data
+
+    @classmethod
+    def parse(cls, path: str, content: str):
+        match = LOG_FILE_REGEX.match(path.split("/")[-1])
+        if not match:
+            raise ValueError(f"Unrecognized fio log file name: {path}")
+        log_type = FioLogType(match["type"])
+        job_number = int(match["job"]) if match["job"] else None
+        log_class = FioHistLog if log_type == FioLogType.clat_hist else FioLog
+        return log_class(path, log_type, job_number, log_class.parse_data(content))
+
+
+class FioHistLog(FioLog):
+    """
+    Completion latency histogram log ('write_hist_log'). Every row holds time, data direction,
+    block size and per-interval bin counts.
+    """
+    @property
+    def value(self):
+        raise AttributeError("Histogram log has no value column, use bins instead.")
+
+    @property
+    def direction(self):
+        return self.data[:, 1].astype(np.int64)
+
+    @property
+    def block_size(self):
+        return self.data[:, 2].astype(np.int64)
+
+    @property
+    def offset(self):
+        raise AttributeError("Histogram log has no offset column.")
+
+    @property
+    def bins(self):
+        return self.data[:, 3:]
+
+    @property
+    def bin_values(self):
+        """Latency (ns) represented by every histogram bin."""
+        return plat_idx_to_val(np.arange(self.bins.shape[1]))
+
+    def mean(self, window: timedelta = None):
+        """Returns mean latency (ns) weighted by bin counts, per window if window is given."""
+        if window is None:
+            return histogram_mean(self.bin_values, self.bins.sum(axis=0))
+        starts, indices = self.window_indices(window)
+        result = np.full(len(starts), np.nan)
+        for i in range(len(starts)):
+            result[i] = histogram_mean(self.bin_values, self.bins[indices == i].sum(axis=0))
+        return starts, result
+
+    def percentile(self, percentile: float, window: timedelta = None):
+        if window is None:
+            return histogram_percentile(self.bin_values, self.bins.sum(axis=0), percentile)
+        starts, indices = self.window_indices(window)
+        result = np.full(len(starts), np.nan)
+        for i in range(len(starts)):
+            counts = self.bins[indices == i].sum(axis=0)
+            result[i] = histogram_percentile(self.bin_values, counts, percentile)
+        return starts, result
+
+
+def plat_idx_to_val(index):
+    """Vectorized port of fio's plat_idx_to_val() - returns bin midpoint in ns."""
+    index = np.asarray(index, dtype=np.int64)
+    error_bits = np.maximum((index >> PLAT_BITS) - 1, 0)
+    base = np.left_shift(1, error_bits + PLAT_BITS)
+    k = index % PLAT_VAL
+    value = base + (k + 0.5) * np.left_shift(1, error_bits)
+    return np.where(index < (PLAT_VAL << 1), index, value).astype(np.float64)
+
+
+def histogram_mean(bin_values: np.ndarray, counts: np.ndarray):
+    total = counts.sum()
+    if total == 0:
+        return float("nan")
+    return float(np.dot(bin_values, counts) / total)
+
+
+def histogram_percentile(bin_values: np.ndarray, counts: np.ndarray, percentile: float):
+    total = counts.sum()
+    if total == 0:
+        return float("nan")
+    cumulative = np.cumsum(counts)
+    return float(bin_values[np.searchsorted(cumulative, total * percentile / 100)])
+
+
+def parse_fio_logs(output: str):
+    """Parses concatenated log files in 'tail -v -n +1' format. Returns dict: path -> FioLog."""
+    logs = {}
+    path, lines = None, []
+    for line in output.splitlines():
+        match = TAIL_HEADER_REGEX.match(line)
+        if match:
+            if path is not None:
+                logs[path] = FioLog.parse(path, "\n".join(lines))
+            path, lines = match["path"], []
+        else:
+            lines.append(line)
+    if path is not None:
+        logs[path] = FioLog.parse(path, "\n".join(lines))
+    return logs
@@ -1,6 +1,7 @@
 #
 # Copyright(c) 2019-2022 Intel Corporation
 # Copyright(c) 2025 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
@@ -8,12 +9,11 @@ import datetime
 import json
 import secrets
 from enum import Enum
-from types import SimpleNamespace as Namespace
 
 from connection.base_executor import BaseExecutor
 from core.test_run import TestRun
 from storage_devices.device import Device
-from test_tools.fio.fio_result import FioResult
+from test_tools.fio.fio_result import FioResult, FioJsonNode
 from test_tools.common.linux_command import LinuxCommand
 from type_def.size import Size
 
@@ -95,6 +95,21 @@ class RandomGenerator(Enum):
     tausworthe64 = 2
 
 
+class SteadyStateMetric(Enum):
+    # Collect IOPS data. Stop the job if all individual IOPS measurements are within the
+    # specified limit of the mean IOPS.
+    iops = "iops"
+    # Collect IOPS data and calculate the least squares regression slope.
+    # Stop the job if the slope falls below the specified limit.
+    iops_slope = "iops_slope"
+    # Collect bandwidth data. Stop the job if all individual bandwidth measurements are within
+    # the specified limit of the mean bandwidth.
+    bw = "bw"
+    # Collect bandwidth data and calculate the least squares regression slope.
+    # Stop the job if the slope falls below the specified limit.
+    bw_slope = "bw_slope"
+
+
 class FioParam(LinuxCommand):
     def __init__(self, fio, command_executor: BaseExecutor, command_name):
         LinuxCommand.__init__(self, command_executor, command_name)
@@ -255,6 +270,15 @@ class FioParam(LinuxCommand):
     def size(self, value: Size):
         return self.set_param('size', int(value.get_value()))
 
+    def steady_state(self, metric: SteadyStateMetric, limit: float, percentage: bool = True):
+        return self.set_param('steadystate', f"{metric.value}:{limit}{'%' if percentage else ''}")
+
+    def steady_state_duration(self, value: datetime.timedelta):
+        return self.set_param('steadystate_duration', int(value.total_seconds()))
+
+    def steady_state_ramp_time(self, value: datetime.timedelta):
+        return self.set_param('steadystate_ramp_time', int(value.total_seconds()))
+
     def stonewall(self, value: bool = True):
         return self.set_flags('stonewall') if value else self.remove_param('stonewall')
 
@@ -323,6 +347,33 @@ class FioParam(LinuxCommand):
     def write_hint(self, value: str):
         return self.set_param('write_hint', value)
 
+    def write_bw_log(self, prefix: str):
+        return self.set_param('write_bw_log', prefix)
+
+    def write_iops_log(self, prefix: str):
+        return self.set_param('write_iops_log', prefix)
+
+    def write_lat_log(self, prefix: str):
+        return self.set_param('write_lat_log', prefix)
+
+    def write_hist_log(self, prefix: str):
+        return self.set_param('write_hist_log', prefix)
+
+    def log_avg_msec(self, value: datetime.timedelta):
+        return self.set_param('log_avg_msec', int(value.total_seconds() * 1000))
+
+    def log_hist_msec(self, value: datetime.timedelta):
+        return self.set_param('log_hist_msec', int(value.total_seconds() * 1000))
+
+    def log_max_value(self, value: bool = True):
+        return self.set_param('log_max_value', int(value))
+
+    def log_offset(self, value: bool = True):
+        return self.set_param('log_offset', int(value))
+
+    def per_job_logs(self, value: bool = True):
+        return self.set_param('per_job_logs', int(value))
+
     def write_percentage(self, value: int):
         if value <= 100:
             return self.set_param('rwmixwrite', value)
@@ -362,6 +413,21 @@ class FioParam(LinuxCommand):
             raise Exception(f"Exception occurred while trying to execute fio, exit_code:"
                             f"{fio_output.exit_code}.\n"
                             f"stdout: {fio_output.stdout}\nstderr: {fio_output.stderr}")
+        return self.read_results()
+
+    def run_until_steady_state(self, detector, fio_timeout: datetime.timedelta = None):
+        """
+        Runs fio in background and stops it as soon as the controller-side detector
+        (see SteadyStateDetector) reports steady state. The detected window is stored in
+        every returned FioResult.
+        """
+        window = self.fio.run_until_steady_state(detector, fio_timeout)
+        results = self.read_results()
+        for result in results:
+            result.steady_state_window = window
+        return results
+
+    def read_results(self):
         TestRun.executor.run(f"sed -i '/^[[:alnum:]]/d' {self.fio.fio_file}")  # Remove warnings
         out = self.command_executor.run_expect_success(f"cat {self.fio.fio_file}").stdout
         return self.get_results(out)
@@ -371,16 +437,15 @@ class FioParam(LinuxCommand):
             self.fio.global_cmd_parameters.set_param("per_job_logs", '0')
         return self.fio.run_in_background()
 
+    def fetch_logs(self, remove: bool = True):
+        return self.fio.fetch_logs(remove)
+
     @staticmethod
     def get_results(result):
-        data = json.loads(result, object_hook=lambda d: Namespace(**d))
-        jobs_list = []
-        if hasattr(data, 'jobs'):
-            jobs = data.jobs
-            for job in jobs:
-                job_result = FioResult(data, job)
-                jobs_list.append(job_result)
-        return jobs_list
+        # with 'status-interval' output contains periodic reports, the last one is final
+        start = result.rfind("\n{")
+        data = FioJsonNode(json.loads(result[start + 1:] if start != -1 else result))
+        return [FioResult(data, job) for job in data.get("jobs", [])]
 
 
 class FioParamCmd(FioParam):
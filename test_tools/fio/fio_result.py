@@ -1,17 +1,65 @@
 #
 # Copyright(c) 2019-2021 Intel Corporation
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import numpy as np
 
 from type_def.size import Size, Unit, UnitPerSecond
 from type_def.time import Time
 
 
+class FioJsonNode:
+    """
+    Read-only attribute view of a decoded fio JSON object. Nested objects are wrapped only when
+    they are accessed, so large sections (e.g. 'json+' latency bins) are never converted.
+    """
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._wrap(self._data[name])
+        except KeyError:
+            raise AttributeError(f"fio result has no '{name}' field") from None
+
+    def __getitem__(self, key):
+        return self._wrap(self._data[key])
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return f"FioJsonNode({list(self._data.keys())})"
+
+    def get(self, key, default=None):
+        return self._wrap(self._data[key]) if key in self._data else default
+
+    def to_dict(self):
+        return self._data
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, dict):
+            return FioJsonNode(value)
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return [FioJsonNode(item) for item in value]
+        return value
+
+
 class FioResult:
+    __slots__ = ("result", "job", "steady_state_window", "_latency_bins")
+
     def __init__(self, result, job):
-        self.result = result
-        self.job = job
+        self.result = result if isinstance(result, FioJsonNode) else FioJsonNode(result)
+        self.job = job if isinstance(job, FioJsonNode) else FioJsonNode(job)
+        self.steady_state_window = None
+        self._latency_bins = {}
 
     def __str__(self):
         result_dict = {
@@ -43,14 +91,34 @@ class FioResult:
         return s
 
     def total_errors(self):
-        return getattr(self.job, "total_err", 0)
+        return self.job.get("total_err", 0)
 
     def disks_name(self):
-        disks_name = []
-        if hasattr(self.result, "disk_util"):
-            for disk in self.result.disk_util:
-                disks_name.append(disk.name)
-        return disks_name
+        return [disk["name"] for disk in self.result.to_dict().get("disk_util", [])]
+
+    def steady_state_attained(self):
+        steady_state = self.job.get("steadystate")
+        return bool(steady_state.attained) if steady_state is not None else False
+
+    def steady_state_criterion(self):
+        steady_state = self.job.get("steadystate")
+        return steady_state.criterion if steady_state is not None else None
+
+    def completion_latency_bins(self, direction: str):
+        """
+        Returns completion latency histogram from 'json+' output as two NumPy arrays:
+        bin latency values (ns) and number of I/Os in every bin.
+        """
+        if direction not in self._latency_bins:
+            bins = self.job.to_dict()[direction]["clat_ns"].get("bins")
+            if bins is None:
+                raise ValueError("Latency bins are available only with 'json+' output format")
+            values = np.fromiter((int(value) for value in bins.keys()), dtype=np.int64,
+                                 count=len(bins))
+            counts = np.fromiter(bins.values(), dtype=np.int64, count=len(bins))
+            order = np.argsort(values)
+            self._latency_bins[direction] = (values[order], counts[order])
+        return self._latency_bins[direction]
 
     def read_io(self):
         return Size(self.job.read.io_kbytes, Unit.KibiByte)
@@ -80,7 +148,10 @@ class FioResult:
         return Time(nanoseconds=self.job.read.lat_ns.mean)
 
     def read_completion_latency_percentile(self):
-        return self.job.read.lat_ns.percentile.__dict__
+        return self.job.read.lat_ns.percentile.to_dict()
+
+    def read_completion_latency_bins(self):
+        return self.completion_latency_bins("read")
 
     def read_requests_number(self):
         return self.result.disk_util[0].read_ios
@@ -113,7 +184,10 @@ class FioResult:
         return Time(nanoseconds=self.job.write.lat_ns.mean)
 
     def write_completion_latency_percentile(self):
-        return self.job.write.lat_ns.percentile.__dict__
+        return self.job.write.lat_ns.percentile.to_dict()
+
+    def write_completion_latency_bins(self):
+        return self.completion_latency_bins("write")
 
     def write_requests_number(self):
         return self.result.disk_util[0].write_ios
@@ -146,7 +220,10 @@ class FioResult:
         return Time(nanoseconds=self.job.trim.lat_ns.mean)
 
     def trim_completion_latency_percentile(self):
-        return self.job.trim.lat_ns.percentile.__dict__
+        return self.job.trim.lat_ns.percentile.to_dict()
+
+    def trim_completion_latency_bins(self):
+        return self.completion_latency_bins("trim")
 
     @staticmethod
     def result_list_to_dict(results):
@@ -0,0 +1,62 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from datetime import timedelta
+
+import numpy as np
+
+
+class SteadyStateDetector:
+    """
+    Controller-side steady state detector working on a stream of per-interval samples
+    (e.g. bandwidth or IOPS). Steady state is reached when, over the last 'window_size'
+    samples, both:
+    - slope excursion of the least-squares fit line across the window does not exceed
+      'max_slope' fraction of the window average,
+    - relative standard deviation of samples does not exceed 'max_deviation'.
+    """
+    def __init__(self, interval: timedelta, window_size: int = 5, max_slope: float = 0.1,
+                 max_deviation: float = 0.1, ramp_time: timedelta = timedelta(0)):
+        if window_size < 2:
+            raise ValueError("Steady state window must contain at least 2 samples.")
+        self.interval = interval
+        self.window_size = window_size
+        self.max_slope = max_slope
+        self.max_deviation = max_deviation
+        self.ramp_time = ramp_time
+        self.samples = []
+        self.window = None
+
+    def add_sample(self, value: float):
+        bucket = self.samples[-1][0] + 1 if self.samples else 1
+        self.samples.append((bucket, float(value)))
+        return self.__check(self.samples)
+
+    def is_steady(self):
+        return self.window is not None
+
+    def __check(self, samples):
+        if self.window is not None:
+            return True
+
+        ramp_buckets = self.ramp_time / self.interval
+        samples = [sample for sample in samples if sample[0] - 1 >= ramp_buckets]
+        if len(samples) < self.window_size:
+            return False
+
+        buckets, values = zip(*samples[-self.window_size:])
+        x = np.asarray(buckets, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+        mean = y.mean()
+        if mean == 0:
+            return False
+
+        slope = np.polyfit(x, y, 1)[0]
+        slope_excursion = abs(slope * (x[-1] - x[0]))
+        deviation = y.std() / mean
+        if slope_excursion <= self.max_slope * mean and deviation <= self.max_deviation:
+            self.window = (self.interval * (buckets[0] - 1), self.interval * buckets[-1])
+            return True
+        return False
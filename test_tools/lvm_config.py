@@ -0,0 +1,246 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+import re
+import tempfile
+import uuid
+
+from core.test_run import TestRun
+
+lvm_config_path = "/etc/lvm/lvm.conf"
+
+SECTION_REGEX = re.compile(r"^\s*(?P<name>[\w/]+)\s*\{\s*(#.*)?$")
+SECTION_END_REGEX = re.compile(r"^\s*\}\s*(#.*)?$")
+SETTING_REGEX = re.compile(r"^(?P<indent>\s*)(?P<key>\w+)\s*=\s*(?P<value>.*)$")
+COMMENTED_SETTING_REGEX = re.compile(r"^(?P<indent>\s*)#\s*(?P<key>\w+)\s*=")
+VALUE_TOKEN_REGEX = re.compile(r'\s*(?:"(?P<string>(?:[^"\\]|\\.)*)"|(?P<bracket>[\[\],])|'
+                               r'(?P<number>-?\d+(?:\.\d+)?)|(?P<comment>#[^\n]*))')
+
+
+class ConfigSetting:
+    def __init__(self, key: str, value, indent: str = "\t", lines: [str] = None):
+        self.key = key
+        self.value = value
+        self.indent = indent
+        # original lines are kept until the setting is modified
+        self.lines = lines
+
+    def render(self):
+        if self.lines is not None:
+            return self.lines
+        return [f"{self.indent}{self.key} = {format_value(self.value)}"]
+
+
+class ConfigSection:
+    def __init__(self, name: str, indent: str = "", header: str = None, footer: str = None):
+        self.name = name
+        self.indent = indent
+        self.header = header if header is not None else f"{indent}{name} {{"
+        self.footer = footer if footer is not None else f"{indent}}}"
+        # ConfigSection, ConfigSetting or raw (comment/blank) line
+        self.items = []
+
+    def get_item(self, name: str):
+        for item in self.items:
+            if isinstance(item, ConfigSection) and item.name == name:
+                return item
+            if isinstance(item, ConfigSetting) and item.key == name:
+                return item
+        return None
+
+    def render(self):
+        lines = [self.header]
+        for item in self.items:
+            lines.extend([item] if isinstance(item, str) else item.render())
+        lines.append(self.footer)
+        return lines
+
+
+def format_value(value):
+    if isinstance(value, list):
+        return "[ " + ", ".join(format_value(item) for item in value) + " ]"
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return str(value)
+
+
+def parse_value(text: str):
+    """Parses lvm.conf value (string, number or list of them)."""
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = VALUE_TOKEN_REGEX.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Cannot parse lvm config value: {text}")
+        position = match.end()
+        if match["string"] is not None:
+            tokens.append(re.sub(r"\\(.)", r"\1", match["string"]))
+        elif match["number"] is not None:
+            number = match["number"]
+            tokens.append(float(number) if "." in number else int(number))
+        elif match["bracket"] is not None:
+            tokens.append(match["bracket"])
+    if tokens and tokens[0] == "[":
+        return [token for token in tokens[1:-1] if token != ","]
+    return tokens[0] if tokens else None
+
+
+def is_value_complete(text: str):
+    """Checks if brackets of (possibly multi-line) list value are balanced."""
+    depth = 0
+    for match in VALUE_TOKEN_REGEX.finditer(text):
+        if match["bracket"] == "[":
+            depth += 1
+        elif match["bracket"] == "]":
+            depth -= 1
+    return depth <= 0
+
+
+class LvmConfigEditor:
+    """
+    Structured lvm.conf editor. The config is fetched with a single command, parsed into
+    a tree of sections and settings (comments and untouched settings are preserved verbatim),
+    modified locally and uploaded atomically (temporary file renamed over the config).
+    The previous config is kept as a hard link, which makes rollback a single rename.
+    Settings are addressed with paths like 'devices/filter'.
+    """
+    def __init__(self, content: str, path: str = lvm_config_path):
+        self.path = path
+        self.root = self.parse(content)
+
+    @classmethod
+    def fetch(cls, path: str = lvm_config_path):
+        output = TestRun.executor.run_expect_success(f"cat {path}")
+        return cls(output.stdout, path)
+
+    @staticmethod
+    def parse(content: str):
+        root = ConfigSection("", header="", footer="")
+        stack = [root]
+        lines = content.splitlines()
+        index = 0
+        while index < len(lines):
+            line = lines[index]
+            index += 1
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                stack[-1].items.append(line)
+                continue
+            match = SECTION_REGEX.match(line)
+            if match:
+                section = ConfigSection(match["name"], line[:len(line) - len(line.lstrip())],
+                                        header=line)
+                stack[-1].items.append(section)
+                stack.append(section)
+                continue
+            if SECTION_END_REGEX.match(line) and len(stack) > 1:
+                stack.pop().footer = line
+                continue
+            match = SETTING_REGEX.match(line)
+            if not match:
+                raise ValueError(f"Cannot parse lvm config line: {line}")
+            setting_lines = [line]
+            value = match["value"]
+            while not is_value_complete(value) and index < len(lines):
+                setting_lines.append(lines[index])
+                value += "\n" + lines[index]
+                index += 1
+            stack[-1].items.append(ConfigSetting(match["key"], parse_value(value),
+                                                 match["indent"], setting_lines))
+        if len(stack) > 1:
+            raise ValueError(f"Unterminated lvm config section: {stack[-1].name}")
+        return root
+
+    def render(self):
+        return "\n".join(self.root.render()[1:-1]) + "\n"
+
+    def get(self, path: str, default=None):
+        setting = self.__find(path)
+        return setting.value if isinstance(setting, ConfigSetting) else default
+
+    def get_definition(self, path: str):
+        """Returns setting as it is rendered in config or empty string if not set."""
+        setting = self.__find(path)
+        return "\n".join(setting.render()) if isinstance(setting, ConfigSetting) else ""
+
+    def set(self, path: str, value):
+        """
+        Sets value of setting. Setting not defined yet replaces its commented-out default
+        definition (the last one in section) or is appended to section if there is none.
+        """
+        section_path, key = path.rsplit("/", 1)
+        section = self.__section(section_path, create=True)
+        setting = section.get_item(key)
+        if isinstance(setting, ConfigSetting):
+            setting.value = value
+            setting.lines = None
+            return self
+        commented = [index for index, item in enumerate(section.items) if isinstance(item, str)
+                     and (match := COMMENTED_SETTING_REGEX.match(item)) and match["key"] == key]
+        if commented:
+            indent = COMMENTED_SETTING_REGEX.match(section.items[commented[-1]])["indent"]
+            section.items[commented[-1]] = ConfigSetting(key, value, indent)
+        else:
+            section.items.append(ConfigSetting(key, value, section.indent + "\t"))
+        return self
+
+    def remove(self, path: str):
+        section_path, key = path.rsplit("/", 1)
+        section = self.__section(section_path)
+        if section is not None:
+            section.items = [item for item in section.items
+                             if not (isinstance(item, ConfigSetting) and item.key == key)]
+        return self
+
+    def prepend_to_list(self, path: str, items: list):
+        """Adds items not yet present in list setting at its beginning."""
+        current = self.get(path, [])
+        new_items = [item for item in items if item not in current]
+        if new_items:
+            self.set(path, new_items + current)
+        return new_items
+
+    def upload(self, backup: bool = True):
+        """Uploads config atomically, keeping the previous one for rollback()."""
+        remote_temporary = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with tempfile.NamedTemporaryFile("w", delete=False) as local_file:
+            local_file.write(self.render())
+        try:
+            TestRun.executor.rsync_to(local_file.name, remote_temporary)
+        finally:
+            os.remove(local_file.name)
+        cmd = f"chmod --reference={self.path} {remote_temporary} && "
+        if backup:
+            cmd += f"ln -f {self.path} {self.backup_path(self.path)} && "
+        cmd += f"mv -f {remote_temporary} {self.path}"
+        TestRun.executor.run_expect_success(cmd)
+
+    @staticmethod
+    def backup_path(path: str = lvm_config_path):
+        return f"{path}.bak"
+
+    @classmethod
+    def rollback(cls, path: str = lvm_config_path):
+        TestRun.LOGGER.info(f"Restoring previous {path}")
+        TestRun.executor.run_expect_success(f"mv -f {cls.backup_path(path)} {path}")
+
+    def __section(self, path: str, create: bool = False):
+        section = self.root
+        for name in path.split("/"):
+            item = section.get_item(name)
+            if not isinstance(item, ConfigSection):
+                if not create:
+                    return None
+                item = ConfigSection(name, section.indent + "\t" if section.name else "")
+                section.items.append(item)
+            section = item
+        return section
+
+    def __find(self, path: str):
+        section_path, key = path.rsplit("/", 1)
+        section = self.__section(section_path)
+        return section.get_item(key) if section is not None else None
@@ -5,6 +5,7 @@
 #
 
 import re
+from datetime import timedelta
 from time import sleep
 
 from connection.utils.output import CmdException
@@ -16,8 +17,10 @@ from test_tools.os_tools import (
     load_kernel_module,
     unload_kernel_module,
 )
+from test_tools.udev import UdevMonitor
 
 MODULE_NAME = "scsi_debug"
+ADD_HOST_PATH = f"/sys/bus/pseudo/drivers/{MODULE_NAME}/add_host"
 
 FLUSH = re.compile(r"scsi_debug:[\s\S]*cmd 35")
 FUA = re.compile(r"scsi_debug:[\s\S]*cmd 2a 08")
@@ -33,11 +36,58 @@ class ScsiDebug:
     def reload(self):
         self.unload()
         sleep(1)
-        load_output = load_kernel_module(MODULE_NAME, self.params)
-        if load_output.exit_code != 0:
-            raise CmdException(f"Failed to load {MODULE_NAME} module", load_output)
-        TestRun.LOGGER.info(f"{MODULE_NAME} loaded successfully.")
-        sleep(10)
+        with UdevMonitor() as monitor:
+            load_output = load_kernel_module(MODULE_NAME, self.params)
+            if load_output.exit_code != 0:
+                raise CmdException(f"Failed to load {MODULE_NAME} module", load_output)
+            TestRun.LOGGER.info(f"{MODULE_NAME} loaded successfully.")
+            events = monitor.wait_for_events(
+                [monitor.criteria("add", devtype="disk", id_model=MODULE_NAME)]
+                * self.get_device_count(),
+                timeout=timedelta(seconds=30),
+            )
+        if events is None:
+            raise TimeoutError(f"Timeout while waiting for {MODULE_NAME} devices.")
+
+    def add_hosts(self, count: int = 1):
+        """
+        Adds hosts (each with 'num_tgts' * 'max_luns' devices) to loaded module at runtime,
+        without reloading it. Returns number of devices added.
+        """
+        device_count = count * self.get_devices_per_host()
+        with UdevMonitor() as monitor:
+            TestRun.executor.run_expect_success(f"echo {count} > {ADD_HOST_PATH}")
+            events = monitor.wait_for_events(
+                [monitor.criteria("add", devtype="disk", id_model=MODULE_NAME)] * device_count,
+                timeout=timedelta(seconds=30),
+            )
+        if events is None:
+            raise TimeoutError(f"Timeout while waiting for {MODULE_NAME} devices.")
+        self.params = {**(self.params or {}), "add_host": self.get_host_count() + count}
+        return device_count
+
+    def remove_hosts(self, count: int = 1):
+        """Removes most recently added hosts (with their devices) at runtime."""
+        device_count = count * self.get_devices_per_host()
+        with UdevMonitor() as monitor:
+            TestRun.executor.run_expect_success(f"echo -{count} > {ADD_HOST_PATH}")
+            events = monitor.wait_for_events(
+                [monitor.criteria("remove", devtype="disk")] * device_count,
+                timeout=timedelta(seconds=30),
+            )
+        if events is None:
+            raise TimeoutError(f"Timeout while waiting for {MODULE_NAME} devices removal.")
+        self.params = {**(self.params or {}), "add_host": self.get_host_count() - count}
+
+    def get_host_count(self):
+        return int((self.params or {}).get("add_host", 1))
+
+    def get_devices_per_host(self):
+        params = self.params or {}
+        return int(params.get("num_tgts", 1)) * int(params.get("max_luns", 1))
+
+    def get_device_count(self):
+        return self.get_host_count() * self.get_devices_per_host()
 
     @staticmethod
     def unload():
@@ -1,11 +1,62 @@
 #
 # Copyright(c) 2019-2022 Intel Corporation
 # Copyright(c) 2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
+import shlex
+import uuid
+from datetime import timedelta
+
 from core.test_run import TestRun
 
+# awk program matching udev events (blocks of KEY=VALUE lines terminated by an empty line)
+# against criteria loaded into 'criteria' array in BEGIN block. Prints '#<criterion> <event>'
+# marker line followed by every matched event and exits once all criteria are matched.
+# Events consumed by previous waits (their numbers are keys of 'consumed' array) are skipped.
+# Events are processed line by line, so that a match is reported without waiting for input
+# following the event.
+UDEV_EVENT_MATCHER = r"""
+/^$/ {
+    if (record != "" && !((++events) in consumed)) check_event()
+    delete p
+    record = ""
+    next
+}
+{
+    eq = index($0, "=")
+    if (eq) p[substr($0, 1, eq - 1)] = substr($0, eq + 1)
+    record = record $0 "\n"
+}
+function check_event(    c) {
+    for (c = 0; c < count; c++) {
+        if (done[c] || !match_criterion(c)) continue
+        done[c] = 1
+        found++
+        printf "#%d %d\n%s", c, events, record
+        fflush()
+        break
+    }
+    if (found == count) exit 0
+}
+function match_criterion(c,    j, key, device) {
+    for (j = 0; j < keys[c]; j++) {
+        key = criteria[c, j, "key"]
+        if (!(key in p) || p[key] != criteria[c, j, "value"]) return 0
+    }
+    device = criteria[c, "device"]
+    if (device != "" && p["DEVNAME"] != device \
+            && !index(" " p["DEVLINKS"] " ", " " device " ")) return 0
+    return 1
+}
+"""
+
+# mawk buffers its input unless run in interactive mode
+AWK_COMMAND = (
+    "$(awk -W version 2>/dev/null | grep -q mawk && echo 'awk -W interactive' || echo awk)"
+)
+
 
 class Udev(object):
     @staticmethod
@@ -25,3 +76,143 @@ class Udev(object):
     @staticmethod
     def settle():
         TestRun.executor.run_expect_success("udevadm settle")
+
+
+class UdevEvent:
+    def __init__(self, properties: dict):
+        self.properties = properties
+
+    @property
+    def action(self):
+        return self.properties.get("ACTION")
+
+    @property
+    def devname(self):
+        return self.properties.get("DEVNAME")
+
+    @property
+    def devlinks(self):
+        return self.properties.get("DEVLINKS", "").split()
+
+    def __str__(self):
+        return f"{self.action} {self.devname} ({self.properties.get('DEVPATH')})"
+
+
+class UdevMonitor:
+    """
+    Streams processed udev events ('udevadm monitor --udev --property') to a file on DUT.
+    Waits are executed on DUT and return as soon as matching events are reported by udev,
+    including events which occurred after the monitor start but before the wait was called.
+    Use as a context manager started before the action triggering the events.
+    """
+    def __init__(self, subsystem: str = "block"):
+        self.subsystem = subsystem
+        self.events_file = f"/tmp/udev_monitor_{uuid.uuid4().hex}"
+        self.pid = None
+        # numbers of events already returned by waits
+        self.consumed_events = set()
+
+    def start(self):
+        self.consumed_events = set()
+        self.pid = TestRun.executor.run_in_background(
+            f"stdbuf -oL udevadm monitor --udev --property --subsystem-match={self.subsystem}",
+            stdout_redirect_path=self.events_file,
+        )
+        # header is printed once the monitor is subscribed to udev events
+        TestRun.executor.run_expect_success(
+            f"timeout 10 sh -c 'until grep -q ^UDEV {self.events_file}; do sleep 0.1; done'"
+        )
+        return self
+
+    def stop(self):
+        if self.pid is not None:
+            TestRun.executor.run(f"kill {self.pid}; rm -f {self.events_file}")
+            self.pid = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @staticmethod
+    def criteria(action: str = None, device: str = None, **properties):
+        """
+        Event criteria - 'device' matches DEVNAME or any of DEVLINKS (e.g. /dev/disk/by-id
+        links), remaining properties are compared with udev event properties.
+        """
+        criteria = {key.upper(): str(value) for key, value in properties.items()}
+        if action is not None:
+            criteria["ACTION"] = action
+        if device is not None:
+            criteria["device"] = device
+        return criteria
+
+    def wait_for_event(self, action: str = None, device: str = None,
+                       timeout: timedelta = timedelta(minutes=1), **properties):
+        """Returns matched UdevEvent or None on timeout."""
+        events = self.wait_for_events([self.criteria(action, device, **properties)], timeout)
+        return events[0] if events is not None else None
+
+    def wait_for_events(self, criteria: [dict], timeout: timedelta = timedelta(minutes=1)):
+        """
+        Waits until every criterion is matched by a separate event (in any order), with
+        a single DUT command. Returns list of UdevEvents ordered as criteria or None on timeout.
+        """
+        if self.pid is None:
+            raise RuntimeError("Udev monitor is not started.")
+        if not criteria:
+            return []
+
+        variables = {"consumed_list": " ".join(map(str, sorted(self.consumed_events))),
+                     "count": len(criteria)}
+        for index, criterion in enumerate(criteria):
+            variables[f"c{index}_device"] = criterion.get("device", "")
+            keys = [key for key in criterion.keys() if key != "device"]
+            variables[f"c{index}_keys"] = len(keys)
+            for key_index, key in enumerate(keys):
+                variables[f"c{index}_{key_index}_key"] = key
+                variables[f"c{index}_{key_index}_value"] = criterion[key]
+        arguments = " ".join(f"-v {name}={shlex.quote(str(value))}"
+                             for name, value in variables.items())
+        program = self.__criteria_loader(criteria) + UDEV_EVENT_MATCHER
+        output = TestRun.executor.run(
+            f"timeout {int(timeout.total_seconds())} {AWK_COMMAND} {arguments} "
+            f"{shlex.quote(program)} < <(tail -n +1 --pid=$$ -f {self.events_file} 2>/dev/null)",
+            timeout + timedelta(seconds=30),
+        )
+        if output.exit_code != 0:
+            TestRun.LOGGER.warning(f"Timeout while waiting for udev events: {criteria}")
+            return None
+
+        events = [None] * len(criteria)
+        index, lines = None, []
+        for line in output.stdout.splitlines() + ["#"]:
+            if line.startswith("#"):
+                if index is not None:
+                    properties = dict(entry.split("=", 1) for entry in lines if "=" in entry)
+                    events[index] = UdevEvent(properties)
+                if line != "#":
+                    index, event_number = map(int, line[1:].split())
+                    self.consumed_events.add(event_number)
+                lines = []
+            else:
+                lines.append(line)
+        for event in events:
+            TestRun.LOGGER.debug(f"Udev event: {event}")
+        return events
+
+    @staticmethod
+    def __criteria_loader(criteria):
+        """Awk BEGIN block copying -v criteria variables into the 'criteria' array."""
+        statements = ['split(consumed_list, numbers, " ")',
+                      "for (i in numbers) consumed[numbers[i]] = 1"]
+        for index, criterion in enumerate(criteria):
+            statements.append(f'criteria[{index}, "device"] = c{index}_device')
+            statements.append(f"keys[{index}] = c{index}_keys")
+            for key_index in range(len([key for key in criterion if key != "device"])):
+                statements.append(
+                    f'criteria[{index}, {key_index}, "key"] = c{index}_{key_index}_key')
+                statements.append(
+                    f'criteria[{index}, {key_index}, "value"] = c{index}_{key_index}_value')
+        return "BEGIN { " + "; ".join(statements) + " }"
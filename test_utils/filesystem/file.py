@@ -1,12 +1,14 @@
 #
 # Copyright(c) 2019-2021 Intel Corporation
 # Copyright(c) 2023-2024 Huawei Technologies Co., Ltd.
+# Copyright(c) 2026 Unvertical
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
 from datetime import timedelta
 
 from test_tools import fs_tools
+from test_tools.block_hash import DEFAULT_BLOCK_SIZE, hash_blocks
 from test_tools.dd import Dd
 from test_tools.fs_tools import read_file, write_file, ls_item, parse_ls_output, remove, \
     check_if_directory_exists
@@ -30,6 +32,9 @@ class File(FsItem):
     def crc32sum(self, timeout: timedelta = timedelta(minutes=30)):
         return fs_tools.crc32sum(str(self), timeout)
 
+    def get_block_digests(self, block_size: Size = DEFAULT_BLOCK_SIZE, jobs: int = None):
+        return hash_blocks(str(self), block_size, jobs)
+
     def read(self):
         return read_file(str(self))
 
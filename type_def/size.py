@@ -9,10 +9,9 @@ from __future__ import annotations
 
 import enum
 import math
+import numbers
 import random
 
-from multimethod import multimethod
-
 
 def parse_unit(str_unit: str):
     for u in Unit:
@@ -119,6 +118,8 @@ class Unit(enum.Enum):
 class UnitPerSecond:
     def __init__(self, unit):
         self.value = unit.get_value()
+        # read directly by Size, as for Unit members (faster than enum 'value' property)
+        self._value_ = self.value
         self.name = unit.name + "/s"
 
     def get_value(self):
@@ -126,12 +127,37 @@ class UnitPerSecond:
 
 
 class Size:
+    """
+    Size stored in bytes - as int whenever the number of bytes is whole, so arithmetic on
+    sizes is exact regardless of magnitude (float only for fractional values, e.g. averages).
+    """
+    __slots__ = ("value", "unit")
+
     def __init__(self, value: float, unit: Unit = Unit.Byte):
         if value < 0:
             raise ValueError("Size has to be positive.")
-        self.value = value * unit.value
+        value = value * unit._value_
+        if type(value) is not int:
+            value = Size._normalize(value)
+        self.value = value
         self.unit = unit
 
+    @classmethod
+    def _from_bytes(cls, value, unit: Unit = Unit.Byte):
+        # no validation - for results of operations on valid sizes
+        size = object.__new__(cls)
+        size.value = value
+        size.unit = unit
+        return size
+
+    @staticmethod
+    def _normalize(value):
+        if type(value) is not float:
+            if isinstance(value, numbers.Integral):
+                return int(value)
+            value = float(value)
+        return int(value) if value.is_integer() else value
+
     def __str__(self):
         return f"{self.get_value(self.unit)} {self.unit}"
 
@@ -139,79 +165,90 @@ class Size:
         return self.value.__hash__()
 
     def __int__(self):
-        return int(self.get_value())
+        return int(self.value)
 
     def __add__(self, other):
-        return Size(self.get_value() + other.get_value()).set_unit(
-            self.unit if self.unit.get_value() < other.unit.get_value() else other.unit
+        return Size._from_bytes(
+            self.value + other.value,
+            self.unit if self.unit._value_ < other.unit._value_ else other.unit
         )
 
     def __lt__(self, other):
-        return self.get_value() < other.get_value()
+        return self.value < other.value
 
     def __le__(self, other):
-        return self.get_value() <= other.get_value()
+        return self.value <= other.value
 
     def __eq__(self, other):
-        return self.get_value() == other.get_value()
+        if not isinstance(other, Size):
+            return NotImplemented
+        return self.value == other.value
 
     def __ne__(self, other):
-        return self.get_value() != other.get_value()
+        if not isinstance(other, Size):
+            return NotImplemented
+        return self.value != other.value
 
     def __gt__(self, other):
-        return self.get_value() > other.get_value()
+        return self.value > other.value
 
     def __ge__(self, other):
-        return self.get_value() >= other.get_value()
+        return self.value >= other.value
 
     def __radd__(self, other):
-        return Size(other + self.get_value())
+        return Size(other + self.value)
 
     def __sub__(self, other):
-        if self < other:
+        if self.value < other.value:
             raise ValueError("Subtracted value is too big. Result size cannot be negative.")
-        return Size(self.get_value() - other.get_value()).set_unit(
-            self.unit if self.unit.get_value() < other.unit.get_value() else other.unit
+        return Size._from_bytes(
+            self.value - other.value,
+            self.unit if self.unit._value_ < other.unit._value_ else other.unit
         )
 
-    @multimethod
     def __mul__(self, other: float | int):
-        return Size(math.ceil(self.get_value() * other))
+        if type(other) is int and type(self.value) is int:
+            return Size(self.value * other)
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
+        return Size(math.ceil(self.value * other))
 
-    @multimethod
-    def __rmul__(self, other: float | int):
-        return Size(math.ceil(self.get_value() * other))
+    __rmul__ = __mul__
 
-    @multimethod
     def __truediv__(self, other: float | int | Size):
         if isinstance(other, Size):
-            return self.get_value() / other.get_value()
+            return self.value / other.value
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
         if other == 0:
             raise ValueError("Divisor must not be equal to 0.")
-        return Size(math.ceil(self.get_value() / other))
+        if type(other) is int and type(self.value) is int:
+            return Size(-(-self.value // other))
+        return Size(math.ceil(self.value / other))
 
-    @multimethod
     def __floordiv__(self, other: float | int | Size):
         if isinstance(other, Size):
-            other = other.get_value()
-            return math.floor(self.get_value() / other)
+            if type(other.value) is int and type(self.value) is int:
+                return self.value // other.value
+            return math.floor(self.value / other.value)
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
         if other == 0:
             raise ValueError("Divisor must not be equal to 0.")
-        return Size(math.floor(self.get_value() / other))
+        if type(other) is int and type(self.value) is int:
+            return Size(self.value // other)
+        return Size(math.floor(self.value / other))
 
     def set_unit(self, new_unit: Unit):
-        new_size = Size(self.get_value(target_unit=new_unit), unit=new_unit)
-
-        if new_size != self:
+        if self.get_value(new_unit) * new_unit._value_ != self.value:
             raise ValueError(f"{new_unit} is not precise enough for {self}")
 
-        self.value = new_size.value
-        self.unit = new_size.unit
+        self.unit = new_unit
 
         return self
 
     def get_value(self, target_unit: Unit = Unit.Byte):
-        return self.value / target_unit.value
+        return self.value / target_unit._value_
 
     def is_zero(self):
         if self.value == 0:
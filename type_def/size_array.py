@@ -0,0 +1,127 @@
+#
+# Copyright(c) 2026 Unvertical
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import numpy as np
+
+from type_def.size import Size, Unit
+
+
+class SizeArray:
+    """
+    Vector of sizes stored as NumPy array of bytes - int64 when all values are whole numbers
+    of bytes, float64 otherwise. Meant for bulk per-row data (e.g. per-interval statistics),
+    where a list of Size objects would be slow to build and aggregate.
+    """
+    def __init__(self, values, unit: Unit = Unit.Byte):
+        values = np.asarray(values) * unit.value
+        if values.size and values.min() < 0:
+            raise ValueError("Size has to be positive.")
+        if values.dtype.kind in "iub" or np.array_equal(values, np.floor(values)):
+            values = values.astype(np.int64)
+        else:
+            values = values.astype(np.float64)
+        self.values = values
+        self.unit = unit
+
+    @classmethod
+    def from_sizes(cls, sizes):
+        sizes = list(sizes)
+        unit = min((size.unit for size in sizes), key=lambda u: u.value, default=Unit.Byte)
+        return cls([size.value for size in sizes]).set_unit(unit)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for value in self.values.tolist():
+            yield Size._from_bytes(value, self.unit)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Size._from_bytes(self.values[index].item(), self.unit)
+        return self.__with_values(self.values[index])
+
+    def __str__(self):
+        return f"[{', '.join(str(size) for size in self)}]"
+
+    def __add__(self, other):
+        return self.__with_values(self.values + self.__bytes_of(other), other.unit)
+
+    def __sub__(self, other):
+        values = self.values - self.__bytes_of(other)
+        if values.size and values.min() < 0:
+            raise ValueError("Subtracted value is too big. Result size cannot be negative.")
+        return self.__with_values(values, other.unit)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, np.integer)) and self.values.dtype == np.int64:
+            return SizeArray(self.values * other)
+        return SizeArray(np.ceil(self.values * other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (Size, SizeArray)):
+            return self.values / self.__bytes_of(other)
+        if other == 0:
+            raise ValueError("Divisor must not be equal to 0.")
+        return SizeArray(np.ceil(self.values / other))
+
+    def __lt__(self, other):
+        return self.values < self.__bytes_of(other)
+
+    def __le__(self, other):
+        return self.values <= self.__bytes_of(other)
+
+    def __gt__(self, other):
+        return self.values > self.__bytes_of(other)
+
+    def __ge__(self, other):
+        return self.values >= self.__bytes_of(other)
+
+    def set_unit(self, new_unit: Unit):
+        self.unit = new_unit
+        return self
+
+    def get_values(self, target_unit: Unit = Unit.Byte):
+        """Returns NumPy array of values in given unit."""
+        return self.values / target_unit.value
+
+    def sum(self):
+        return self.__to_size(self.values.sum())
+
+    def mean(self):
+        return self.__to_size(self.values.mean())
+
+    def min(self):
+        return Size._from_bytes(self.values.min().item(), self.unit)
+
+    def max(self):
+        return Size._from_bytes(self.values.max().item(), self.unit)
+
+    def percentile(self, percent: float):
+        return self.__to_size(np.percentile(self.values, percent))
+
+    def to_list(self):
+        return list(self)
+
+    def __with_values(self, values, other_unit: Unit = None):
+        array = SizeArray.__new__(SizeArray)
+        array.values = values
+        # like Size, result of operation on two sizes keeps the smaller unit
+        array.unit = self.unit if other_unit is None or self.unit.value < other_unit.value \
+            else other_unit
+        return array
+
+    def __to_size(self, value):
+        return Size._from_bytes(Size._normalize(value), self.unit)
+
+    @staticmethod
+    def __bytes_of(other):
+        if isinstance(other, SizeArray):
+            return other.values
+        if isinstance(other, Size):
+            return other.value
+        raise TypeError(f"Unsupported operand type: {type(other).__name__}")